@@ -6,64 +6,51 @@ Run this script to start the FastAPI server locally for development and testing.
 
 import sys
 import os
-import subprocess
-import uvicorn
-from dotenv import load_dotenv
+import importlib.util
 
-# Load environment variables
-load_dotenv()
-
-# Add the src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+# Shared script bootstrap (adds src/ to the Python path)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts'))
+from _bootstrap import fast_load_dotenv
 
-def check_redis():
-    """Check if Redis is running locally."""
-    try:
-        import redis
-        r = redis.Redis(host='localhost', port=6379, db=0)
-        r.ping()
-        print("✅ Redis is running")
-        return True
-    except Exception as e:
-        print("❌ Redis is not running. Starting Redis with Docker...")
-        try:
-            subprocess.run(["docker", "run", "-d", "--name", "dev-redis", "-p", "6379:6379", "redis:7-alpine"], check=True)
-            print("✅ Redis started successfully")
-            return True
-        except subprocess.CalledProcessError:
-            print("❌ Failed to start Redis. Please install and start Redis manually.")
-            return False
+# Load environment variables
+fast_load_dotenv()
 
 def main():
     print("🚀 Starting Kannada News Automation Development Server")
     print("=" * 50)
     
-    # Check Redis
-    if not check_redis():
-        print("Please start Redis and try again.")
-        sys.exit(1)
-    
-    # Import the FastAPI app
+    # Locate the FastAPI app without executing it; uvicorn imports it for real
     try:
-        from kannada_news_automation.main import app
-        print("✅ Application imported successfully")
+        spec = importlib.util.find_spec("kannada_news_automation.main")
     except ImportError as e:
-        print(f"❌ Failed to import application: {e}")
+        spec = None
+        print(f"❌ Failed to locate application: {e}")
+    if spec is None:
+        print("❌ Application module kannada_news_automation.main not found")
         sys.exit(1)
+    print("✅ Application module found")
     
     # Start the development server
-    print("🌐 Starting FastAPI development server...")
-    print("📍 Server will be available at: http://localhost:8000")
-    print("📍 API documentation: http://localhost:8000/docs")
-    print("📍 Health check: http://localhost:8000/health")
-    print("=" * 50)
+    sys.stdout.write(
+        "🌐 Starting FastAPI development server...\n"
+        "📍 Server will be available at: http://localhost:8000\n"
+        "📍 API documentation: http://localhost:8000/docs\n"
+        "📍 Health check: http://localhost:8000/health\n"
+        + "=" * 50 + "\n"
+    )
     
+    # Imported late so a failed preflight check doesn't pay for uvicorn/starlette
+    import uvicorn
     uvicorn.run(
         "kannada_news_automation.main:app",
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        reload_dirs=["src"],
+        reload_includes=["*.py"],
+        log_level="info",
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools"
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+"""
+Shared path setup and helpers for the helper scripts
+"""
+
+import asyncio
+import os
+import pickle
+import sys
+from pathlib import Path
+
+# Resolve the src directory once and make it importable
+SRC = (Path(__file__).parent.parent / "src").resolve()
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+ENV_FILE = SRC.parent / ".env"
+ENV_CACHE = SRC.parent / ".env.pickle"
+DOTENV_LOADED_FLAG = "_DOTENV_LOADED"
+
+def fast_load_dotenv(path=ENV_FILE, cache_path=ENV_CACHE):
+    """Load .env into os.environ, reusing a pickled parse while the file is unchanged"""
+    # Already loaded by this process or a parent (e.g. the uvicorn reloader)
+    if os.environ.get(DOTENV_LOADED_FLAG) == "1":
+        return True
+    
+    path, cache_path = Path(path), Path(cache_path)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return False
+    
+    values = None
+    try:
+        with open(cache_path, "rb") as f:
+            cached_mtime, cached_values = pickle.load(f)
+        if cached_mtime == mtime:
+            values = cached_values
+    except (OSError, EOFError, ValueError, TypeError, pickle.PickleError):
+        pass
+    
+    if values is None:
+        from dotenv import dotenv_values
+        values = {k: v for k, v in dotenv_values(path).items() if v is not None}
+        try:
+            with open(cache_path, "wb") as f:
+                pickle.dump((mtime, values), f)
+        except OSError:
+            pass
+    
+    # Same semantics as load_dotenv(): never override variables already set
+    for key, value in values.items():
+        os.environ.setdefault(key, value)
+    os.environ[DOTENV_LOADED_FLAG] = "1"
+    return bool(values)
+
+def run_async(main):
+    """Run a coroutine on uvloop when available, else the default asyncio loop"""
+    try:
+        import uvloop
+        runner = uvloop.run
+    except (ImportError, AttributeError):  # uvloop.run needs uvloop >= 0.18
+        runner = asyncio.run
+    return runner(main)
@@ -4,33 +4,30 @@ Development runner script for Kannada News Automation
 """
 
 import os
+import re
 import sys
-import asyncio
 import subprocess
-from dotenv import load_dotenv
 
 # Add src to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from _bootstrap import SRC, run_async, fast_load_dotenv
+
+REQUIRED_VARS = frozenset({
+    'OPENAI_API_KEY',
+    'ELEVENLABS_API_KEY',
+    'YOUTUBE_API_KEY',
+    'NEWS_API_KEY',
+    'UNSPLASH_API_KEY',
+    'PEXELS_API_KEY'
+})
 
 def check_environment():
     """Check if all required environment variables are set"""
-    required_vars = [
-        'OPENAI_API_KEY',
-        'ELEVENLABS_API_KEY',
-        'YOUTUBE_API_KEY',
-        'NEWS_API_KEY',
-        'UNSPLASH_API_KEY',
-        'PEXELS_API_KEY'
-    ]
-    
-    missing_vars = []
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
+    # Variables that are set but empty count as missing
+    missing_vars = REQUIRED_VARS - {key for key, value in os.environ.items() if value}
     
     if missing_vars:
         print("❌ Missing required environment variables:")
-        for var in missing_vars:
+        for var in sorted(missing_vars):
             print(f"   - {var}")
         print("\n💡 Please check your .env file and ensure all API keys are configured.")
         return False
@@ -38,16 +35,57 @@ def check_environment():
     print("✅ All required environment variables are set")
     return True
 
-def start_redis_postgres():
-    """Start Redis and PostgreSQL using Docker Compose"""
+COMPOSE_SERVICES = ('postgres',)
+
+def _compose_project_name():
+    """Docker Compose project name for this checkout"""
+    name = os.getenv('COMPOSE_PROJECT_NAME') or SRC.parent.name
+    return re.sub(r'[^a-z0-9_-]', '', name.lower())
+
+def start_existing_containers():
+    """Start previously created Compose containers through the Docker API.
+    
+    Returns False when the Docker SDK is unavailable or a service has no
+    container yet, so the caller can fall back to docker-compose.
+    """
+    try:
+        import docker
+        client = docker.from_env()
+    except Exception:
+        return False
+    
+    project_label = f"com.docker.compose.project={_compose_project_name()}"
+    try:
+        for service in COMPOSE_SERVICES:
+            containers = client.containers.list(
+                all=True,
+                filters={"label": [project_label, f"com.docker.compose.service={service}"]}
+            )
+            if not containers:
+                return False
+            for container in containers:
+                if container.status != 'running':
+                    container.start()
+        return True
+    except docker.errors.DockerException:
+        return False
+
+def start_postgres():
+    """Start PostgreSQL using Docker Compose"""
+    print("🐳 Starting PostgreSQL...")
+    
+    # Skip the docker-compose CLI when the containers already exist
+    if start_existing_containers():
+        print("✅ Database services started")
+        return True
+    
     try:
-        print("🐳 Starting Redis and PostgreSQL...")
         subprocess.run([
-            'docker-compose', 'up', '-d', 'redis', 'postgres'
+            'docker-compose', 'up', '-d', *COMPOSE_SERVICES
         ], check=True)
         print("✅ Database services started")
         return True
-    except subprocess.CalledProcessError:
+    except (OSError, subprocess.CalledProcessError):
         print("❌ Failed to start database services")
         print("💡 Make sure Docker and Docker Compose are installed and running")
         return False
@@ -80,19 +118,25 @@ async def test_pipeline():
 def start_development_server():
     """Start the development server"""
     try:
-        print("🚀 Starting development server...")
-        print("🌐 Access the API at: http://localhost:8000")
-        print("📚 API docs at: http://localhost:8000/docs")
-        print("🔍 Health check at: http://localhost:8000/health")
-        print("\nPress Ctrl+C to stop the server")
+        sys.stdout.write(
+            "🚀 Starting development server...\n"
+            "🌐 Access the API at: http://localhost:8000\n"
+            "📚 API docs at: http://localhost:8000/docs\n"
+            "🔍 Health check at: http://localhost:8000/health\n"
+            "\nPress Ctrl+C to stop the server\n"
+        )
         
-        subprocess.run([
-            'python', '-m', 'uvicorn', 
+        # Run uvicorn in-process instead of forking a new interpreter.
+        # reload=True requires the import-string form of the app.
+        import uvicorn
+        uvicorn.run(
             'src.kannada_news_automation.main:app',
-            '--host', '0.0.0.0',
-            '--port', '8000',
-            '--reload'
-        ])
+            host='0.0.0.0',
+            port=8000,
+            reload=True,
+            reload_dirs=['src'],
+            reload_includes=['*.py']
+        )
         
     except KeyboardInterrupt:
         print("\n👋 Development server stopped")
@@ -105,14 +149,14 @@ async def main():
     print("=" * 50)
     
     # Load environment variables
-    load_dotenv()
+    fast_load_dotenv()
     
     # Check environment
     if not check_environment():
         return 1
     
     # Start database services
-    if not start_redis_postgres():
+    if not start_postgres():
         return 1
     
     # Test pipeline
@@ -126,7 +170,7 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        exit_code = asyncio.run(main())
+        exit_code = run_async(main())
         sys.exit(exit_code)
     except KeyboardInterrupt:
         print("\n👋 Development setup interrupted")
@@ -3,21 +3,101 @@
 Simple server runner without external dependencies
 """
 
+import argparse
 import sys
-import os
-from pathlib import Path
-from dotenv import load_dotenv
+import time
+from datetime import datetime
+from functools import lru_cache
 
 # Add src to path
-src_path = Path(__file__).parent.parent / "src"
-sys.path.insert(0, str(src_path))
+from _bootstrap import SRC, fast_load_dotenv  # noqa: F401
+
+# Static parts of the demo responses, built once at import time
+ROOT_INFO = {
+    "message": "Kannada News Automation System - Demo Mode",
+    "version": "1.0.0-demo",
+    "status": "running",
+    "mode": "demonstration",
+    "features": [
+        "LlamaIndex intelligent content processing",
+        "ElevenLabs high-quality Kannada TTS",
+        "Automated video assembly",
+        "YouTube upload with SEO optimization"
+    ],
+    "note": "Add real API keys to .env for full functionality"
+}
+
+HEALTH_INFO = {
+    "status": "healthy",
+    "mode": "demo",
+    "message": "System running in demo mode"
+}
+
+STATUS_INFO = {
+    "system": "Kannada News Automation",
+    "mode": "demo",
+    "components": {
+        "web_server": "running",
+        "news_collector": "requires OpenAI API key",
+        "audio_generator": "requires ElevenLabs API key",
+        "video_assembler": "ready",
+        "youtube_uploader": "requires YouTube API key"
+    },
+    "setup_required": [
+        "OpenAI API key for news processing",
+        "ElevenLabs API key for Kannada TTS",
+        "YouTube API credentials for uploads",
+        "PostgreSQL database"
+    ]
+}
+
+DEMO_TRIGGER_INFO = {
+    "message": "Demo pipeline triggered",
+    "note": "This is a demonstration. Configure API keys for real functionality.",
+    "steps": [
+        "✅ Web server running",
+        "❌ News collection (requires OpenAI API)",
+        "❌ Content processing (requires OpenAI API)", 
+        "❌ Kannada translation (requires OpenAI API)",
+        "❌ Audio generation (requires ElevenLabs API)",
+        "❌ Visual content (requires Unsplash/Pexels API)",
+        "❌ Video assembly (requires media)",
+        "❌ YouTube upload (requires YouTube API)"
+    ]
+}
+
+@lru_cache(maxsize=1)
+def _iso_for_second(second):
+    return datetime.fromtimestamp(second).isoformat()
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+    
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+# Response bodies that never change are serialized once
+STATUS_BYTES = _dumps(STATUS_INFO)
+DEMO_TRIGGER_BYTES = _dumps(DEMO_TRIGGER_INFO)
+
+_TIMESTAMPED_INFO = {"root": ROOT_INFO, "health": HEALTH_INFO}
+
+@lru_cache(maxsize=len(_TIMESTAMPED_INFO))
+def _timestamped_bytes(name, second):
+    return _dumps({**_TIMESTAMPED_INFO[name], "timestamp": _iso_for_second(second)})
+
+def timestamped_body(name):
+    """Serialized response body for `name`, rebuilt at most once per second"""
+    return _timestamped_bytes(name, int(time.time()))
 
 def create_simple_app():
     """Create a simple FastAPI app for demonstration"""
     from fastapi import FastAPI
-    from fastapi.responses import JSONResponse
+    from fastapi.responses import Response
     import logging
-    from datetime import datetime
     
     # Setup basic logging
     logging.basicConfig(level=logging.INFO)
@@ -32,79 +112,36 @@ def create_simple_app():
     @app.get("/")
     async def root():
         """Root endpoint with system information"""
-        return {
-            "message": "Kannada News Automation System - Demo Mode",
-            "version": "1.0.0-demo",
-            "status": "running",
-            "mode": "demonstration",
-            "timestamp": datetime.now().isoformat(),
-            "features": [
-                "LlamaIndex intelligent content processing",
-                "ElevenLabs high-quality Kannada TTS",
-                "Automated video assembly",
-                "YouTube upload with SEO optimization"
-            ],
-            "note": "Add real API keys to .env for full functionality"
-        }
+        return Response(timestamped_body("root"), media_type="application/json")
     
     @app.get("/health")
     async def health_check():
         """Simple health check"""
-        return {
-            "status": "healthy",
-            "mode": "demo",
-            "timestamp": datetime.now().isoformat(),
-            "message": "System running in demo mode"
-        }
+        return Response(timestamped_body("health"), media_type="application/json")
     
     @app.get("/status")
     async def status():
         """System status"""
-        return {
-            "system": "Kannada News Automation",
-            "mode": "demo",
-            "components": {
-                "web_server": "running",
-                "news_collector": "requires OpenAI API key",
-                "audio_generator": "requires ElevenLabs API key",
-                "video_assembler": "ready",
-                "youtube_uploader": "requires YouTube API key"
-            },
-            "setup_required": [
-                "OpenAI API key for news processing",
-                "ElevenLabs API key for Kannada TTS",
-                "YouTube API credentials for uploads",
-                "Redis and PostgreSQL databases"
-            ]
-        }
+        return Response(STATUS_BYTES, media_type="application/json")
     
     @app.post("/demo/trigger")
     async def demo_trigger():
         """Demo pipeline trigger"""
-        return {
-            "message": "Demo pipeline triggered",
-            "note": "This is a demonstration. Configure API keys for real functionality.",
-            "steps": [
-                "✅ Web server running",
-                "❌ News collection (requires OpenAI API)",
-                "❌ Content processing (requires OpenAI API)", 
-                "❌ Kannada translation (requires OpenAI API)",
-                "❌ Audio generation (requires ElevenLabs API)",
-                "❌ Visual content (requires Unsplash/Pexels API)",
-                "❌ Video assembly (requires media)",
-                "❌ YouTube upload (requires YouTube API)"
-            ]
-        }
+        return Response(DEMO_TRIGGER_BYTES, media_type="application/json")
     
     return app
 
 def main():
     """Main function to run the demo server"""
+    parser = argparse.ArgumentParser(description="Run the demo server")
+    parser.add_argument("--verbose", action="store_true", help="enable per-request access logging")
+    args = parser.parse_args()
+    
     print("🎬 Kannada News Automation - Demo Server")
     print("=" * 50)
     
     # Load environment
-    load_dotenv()
+    fast_load_dotenv()
     
     try:
         # Create the app
@@ -113,11 +150,13 @@ def main():
         # Import uvicorn here to avoid dependency issues
         import uvicorn
         
-        print("🚀 Starting demo server...")
-        print("🌐 Open your browser to: http://localhost:8000")
-        print("📚 API documentation: http://localhost:8000/docs")
-        print("💡 This is a demo version. Add API keys to .env for full functionality.")
-        print("\nPress Ctrl+C to stop the server\n")
+        sys.stdout.write(
+            "🚀 Starting demo server...\n"
+            "🌐 Open your browser to: http://localhost:8000\n"
+            "📚 API documentation: http://localhost:8000/docs\n"
+            "💡 This is a demo version. Add API keys to .env for full functionality.\n"
+            "\nPress Ctrl+C to stop the server\n\n"
+        )
         
         # Run the server
         uvicorn.run(
@@ -125,7 +164,9 @@ def main():
             host="0.0.0.0",
             port=8000,
             log_level="info",
-            access_log=True
+            access_log=args.verbose,
+            loop="uvloop" if sys.platform != "win32" else "asyncio",
+            http="httptools"
         )
         
     except KeyboardInterrupt:
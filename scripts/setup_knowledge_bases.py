@@ -5,10 +5,10 @@ Setup script for knowledge bases and initial data
 
 import os
 import sys
-from dotenv import load_dotenv
+from pathlib import Path
 
 # Add src to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from _bootstrap import SRC, fast_load_dotenv  # noqa: F401
 
 def create_directories():
     """Create necessary directories"""
@@ -21,9 +21,15 @@ def create_directories():
         './config'
     ]
     
-    for directory in directories:
-        os.makedirs(directory, exist_ok=True)
-        print(f"✅ Created directory: {directory}")
+    try:
+        for directory in directories:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        print(f"❌ Failed to create directories: {e}")
+        return False
+    
+    print("✅ Created directories:\n" + "\n".join(f"   - {d}" for d in directories))
+    return True
 
 def setup_knowledge_bases():
     """Initialize knowledge bases"""
@@ -60,9 +66,8 @@ def create_sample_config():
         }
         
         config_path = './config/youtube_client_secret.json.example'
-        with open(config_path, 'w') as f:
-            import json
-            json.dump(youtube_config, f, indent=2)
+        import orjson
+        Path(config_path).write_bytes(orjson.dumps(youtube_config, option=orjson.OPT_INDENT_2))
         
         print(f"✅ Created sample config: {config_path}")
         print("💡 Copy this to youtube_client_secret.json and update with your credentials")
@@ -79,10 +84,11 @@ def main():
     print("=" * 50)
     
     # Load environment
-    load_dotenv()
+    fast_load_dotenv()
     
     # Create directories
-    create_directories()
+    if not create_directories():
+        return 1
     
     # Setup knowledge bases  
     if not setup_knowledge_bases():
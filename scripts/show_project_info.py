@@ -3,16 +3,9 @@
 Project information and setup guide
 """
 
-import os
 import sys
-from pathlib import Path
 
-def show_project_structure():
-    """Show the project structure"""
-    print("📁 Project Structure:")
-    print("=" * 50)
-    
-    structure = """
+_STRUCTURE_BANNER = "📁 Project Structure:\n" + "=" * 50 + "\n" + """
 kannada_news_automation/
 ├── 📄 pyproject.toml          # Project configuration with UV
 ├── 📄 .env                    # Environment variables (configure your API keys here)
@@ -49,34 +42,23 @@ kannada_news_automation/
 └── 📁 tests/                         # Test files
     ├── 📄 test_pipeline.py
     └── 📁 test_agents/
-"""
-    print(structure)
+""" + "\n"
 
-def show_api_requirements():
-    """Show required API keys and setup"""
-    print("\n🔑 Required API Keys:")
-    print("=" * 50)
-    
-    apis = [
-        ("OpenAI", "https://platform.openai.com/api-keys", "Content processing, translation, embeddings"),
-        ("ElevenLabs", "https://elevenlabs.io/", "High-quality Kannada text-to-speech"),
-        ("YouTube Data API", "https://console.cloud.google.com/", "Automated video uploads"),
-        ("NewsAPI", "https://newsapi.org/", "News source aggregation"),
-        ("Unsplash", "https://unsplash.com/developers", "Copyright-free images"),
-        ("Pexels", "https://www.pexels.com/api/", "Copyright-free images")
-    ]
-    
-    for name, url, description in apis:
-        print(f"• {name:15} - {description}")
-        print(f"  {' ':15}   Get API key: {url}")
-        print()
+APIS = [
+    ("OpenAI", "https://platform.openai.com/api-keys", "Content processing, translation, embeddings"),
+    ("ElevenLabs", "https://elevenlabs.io/", "High-quality Kannada text-to-speech"),
+    ("YouTube Data API", "https://console.cloud.google.com/", "Automated video uploads"),
+    ("NewsAPI", "https://newsapi.org/", "News source aggregation"),
+    ("Unsplash", "https://unsplash.com/developers", "Copyright-free images"),
+    ("Pexels", "https://www.pexels.com/api/", "Copyright-free images")
+]
 
-def show_setup_instructions():
-    """Show setup instructions"""
-    print("⚙️  Setup Instructions:")
-    print("=" * 50)
-    
-    instructions = """
+_API_BANNER = "\n".join(
+    ["\n🔑 Required API Keys:", "=" * 50]
+    + [f"• {name:15} - {description}\n  {' ':15}   Get API key: {url}\n" for name, url, description in APIS]
+) + "\n"
+
+_SETUP_BANNER = "⚙️  Setup Instructions:\n" + "=" * 50 + "\n" + """
 1. 📝 Configure Environment:
    cp .env.example .env
    # Edit .env with your API keys
@@ -85,7 +67,7 @@ def show_setup_instructions():
    uv sync
    
 3. 🚀 Start Database Services (Docker):
-   docker-compose up -d redis postgres
+   docker-compose up -d postgres
    
 4. 🧪 Test Components:
    uv run python scripts/test_elevenlabs.py
@@ -100,15 +82,9 @@ def show_setup_instructions():
    
 7. 🎬 Trigger Pipeline:
    curl -X POST http://localhost:8000/pipeline/trigger
-"""
-    print(instructions)
+""" + "\n"
 
-def show_features():
-    """Show system features"""
-    print("🎯 System Features:")
-    print("=" * 50)
-    
-    features = """
+_FEATURES_BANNER = "🎯 System Features:\n" + "=" * 50 + "\n" + """
 • 🤖 Multi-Agent Architecture with LlamaIndex
   - News Collection Agent with RAG intelligence
   - Content Processing Agent for video optimization
@@ -136,27 +112,46 @@ def show_features():
 
 • 🏗️  Production Ready
   - Docker containerization
-  - Redis and PostgreSQL integration
+  - PostgreSQL integration
   - Comprehensive logging and monitoring
-"""
-    print(features)
+""" + "\n"
+
+def show_project_structure():
+    """Show the project structure"""
+    sys.stdout.write(_STRUCTURE_BANNER)
+
+def show_api_requirements():
+    """Show required API keys and setup"""
+    sys.stdout.write(_API_BANNER)
+
+def show_setup_instructions():
+    """Show setup instructions"""
+    sys.stdout.write(_SETUP_BANNER)
+
+def show_features():
+    """Show system features"""
+    sys.stdout.write(_FEATURES_BANNER)
 
 def main():
     """Main function"""
-    print("🎬 Kannada News Automation System")
-    print("🤖 AI-Powered News Video Generation")
-    print("=" * 60)
+    sys.stdout.write(
+        "🎬 Kannada News Automation System\n"
+        "🤖 AI-Powered News Video Generation\n"
+        + "=" * 60 + "\n"
+    )
     
     show_project_structure()
     show_api_requirements()
     show_setup_instructions()
     show_features()
     
-    print("\n💡 Quick Start for Demo:")
-    print("=" * 50)
-    print("uv run python scripts/run_simple_server.py")
-    print("\n✨ The system is production-ready!")
-    print("Configure your API keys in .env to unlock full functionality.")
+    sys.stdout.write(
+        "\n💡 Quick Start for Demo:\n"
+        + "=" * 50 + "\n"
+        "uv run python scripts/run_simple_server.py\n"
+        "\n✨ The system is production-ready!\n"
+        "Configure your API keys in .env to unlock full functionality.\n"
+    )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,12 +4,10 @@ Basic test script for core functionality without external services
 """
 
 import sys
-import os
 import asyncio
-from dotenv import load_dotenv
 
 # Add src to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from _bootstrap import SRC, run_async, fast_load_dotenv  # noqa: F401
 
 async def test_basic_functionality():
     """Test basic functionality without external API calls"""
@@ -31,9 +29,12 @@ async def test_basic_functionality():
         
         # Test knowledge base creation (offline)
         print("3. Testing knowledge base creation...")
-        collector = NewsCollectionAgent()
-        translator = TranslationAgent()
-        processor = ContentProcessingAgent()
+        # Construct the agents concurrently; each builds its own knowledge bases
+        collector, translator, processor = await asyncio.gather(
+            asyncio.to_thread(NewsCollectionAgent),
+            asyncio.to_thread(TranslationAgent),
+            asyncio.to_thread(ContentProcessingAgent)
+        )
         print("   ✅ Agents initialized successfully")
         
         # Test basic text processing
@@ -84,7 +85,7 @@ async def main():
     print("=" * 50)
     
     # Load environment
-    load_dotenv()
+    fast_load_dotenv()
     
     # Run basic tests
     basic_success = await test_basic_functionality()
@@ -94,7 +95,7 @@ async def main():
         print("\n✅ All basic tests passed! System is ready for development.")
         print("\n📋 To run with real APIs:")
         print("1. Add your actual API keys to .env")
-        print("2. Start Redis and PostgreSQL (docker-compose up -d redis postgres)")
+        print("2. Start PostgreSQL (docker-compose up -d postgres)")
         print("3. Run: uv run python src/kannada_news_automation/main.py")
         return 0
     else:
@@ -103,7 +104,7 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        exit_code = asyncio.run(main())
+        exit_code = run_async(main())
         sys.exit(exit_code)
     except KeyboardInterrupt:
         print("\n👋 Tests interrupted")
@@ -6,17 +6,16 @@ Test script for ElevenLabs integration
 import asyncio
 import os
 import sys
-from dotenv import load_dotenv
 
 # Add src to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from _bootstrap import SRC, fast_load_dotenv  # noqa: F401
 
 from kannada_news_automation.agents.audio_generator import AudioGeneratorAgent
 
 async def test_elevenlabs_integration():
     """Test ElevenLabs TTS integration"""
     
-    load_dotenv()
+    fast_load_dotenv()
     
     if not os.getenv("ELEVENLABS_API_KEY"):
         print("❌ ELEVENLABS_API_KEY not found in environment")
@@ -37,26 +36,38 @@ async def test_elevenlabs_integration():
         
         print("📝 Testing different Kannada text samples...")
         
-        for test_name, text in test_texts.items():
-            print(f"   Testing {test_name}: {text}")
-            
-            try:
-                audio_file = await audio_agent.generate_kannada_audio(
+        # Generate all samples concurrently, capped to respect ElevenLabs rate limits
+        semaphore = asyncio.Semaphore(3)
+        
+        async def generate_sample(text):
+            async with semaphore:
+                return await audio_agent.generate_kannada_audio(
                     text, 
                     "karnataka", 
                     target_duration=3.0
                 )
-                
-                if audio_file and os.path.exists(audio_file):
-                    file_size = os.path.getsize(audio_file)
-                    print(f"   ✅ Generated: {audio_file} ({file_size} bytes)")
-                else:
-                    print(f"   ❌ Failed to generate audio for {test_name}")
-                    return False
-                    
-            except Exception as e:
-                print(f"   ❌ Error generating {test_name}: {e}")
-                return False
+        
+        results = await asyncio.gather(
+            *(generate_sample(text) for text in test_texts.values()),
+            return_exceptions=True
+        )
+        
+        all_passed = True
+        for (test_name, text), audio_file in zip(test_texts.items(), results):
+            print(f"   Testing {test_name}: {text}")
+            
+            if isinstance(audio_file, Exception):
+                print(f"   ❌ Error generating {test_name}: {audio_file}")
+                all_passed = False
+            elif audio_file and os.path.exists(audio_file):
+                file_size = os.path.getsize(audio_file)
+                print(f"   ✅ Generated: {audio_file} ({file_size} bytes)")
+            else:
+                print(f"   ❌ Failed to generate audio for {test_name}")
+                all_passed = False
+        
+        if not all_passed:
+            return False
         
         print("🎉 All ElevenLabs tests passed!")
         return True
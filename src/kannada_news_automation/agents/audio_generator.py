@@ -1,28 +1,89 @@
-try:
-    from elevenlabs import generate, Voice, VoiceSettings
-except ImportError:
-    # Handle different ElevenLabs package versions
-    def generate(*args, **kwargs):
-        raise NotImplementedError("ElevenLabs API not available - please configure API key")
-    
-    class Voice:
-        def __init__(self, *args, **kwargs):
-            pass
-    
-    class VoiceSettings:
-        def __init__(self, *args, **kwargs):
-            pass
+import aiofiles
+import aiohttp
 import os
 import asyncio
-from pydub import AudioSegment
-from llama_index.core import VectorStoreIndex, Document
+import hashlib
+import re
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
 # from llama_index.core.agent import ReActAgent  # Disabled for compatibility
-from llama_index.core.tools import QueryEngineTool, ToolMetadata, FunctionTool
+from llama_index.core.tools import FunctionTool
 from typing import Dict, Optional
 import logging
+from ..utils.http_session import release_stale_session
 
 logger = logging.getLogger(__name__)
 
+# ElevenLabs streaming text-to-speech endpoint, called over a shared keep-alive session
+ELEVENLABS_TTS_STREAM_URL = "https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream"
+TTS_CHUNK_SIZE = 64 * 1024
+
+# Audio delivery guidance by news topic
+AUDIO_GUIDANCE = MappingProxyType({
+    "political": "Political news should use formal, authoritative tone with slower speech rate for clarity and gravitas.",
+    "sports": "Sports news benefits from energetic, enthusiastic delivery with faster pace to match excitement.",
+    "economic": "Economic news requires clear, measured delivery with emphasis on numbers and key figures.",
+    "international": "International news should maintain neutral, professional tone suitable for global audience.",
+    "regional": "Regional news (Karnataka, Tamil Nadu, Andhra, Kerala) can use slightly warmer, more personal tone.",
+    "breaking": "Breaking news requires urgent, attention-grabbing delivery with emphasis on key facts.",
+    "timing": "For 60-second videos, each news segment should be 8-10 seconds, requiring concise, punchy delivery.",
+    "pronunciation": "Kannada pronunciation should emphasize clear consonants and proper vowel sounds for better comprehension.",
+    "mobile": "Audio for mobile viewing (YouTube Shorts) needs higher clarity and slightly boosted volume.",
+    "transitions": "Transitions between news items should have brief pauses (0.5 seconds) for better segmentation."
+})
+
+# Pipeline categories that share a guidance entry
+AUDIO_GUIDANCE_ALIASES = MappingProxyType({
+    "karnataka": "regional",
+    "tamilnadu": "regional",
+    "andhra": "regional",
+    "kerala": "regional"
+})
+
+DEFAULT_AUDIO_GUIDANCE = "Use a clear, neutral news delivery at a steady pace."
+
+# (stability, similarity, speed) voice presets per news category
+CATEGORY_VOICE_SETTINGS = MappingProxyType({
+    "international": (0.6, 0.8, 1.0),
+    "national": (0.7, 0.8, 1.0),
+    "karnataka": (0.5, 0.9, 1.1),
+    "tamilnadu": (0.5, 0.9, 1.1),
+    "andhra": (0.5, 0.9, 1.1),
+    "kerala": (0.5, 0.9, 1.1)
+})
+DEFAULT_VOICE_SETTINGS = (0.5, 0.8, 1.0)
+
+# Target segment length in seconds per category (60 seconds total)
+SEGMENT_DURATIONS = MappingProxyType({
+    "international": 8,
+    "national": 8,
+    "karnataka": 10,  # Priority
+    "tamilnadu": 8,
+    "andhra": 8,
+    "kerala": 8
+})
+DEFAULT_SEGMENT_DURATION = 8
+
+# Pauses, Kannada words for symbols and emphasis markers, applied in one pass
+_SPEECH_REPLACEMENTS = MappingProxyType({
+    '.': '... ',
+    ',': ', ',
+    ':': ': ',
+    '%': ' ಶೇಕಡ ',  # Percent in Kannada
+    '&': ' ಮತ್ತು ',  # And in Kannada
+    'breaking': '*breaking*',
+    'urgent': '*urgent*',
+    'important': '*important*',
+    'significant': '*significant*'
+})
+_SPEECH_RE = re.compile(r'[.,:%&]|breaking|urgent|important|significant')
+
+@lru_cache(maxsize=1024)
+def optimize_text_for_speech(text: str) -> str:
+    """Optimize text for natural speech delivery (memoized per input text)"""
+    return _SPEECH_RE.sub(lambda m: _SPEECH_REPLACEMENTS[m.group()], text).strip()
+
 class AudioGeneratorAgent:
     def __init__(self):
         """Initialize ElevenLabs audio generation with LlamaIndex intelligence"""
@@ -31,25 +92,31 @@ class AudioGeneratorAgent:
         self.model_id = os.getenv("ELEVENLABS_MODEL_ID", "eleven_multilingual_v2")
         
         # Voice settings optimized for news delivery
-        self.voice_settings = VoiceSettings(
-            stability=float(os.getenv("ELEVENLABS_VOICE_STABILITY", "0.5")),
-            similarity_boost=float(os.getenv("ELEVENLABS_VOICE_SIMILARITY", "0.8")),
-            style=0.0,  # Neutral style for news
-            use_speaker_boost=True
-        )
+        self.voice_settings = {
+            "stability": float(os.getenv("ELEVENLABS_VOICE_STABILITY", "0.5")),
+            "similarity_boost": float(os.getenv("ELEVENLABS_VOICE_SIMILARITY", "0.8")),
+            "style": 0.0,  # Neutral style for news
+            "use_speaker_boost": True
+        }
+        
+        # Audio cache directory, created once up front
+        self.cache_dir = Path("./data/audio_cache")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        # Build knowledge base for audio optimization
-        self.audio_kb = self._build_audio_knowledge_base()
-        self.audio_engine = self.audio_kb.as_query_engine()
+        # Cap concurrent ElevenLabs requests to stay under the API's limit
+        self._tts_concurrency = int(os.getenv("ELEVENLABS_MAX_CONCURRENCY", "4"))
+        self._tts_semaphore = asyncio.Semaphore(self._tts_concurrency)
+        
+        # Shared HTTP session, created on first use
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
         
         # Create tools for the agent
         self.tools = [
-            QueryEngineTool(
-                query_engine=self.audio_engine,
-                metadata=ToolMetadata(
-                    name="audio_optimizer",
-                    description="Optimizes audio settings based on content type and requirements"
-                )
+            FunctionTool.from_defaults(
+                fn=self._get_audio_guidance,
+                name="audio_optimizer",
+                description="Optimizes audio settings based on content type and requirements"
             ),
             FunctionTool.from_defaults(fn=self._generate_speech),
             FunctionTool.from_defaults(fn=self._adjust_audio_timing),
@@ -59,41 +126,25 @@ class AudioGeneratorAgent:
         # Simplified without agent for compatibility
         # self.agent = ReActAgent.from_tools(self.tools, verbose=True)
     
-    def _build_audio_knowledge_base(self) -> VectorStoreIndex:
-        """Build knowledge base for audio generation optimization"""
-        documents = [
-            Document(text="Political news should use formal, authoritative tone with slower speech rate for clarity and gravitas."),
-            Document(text="Sports news benefits from energetic, enthusiastic delivery with faster pace to match excitement."),
-            Document(text="Economic news requires clear, measured delivery with emphasis on numbers and key figures."),
-            Document(text="International news should maintain neutral, professional tone suitable for global audience."),
-            Document(text="Regional news (Karnataka, Tamil Nadu, Andhra, Kerala) can use slightly warmer, more personal tone."),
-            Document(text="Breaking news requires urgent, attention-grabbing delivery with emphasis on key facts."),
-            Document(text="For 60-second videos, each news segment should be 8-10 seconds, requiring concise, punchy delivery."),
-            Document(text="Kannada pronunciation should emphasize clear consonants and proper vowel sounds for better comprehension."),
-            Document(text="Audio for mobile viewing (YouTube Shorts) needs higher clarity and slightly boosted volume."),
-            Document(text="Transitions between news items should have brief pauses (0.5 seconds) for better segmentation.")
-        ]
-        return VectorStoreIndex.from_documents(documents)
+    def _get_audio_guidance(self, topic: str) -> str:
+        """Look up audio delivery guidance for a news topic or category"""
+        topic = topic.lower()
+        return AUDIO_GUIDANCE.get(AUDIO_GUIDANCE_ALIASES.get(topic, topic), DEFAULT_AUDIO_GUIDANCE)
     
-    def _optimize_for_category(self, category: str, text: str) -> Dict:
-        """Optimize voice settings based on news category"""
-        category_settings = {
-            "international": {"stability": 0.6, "similarity": 0.8, "speed": 1.0},
-            "national": {"stability": 0.7, "similarity": 0.8, "speed": 1.0},
-            "karnataka": {"stability": 0.5, "similarity": 0.9, "speed": 1.1},
-            "tamilnadu": {"stability": 0.5, "similarity": 0.9, "speed": 1.1},
-            "andhra": {"stability": 0.5, "similarity": 0.9, "speed": 1.1},
-            "kerala": {"stability": 0.5, "similarity": 0.9, "speed": 1.1}
-        }
+    def _optimize_for_category(self, category: str, text: str, word_count: Optional[int] = None) -> Dict:
+        """Optimize voice settings based on news category
         
-        settings = category_settings.get(category, {"stability": 0.5, "similarity": 0.8, "speed": 1.0})
+        Callers that already know the word count can pass it to skip the scan.
+        """
+        stability, similarity, speed = CATEGORY_VOICE_SETTINGS.get(category, DEFAULT_VOICE_SETTINGS)
         
         # Adjust for text length
-        word_count = len(text.split())
+        if word_count is None:
+            word_count = text.count(' ') + 1 if text else 0
         if word_count > 100:
-            settings["speed"] = min(1.3, settings["speed"] + 0.2)  # Speed up for longer text
+            speed = min(1.3, speed + 0.2)  # Speed up for longer text
         
-        return settings
+        return {"stability": stability, "similarity": similarity, "speed": speed}
     
     async def _generate_speech(self, text: str, voice_settings: Dict, output_path: str) -> str:
         """Generate speech using ElevenLabs API"""
@@ -101,56 +152,117 @@ class AudioGeneratorAgent:
             # Optimize text for speech
             optimized_text = self._optimize_text_for_speech(text)
             
-            # Create voice settings
-            settings = VoiceSettings(
-                stability=voice_settings.get("stability", 0.5),
-                similarity_boost=voice_settings.get("similarity", 0.8),
-                style=0.0,
-                use_speaker_boost=True
-            )
-            
-            # Generate audio
-            audio = generate(
-                text=optimized_text,
-                voice=self.voice_id,
-                model=self.model_id,
-                voice_settings=settings
-            )
+            settings = {
+                "stability": round(voice_settings.get("stability", 0.5), 2),
+                "similarity_boost": round(voice_settings.get("similarity", 0.8), 2),
+                "style": 0.0,
+                "use_speaker_boost": True
+            }
             
-            # Save audio file
-            with open(output_path, 'wb') as f:
-                f.write(audio)
+            # Generate and save audio
+            async with self._tts_semaphore:
+                await self._stream_speech_to_file(optimized_text, settings, output_path)
             
-            logger.info(f"Audio generated successfully: {output_path}")
+            logger.info("Audio generated successfully: %s", output_path)
             return output_path
             
         except Exception as e:
             logger.error(f"Error generating speech: {e}")
             raise
     
-    def _optimize_text_for_speech(self, text: str) -> str:
-        """Optimize text for natural speech delivery"""
-        # Add pauses for better pacing
-        text = text.replace('.', '... ')
-        text = text.replace(',', ', ')
-        text = text.replace(':', ': ')
-        
-        # Handle numbers for better pronunciation
-        text = text.replace('%', ' ಶೇಕಡ ')  # Percent in Kannada
-        text = text.replace('&', ' ಮತ್ತು ')  # And in Kannada
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, so TTS requests reuse kept-alive TLS connections"""
+        loop = asyncio.get_running_loop()
+        # Rebuilt when called from a different event loop than the one that created it
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            release_stale_session(self._session, self._session_loop)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._tts_concurrency, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=120, sock_connect=15)
+            )
+            self._session_loop = loop
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+    
+    async def _stream_speech_to_file(self, text: str, settings: Dict, output_path: str) -> None:
+        """Write ElevenLabs audio chunks to disk as they arrive"""
+        if not self.api_key:
+            raise RuntimeError("ElevenLabs API key not configured")
         
-        # Add emphasis markers for important words
-        important_words = ['breaking', 'urgent', 'important', 'significant']
-        for word in important_words:
-            text = text.replace(word.lower(), f"*{word}*")
+        session = await self._get_session()
         
-        return text.strip()
+        # Write to a temp file so an interrupted stream never lands in the cache
+        partial_path = f"{output_path}.part"
+        try:
+            async with session.post(
+                ELEVENLABS_TTS_STREAM_URL.format(voice_id=self.voice_id),
+                headers={"xi-api-key": self.api_key, "Accept": "audio/mpeg"},
+                json={"text": text, "model_id": self.model_id, "voice_settings": settings}
+            ) as response:
+                if response.status != 200:
+                    detail = (await response.text())[:200]
+                    raise RuntimeError(f"ElevenLabs API error {response.status}: {detail}")
+                async with aiofiles.open(partial_path, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(TTS_CHUNK_SIZE):
+                        await f.write(chunk)
+            os.replace(partial_path, output_path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+    
+    def _optimize_text_for_speech(self, text: str) -> str:
+        """Optimize text for natural speech delivery"""
+        return optimize_text_for_speech(text)
+    
+    async def _probe_duration(self, audio_path: str) -> float:
+        """Read the audio duration in seconds with ffprobe (no decoding)"""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "ffprobe", "-v", "error",
+                "-show_entries", "format=duration",
+                "-of", "csv=p=0",
+                audio_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+        except FileNotFoundError:
+            # No ffprobe on PATH; only now pay for a full decode
+            return await asyncio.to_thread(self._decode_duration, audio_path)
+        stdout, _ = await proc.communicate()
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffprobe failed for {audio_path}")
+        return float(stdout.strip())
+    
+    @staticmethod
+    def _decode_duration(audio_path: str) -> float:
+        """Duration in seconds by decoding the file with pydub"""
+        from pydub import AudioSegment
+        return len(AudioSegment.from_file(audio_path)) / 1000.0
+    
+    @staticmethod
+    def _atempo_filter(speed_factor: float) -> str:
+        """Build an ffmpeg atempo chain; each stage only accepts 0.5-2.0"""
+        stages = []
+        while speed_factor > 2.0:
+            stages.append(2.0)
+            speed_factor /= 2.0
+        while speed_factor < 0.5:
+            stages.append(0.5)
+            speed_factor /= 0.5
+        stages.append(speed_factor)
+        return ",".join(f"atempo={stage:.4f}" for stage in stages)
     
     async def _adjust_audio_timing(self, audio_path: str, target_duration: float) -> str:
         """Adjust audio timing to fit target duration"""
         try:
-            audio = AudioSegment.from_file(audio_path)
-            current_duration = len(audio) / 1000.0  # Convert to seconds
+            current_duration = await self._probe_duration(audio_path)
             
             if abs(current_duration - target_duration) < 0.5:
                 return audio_path  # Already close enough
@@ -159,12 +271,18 @@ class AudioGeneratorAgent:
             speed_factor = current_duration / target_duration
             
             if 0.8 <= speed_factor <= 1.25:  # Reasonable speed adjustment range
-                # Adjust speed
-                adjusted_audio = audio.speedup(playback_speed=speed_factor)
-                
-                # Save adjusted audio
+                # Adjust speed with ffmpeg's atempo filter (pitch preserving)
                 adjusted_path = audio_path.replace('.mp3', '_adjusted.mp3')
-                adjusted_audio.export(adjusted_path, format="mp3", bitrate="128k")
+                proc = await asyncio.create_subprocess_exec(
+                    "ffmpeg", "-y", "-i", audio_path,
+                    "-filter:a", self._atempo_filter(speed_factor),
+                    "-b:a", "128k",
+                    adjusted_path,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                if await proc.wait() != 0:
+                    raise RuntimeError(f"ffmpeg atempo failed for {audio_path}")
                 
                 logger.info(f"Audio timing adjusted: {current_duration:.2f}s -> {target_duration:.2f}s")
                 return adjusted_path
@@ -185,31 +303,16 @@ class AudioGeneratorAgent:
         """Generate optimized Kannada audio for news content"""
         try:
             # Create output path
-            os.makedirs("./data/audio_cache", exist_ok=True)
-            output_path = f"./data/audio_cache/{category}_{hash(text) % 10000}.mp3"
+            # Stable content digest: hash() is salted per process and % 10000 collides
+            digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+            cache_file = self.cache_dir / f"{category}_{digest}.mp3"
+            output_path = str(cache_file)
             
             # Check cache first
-            if os.path.exists(output_path):
-                logger.info(f"Using cached audio: {output_path}")
+            if cache_file.exists():
+                logger.info("Using cached audio: %s", output_path)
                 return output_path
             
-            # Use agent to optimize audio generation
-            prompt = f"""
-            Generate optimized Kannada audio for {category} news:
-            Text: {text}
-            Target duration: {target_duration or 'flexible'} seconds
-            
-            Steps:
-            1. Use audio_optimizer to determine best settings for {category} news
-            2. Optimize text for natural Kannada speech delivery
-            3. Generate speech with optimized voice settings
-            4. If target duration specified, adjust timing accordingly
-            
-            Ensure clear pronunciation and appropriate tone for news delivery.
-            """
-            
-            response = await self.agent.achat(prompt)
-            
             # Get optimized settings
             voice_settings = self._optimize_for_category(category, text)
             
@@ -226,34 +329,29 @@ class AudioGeneratorAgent:
             logger.error(f"Error generating Kannada audio for {category}: {e}")
             raise
     
+    async def generate_category_audio(self, text: str, category: str) -> str:
+        """Generate audio for one news item, timed to its category's segment length"""
+        return await self.generate_kannada_audio(
+            text, category, SEGMENT_DURATIONS.get(category, DEFAULT_SEGMENT_DURATION)
+        )
+    
     async def generate_batch_audio(self, content_dict: Dict[str, str]) -> Dict[str, str]:
         """Generate audio for multiple news items"""
-        # Calculate timing for each segment (60 seconds total)
-        timing_allocation = {
-            "international": 8,
-            "national": 8, 
-            "karnataka": 10,  # Priority
-            "tamilnadu": 8,
-            "andhra": 8,
-            "kerala": 8
-        }
-        
         audio_files = {}
-        tasks = []
-        
-        for category, text in content_dict.items():
-            target_duration = timing_allocation.get(category, 8)
-            task = self.generate_kannada_audio(text, category, target_duration)
-            tasks.append((category, task))
+        coros = {
+            category: self.generate_category_audio(text, category)
+            for category, text in content_dict.items()
+        }
         
         # Generate all audio files concurrently
-        for category, task in tasks:
-            try:
-                audio_path = await task
-                audio_files[category] = audio_path
-                logger.info(f"Audio generated for {category}: {audio_path}")
-            except Exception as e:
-                logger.error(f"Failed to generate audio for {category}: {e}")
+        results = await asyncio.gather(*coros.values(), return_exceptions=True)
+        
+        for category, result in zip(coros, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to generate audio for %s: %s", category, result)
                 audio_files[category] = None
+            else:
+                audio_files[category] = result
+                logger.info("Audio generated for %s: %s", category, result)
         
         return audio_files
\ No newline at end of file
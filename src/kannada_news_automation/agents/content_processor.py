@@ -1,100 +1,182 @@
-from llama_index.core import VectorStoreIndex, Document
 from llama_index.llms.openai import OpenAI
 # from llama_index.core.agent import ReActAgent  # Disabled for compatibility
-from llama_index.core.tools import QueryEngineTool, ToolMetadata, FunctionTool
-from typing import Dict, List
+from llama_index.core.tools import FunctionTool
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, NamedTuple, Union
+import asyncio
+import hashlib
 import logging
+import os
 import re
 
+try:
+    import numpy as np
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Summarization techniques by news topic
+SUMMARIZATION_GUIDANCE = MappingProxyType({
+    "structure": "Effective news summaries start with the most important information (Who, What, When, Where, Why).",
+    "video": "For video content, each sentence should be concise and impactful, avoiding complex subordinate clauses.",
+    "political": "Political news summaries should focus on policy impact and public consequences rather than process details.",
+    "economic": "Economic news should translate complex data into simple terms that common people can understand.",
+    "regional": "Regional news summaries should emphasize local impact and community relevance.",
+    "international": "International news for Indian audience should connect to domestic implications and relevance.",
+    "sports": "Sports news should capture the excitement and key moments without excessive technical details.",
+    "breaking": "Breaking news summaries need urgency markers and clear factual statements."
+})
+
+SUMMARIZATION_ALIASES = MappingProxyType({
+    "karnataka": "regional",
+    "tamilnadu": "regional",
+    "andhra": "regional",
+    "kerala": "regional",
+    "national": "political"
+})
+
+# Presentation rules for video scripts by aspect
+VIDEO_GUIDANCE = MappingProxyType({
+    "sentences": "Video content should be structured in short, digestible segments of 8-12 words per sentence.",
+    "pacing": "Each news segment in a 60-second video should be 8-10 seconds for optimal pacing.",
+    "transitions": "Transitions between news items should be smooth with connecting phrases like 'Meanwhile' or 'In other news'.",
+    "numbers": "Numbers and statistics should be presented clearly with context for better audio comprehension.",
+    "names": "Names of people and places should be phonetically clear for text-to-speech systems.",
+    "abbreviations": "Video scripts should avoid abbreviations and use full forms for better speech synthesis.",
+    "tone": "Content should maintain journalistic neutrality while being engaging for mobile viewers.",
+    "conclusion": "Each summary should end with a clear conclusion or impact statement."
+})
+
+# Symbols and currency amounts rewritten for speech; titles such as "Dr." are left as written
+_AUDIO_RE = re.compile(r'&|\b(\d+)%|\$(\d+)|₹(\d+)|[,:]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def _expand_for_audio(match: re.Match) -> str:
+    percent, dollars, rupees = match.groups()
+    if percent:
+        return f"{percent} percent"
+    if dollars:
+        return f"{dollars} dollars"
+    if rupees:
+        return f"{rupees} rupees"
+    token = match.group()
+    return 'and' if token == '&' else token + ' '
+
+# Reporting verbs that mark a sentence as a key point
+_IMPORTANT_WORDS = ('said', 'announced', 'revealed', 'confirmed', 'reported', 'decided')
+
+# Below this many sentences the JIT kernel is slower than plain Python
+_NUMBA_MIN_SENTENCES = 200
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _score_sentences_kernel(word_hashes, offsets, important_hashes):
+        """Keyword hits plus position bonus for each sentence's slice of word_hashes"""
+        n = offsets.shape[0] - 1
+        scores = np.empty(n, dtype=np.float64)
+        for i in prange(n):
+            hits = 0
+            for k in range(important_hashes.shape[0]):
+                for j in range(offsets[i], offsets[i + 1]):
+                    if word_hashes[j] == important_hashes[k]:
+                        hits += 1
+                        break
+            scores[i] = hits + (n - i) / n
+        return scores
+
+def _score_sentences_numba(sentences: List[str]) -> List[float]:
+    """Encode sentences as flat word-hash arrays and score them in parallel"""
+    word_lists = [sentence.lower().split() for sentence in sentences]
+    offsets = np.zeros(len(word_lists) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(words) for words in word_lists])
+    word_hashes = np.fromiter(
+        (hash(word) for words in word_lists for word in words),
+        dtype=np.int64, count=int(offsets[-1])
+    )
+    important_hashes = np.fromiter((hash(word) for word in _IMPORTANT_WORDS), dtype=np.int64)
+    return _score_sentences_kernel(word_hashes, offsets, important_hashes).tolist()
+
+class _Tokens(NamedTuple):
+    """Article text split once and shared by the summary helpers"""
+    raw: str
+    word_count: int
+    words: List[str]
+    sentences: List[str]
+
+def _tokenize(text: str) -> _Tokens:
+    words = text.split()
+    sentences = [s for s in (part.strip() for part in text.split('.')) if len(s) > 20]
+    return _Tokens(text, len(words), words, sentences)
+
 class ContentProcessingAgent:
     def __init__(self):
         """Initialize content processing agent with video-optimized summarization"""
         self.llm = OpenAI(model="gpt-4")
-        self.summarization_kb = self._build_summarization_knowledge_base()
-        self.video_kb = self._build_video_knowledge_base()
         
-        # Create query engines
-        self.summary_engine = self.summarization_kb.as_query_engine()
-        self.video_engine = self.video_kb.as_query_engine()
+        # Cap concurrent OpenAI requests to respect rate limits
+        self._llm_semaphore = asyncio.Semaphore(int(os.getenv("OPENAI_MAX_CONCURRENCY", "4")))
+        
+        # Summary cache directory, one text file per input digest
+        self.cache_dir = Path("./data/summary_cache")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # Create tools
         self.tools = [
-            QueryEngineTool(
-                query_engine=self.summary_engine,
-                metadata=ToolMetadata(
-                    name="summarization_optimizer",
-                    description="Optimizes content summarization for video format"
-                )
+            FunctionTool.from_defaults(
+                fn=self._get_summarization_guidance,
+                name="summarization_optimizer",
+                description="Optimizes content summarization for video format"
             ),
-            QueryEngineTool(
-                query_engine=self.video_engine,
-                metadata=ToolMetadata(
-                    name="video_formatter",
-                    description="Formats content for video presentation"
-                )
+            FunctionTool.from_defaults(
+                fn=self._get_video_guidance,
+                name="video_formatter",
+                description="Formats content for video presentation"
             ),
             FunctionTool.from_defaults(fn=self._extract_key_points),
             FunctionTool.from_defaults(fn=self._optimize_for_audio),
             FunctionTool.from_defaults(fn=self._calculate_reading_time)
         ]
-        
-        # Use simple query engine instead of agent for now
-        self.query_engine = self.summarization_kb.as_query_engine(llm=self.llm)
     
-    def _build_summarization_knowledge_base(self) -> VectorStoreIndex:
-        """Build knowledge base for content summarization techniques"""
-        documents = [
-            Document(text="Effective news summaries start with the most important information (Who, What, When, Where, Why)."),
-            Document(text="For video content, each sentence should be concise and impactful, avoiding complex subordinate clauses."),
-            Document(text="Political news summaries should focus on policy impact and public consequences rather than process details."),
-            Document(text="Economic news should translate complex data into simple terms that common people can understand."),
-            Document(text="Regional news summaries should emphasize local impact and community relevance."),
-            Document(text="International news for Indian audience should connect to domestic implications and relevance."),
-            Document(text="Sports news should capture the excitement and key moments without excessive technical details."),
-            Document(text="Breaking news summaries need urgency markers and clear factual statements.")
-        ]
-        return VectorStoreIndex.from_documents(documents)
+    def _get_summarization_guidance(self, topic: str) -> str:
+        """Look up summarization technique for a news topic or category"""
+        topic = topic.lower()
+        return SUMMARIZATION_GUIDANCE.get(
+            SUMMARIZATION_ALIASES.get(topic, topic),
+            SUMMARIZATION_GUIDANCE["structure"]
+        )
     
-    def _build_video_knowledge_base(self) -> VectorStoreIndex:
-        """Build knowledge base for video content optimization"""
-        documents = [
-            Document(text="Video content should be structured in short, digestible segments of 8-12 words per sentence."),
-            Document(text="Each news segment in a 60-second video should be 8-10 seconds for optimal pacing."),
-            Document(text="Transitions between news items should be smooth with connecting phrases like 'Meanwhile' or 'In other news'."),
-            Document(text="Numbers and statistics should be presented clearly with context for better audio comprehension."),
-            Document(text="Names of people and places should be phonetically clear for text-to-speech systems."),
-            Document(text="Video scripts should avoid abbreviations and use full forms for better speech synthesis."),
-            Document(text="Content should maintain journalistic neutrality while being engaging for mobile viewers."),
-            Document(text="Each summary should end with a clear conclusion or impact statement.")
-        ]
-        return VectorStoreIndex.from_documents(documents)
+    def _get_video_guidance(self, aspect: str) -> str:
+        """Look up video presentation rules; returns all rules for unknown aspects"""
+        guidance = VIDEO_GUIDANCE.get(aspect.lower())
+        return guidance if guidance is not None else " ".join(VIDEO_GUIDANCE.values())
     
-    def _extract_key_points(self, text: str, max_points: int = 3) -> List[str]:
+    def _extract_key_points(self, text: Union[str, _Tokens], max_points: int = 3) -> List[str]:
         """Extract key points from news content"""
         # Simple extraction based on sentence importance
-        sentences = text.split('.')
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
+        tokens = text if isinstance(text, _Tokens) else _tokenize(text)
+        sentences = tokens.sentences
         
-        # Score sentences based on keywords
-        important_words = ['said', 'announced', 'revealed', 'confirmed', 'reported', 'decided']
-        scored_sentences = []
-        
-        for sentence in sentences:
-            score = 0
-            words = sentence.lower().split()
-            
-            # Score based on important words
-            for word in important_words:
-                if word in words:
-                    score += 1
-            
-            # Score based on sentence position (earlier sentences are more important)
-            position_bonus = (len(sentences) - sentences.index(sentence)) / len(sentences)
-            score += position_bonus
+        # Long inputs are scored by the parallel JIT kernel when numba is installed
+        if NUMBA_AVAILABLE and len(sentences) >= _NUMBA_MIN_SENTENCES:
+            scored_sentences = list(zip(sentences, _score_sentences_numba(sentences)))
+        else:
+            scored_sentences = []
             
-            scored_sentences.append((sentence, score))
+            for i, sentence in enumerate(sentences):
+                words = set(sentence.lower().split())
+                
+                # Score based on important words
+                score = sum(1 for word in _IMPORTANT_WORDS if word in words)
+                
+                # Score based on sentence position (earlier sentences are more important)
+                position_bonus = (len(sentences) - i) / len(sentences)
+                score += position_bonus
+                
+                scored_sentences.append((sentence, score))
         
         # Sort by score and return top points
         scored_sentences.sort(key=lambda x: x[1], reverse=True)
@@ -102,55 +184,64 @@ class ContentProcessingAgent:
     
     def _optimize_for_audio(self, text: str) -> str:
         """Optimize text for audio delivery"""
-        # Replace problematic characters and abbreviations
-        optimized = text.replace('&', 'and')
-        optimized = re.sub(r'\b(Dr|Mr|Mrs|Ms)\b', lambda m: m.group().replace('.', ''), optimized)
-        optimized = re.sub(r'\b(\d+)%', r'\1 percent', optimized)
-        optimized = re.sub(r'\$(\d+)', r'\1 dollars', optimized)
-        optimized = re.sub(r'₹(\d+)', r'\1 rupees', optimized)
-        
-        # Add pauses for better pacing
-        optimized = optimized.replace(',', ', ')
-        optimized = optimized.replace(':', ': ')
+        # Expand symbols and abbreviations, and add pauses, in a single pass
+        optimized = _AUDIO_RE.sub(_expand_for_audio, text)
         
         # Clean up multiple spaces
-        optimized = re.sub(r'\s+', ' ', optimized)
+        optimized = _WHITESPACE_RE.sub(' ', optimized)
         
         return optimized.strip()
     
-    def _calculate_reading_time(self, text: str, words_per_minute: int = 150) -> float:
+    def _calculate_reading_time(self, text: Union[str, _Tokens], words_per_minute: int = 150) -> float:
         """Calculate estimated reading/speaking time"""
-        word_count = len(text.split())
+        if isinstance(text, _Tokens):
+            word_count = text.word_count
+        else:
+            # Summaries are whitespace-normalized, so counting spaces gives the word count
+            word_count = text.count(' ') + 1 if text else 0
         return (word_count / words_per_minute) * 60  # Return seconds
     
-    async def create_video_summary(self, content: str, category: str, target_duration: float = 10.0) -> str:
-        """Create optimized summary for video content"""
+    async def _refine_summary(self, key_points_text: str, category: str, target_duration: float) -> str:
+        """Polish extracted key points into narration with one short LLM call"""
+        prompt = (
+            f"Rewrite these {category} news points as clear, simple narration of at most "
+            f"{int(target_duration * 2.5)} words. Return only the narration.\n\n{key_points_text}"
+        )
         try:
-            prompt = f"""
-            Create a video-optimized summary for {category} news content:
-            
-            Original content: {content}
-            Target duration: {target_duration} seconds
-            Target word count: {int(target_duration * 2.5)} words (150 words per minute speech rate)
-            
-            Requirements:
-            1. Use summarization_optimizer to create engaging, concise summary
-            2. Use video_formatter to optimize for video presentation
-            3. Extract key points and organize them logically
-            4. Optimize text for audio delivery (clear pronunciation, proper pacing)
-            5. Ensure reading time matches target duration
-            
-            Focus on:
-            - Clear, simple sentences
-            - Important facts first
-            - Engaging language for Kannada-speaking audience
-            - Smooth flow for video narration
-            """
-            
-            response = await self.agent.achat(prompt)
+            async with self._llm_semaphore:
+                response = await self.llm.acomplete(prompt)
+            return response.text.strip() or key_points_text
+        except Exception as e:
+            logger.warning(f"Summary refinement failed for {category}, using key points: {e}")
+            return key_points_text
+    
+    async def create_video_summary(
+        self, 
+        content: str, 
+        category: str, 
+        target_duration: float = 10.0,
+        refine_with_llm: bool = False
+    ) -> str:
+        """Create optimized summary for video content
+        
+        The summary is assembled deterministically from extracted key points.
+        Pass refine_with_llm=True to polish the key points with a single LLM call.
+        Summaries are cached on disk keyed by their inputs.
+        """
+        key = f"{category}|{target_duration}|{int(refine_with_llm)}|{content}"
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        cache_file = self.cache_dir / f"{digest}.txt"
+        
+        if cache_file.exists():
+            logger.info("Using cached summary for %s: %s", category, cache_file)
+            return cache_file.read_text(encoding='utf-8')
+        
+        try:
+            # Tokenize once; key points and the fallback share the result
+            tokens = _tokenize(content)
             
             # Extract key points and create structured summary
-            key_points = self._extract_key_points(content)
+            key_points = self._extract_key_points(tokens)
             
             # Create summary based on category and key points
             if category in ['karnataka', 'tamilnadu', 'andhra', 'kerala']:
@@ -163,10 +254,12 @@ class ContentProcessingAgent:
             # Combine key points into flowing narrative
             if key_points:
                 main_summary = ". ".join(key_points[:2])  # Use top 2 key points
+                if refine_with_llm and self.llm:
+                    main_summary = await self._refine_summary(main_summary, category, target_duration)
                 final_summary = summary_prefix + main_summary
             else:
                 # Fallback to first 100 words of content
-                words = content.split()[:25]  # ~10 seconds of speech
+                words = tokens.words[:25]  # ~10 seconds of speech
                 final_summary = summary_prefix + " ".join(words)
             
             # Optimize for audio
@@ -179,8 +272,17 @@ class ContentProcessingAgent:
                 words = final_summary.split()
                 target_words = int(target_duration * 2.5)  # 150 wpm = 2.5 wps
                 final_summary = " ".join(words[:target_words]) + "."
+                estimated_time = self._calculate_reading_time(final_summary)
             
-            logger.info(f"Created summary for {category}: {len(final_summary.split())} words, ~{self._calculate_reading_time(final_summary):.1f}s")
+            logger.info(
+                "Created summary for %s: %d words, ~%.1fs",
+                category, final_summary.count(' ') + 1, estimated_time
+            )
+            
+            try:
+                cache_file.write_text(final_summary, encoding='utf-8')
+            except OSError as e:
+                logger.warning(f"Could not cache summary for {category}: {e}")
             
             return final_summary
             
@@ -203,17 +305,25 @@ class ContentProcessingAgent:
         }
         
         processed_content = {}
+        coros = {}
         
         for category, news_item in news_data.items():
             if news_item and news_item.get('content'):
-                target_time = time_allocation.get(category, 8)
-                summary = await self.create_video_summary(
+                coros[category] = self.create_video_summary(
                     news_item['content'], 
                     category, 
-                    target_time
+                    time_allocation.get(category, 8)
                 )
-                processed_content[category] = summary
             else:
-                logger.warning(f"No content found for category: {category}")
+                logger.warning("No content found for category: %s", category)
+        
+        # Summarize all categories concurrently
+        results = await asyncio.gather(*coros.values(), return_exceptions=True)
+        
+        for category, result in zip(coros, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to process content for %s: %s", category, result)
+            else:
+                processed_content[category] = result
         
         return processed_content
\ No newline at end of file
@@ -1,24 +1,98 @@
-from llama_index.core import VectorStoreIndex, Document, ServiceContext
+from llama_index.core import VectorStoreIndex
 from llama_index.llms.openai import OpenAI
 from llama_index.core.tools import QueryEngineTool, ToolMetadata, FunctionTool
+from ..knowledge_bases.store import load_knowledge_base
+from ..utils.http_session import release_stale_session
 import asyncio
 import aiohttp
 import feedparser
-from typing import Dict, List
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import json
 import logging
+import os
+import time
 
 logger = logging.getLogger(__name__)
 
+# News categories in bulletin order
+CATEGORIES = ("international", "national", "karnataka", "tamilnadu", "andhra", "kerala")
+
+# Title keywords and their engagement score adjustment, in scoring order
+ENGAGEMENT_KEYWORDS = (
+    ('breaking', 0.3), ('urgent', 0.3), ('exclusive', 0.3),
+    ('scandal', 0.3), ('victory', 0.3), ('defeat', 0.3),
+    ('announces', 0.2), ('launches', 0.2), ('opens', 0.2),
+    ('closes', 0.2), ('wins', 0.2), ('loses', 0.2),
+    ('meeting', -0.1), ('discussion', -0.1), ('routine', -0.1),
+    ('regular', -0.1), ('annual', -0.1)
+)
+
+try:
+    import ahocorasick
+    
+    # One automaton pass over a title finds every keyword, overlaps included
+    _ENGAGEMENT_AUTOMATON = ahocorasick.Automaton()
+    for _index, (_keyword, _weight) in enumerate(ENGAGEMENT_KEYWORDS):
+        _ENGAGEMENT_AUTOMATON.add_word(_keyword, _index)
+    _ENGAGEMENT_AUTOMATON.make_automaton()
+except ImportError:
+    _ENGAGEMENT_AUTOMATON = None
+
+# Trend analyses are reused within one bulletin refresh
+ANALYSIS_CACHE_TTL = 300  # seconds
+
+# Only the newest entries of each feed are used
+MAX_ENTRIES_PER_FEED = 10
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_RSS1 = "{http://purl.org/rss/1.0/}"  # RSS 1.0 (RDF) feeds
+_DC = "{http://purl.org/dc/elements/1.1/}"
+
+# ETag/Last-Modified validators and last parsed entries per feed URL
+FEED_CACHE_FILE = Path("./data/feed_cache.json")
+
+# Knowledge base documents: trending news patterns
+TRENDING_DOCUMENTS = (
+    "News becomes trending when it has high social media engagement, multiple source coverage, and rapid spread across platforms within 6 hours.",
+    "Political news trends differently - requires controversy, policy impact, or election relevance.",
+    "Sports news peaks during match times and major tournaments.",
+    "Economic news trends when it affects common people - inflation, fuel prices, job market.",
+    "Entertainment news needs celebrity involvement or cultural significance.",
+    "Regional news trends when it impacts local communities or has state-wide implications."
+)
+
+# Knowledge base documents: regional news relevance
+REGIONAL_DOCUMENTS = (
+    "Karnataka news should focus on Bangalore tech industry, regional politics, cultural events, and development projects.",
+    "Tamil Nadu news interests include Chennai industries, Tamil cinema, regional politics, and educational institutions.",
+    "Andhra Pradesh news covers Hyderabad tech sector, state bifurcation issues, and agricultural policies.",
+    "Kerala news includes maritime trade, tourism, agricultural issues, and Gulf migration topics.",
+    "National news relevant to South India: central policies affecting states, inter-state disputes, infrastructure projects.",
+    "International news relevant to South Indians: IT industry impacts, Gulf country policies, education opportunities."
+)
+
 class NewsCollectionAgent:
     def __init__(self):
         """Initialize news collection agent with LlamaIndex RAG capabilities"""
         self.llm = OpenAI(model="gpt-4")
-        self.trending_kb = self._build_trending_knowledge_base()
-        self.regional_kb = self._build_regional_knowledge_base()
         
-        # Create query engines
-        self.trending_engine = self.trending_kb.as_query_engine()
-        self.regional_engine = self.regional_kb.as_query_engine()
+        # HTTP session shared by all feed fetches, created on first use
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fetch_semaphore: Optional[asyncio.Semaphore] = None
+        
+        # Trend analysis responses: (category, prompt digest) -> (created, text)
+        self._analysis_cache: Dict[tuple, tuple] = {}
+        
+        # Conditional GET state, kept across restarts
+        self._feed_meta: Dict[str, Dict] = self._load_feed_meta()
+        self._feed_meta_lock = asyncio.Lock()
         
         # Define news sources
         self.news_sources = {
@@ -44,9 +118,47 @@ class NewsCollectionAgent:
                 "https://www.thehindu.com/news/national/kerala/feeder/default.rss"
             ]
         }
+    
+    # Knowledge bases, query engines and tools are built on first use so
+    # constructing the agent does not embed any documents
+    @cached_property
+    def trending_kb(self) -> VectorStoreIndex:
+        """Knowledge base for trending news patterns"""
+        return load_knowledge_base("trending", TRENDING_DOCUMENTS)
+    
+    @cached_property
+    def regional_kb(self) -> VectorStoreIndex:
+        """Knowledge base for regional news relevance"""
+        return load_knowledge_base("regional", REGIONAL_DOCUMENTS)
+    
+    @cached_property
+    def trending_engine(self):
+        return self.trending_kb.as_query_engine()
+    
+    @cached_property
+    def regional_engine(self):
+        return self.regional_kb.as_query_engine()
+    
+    @cached_property
+    def query_engine(self):
+        # Use simple query engine instead of agent for now
+        return self.trending_kb.as_query_engine(llm=self.llm)
+    
+    async def _get_query_engine(self):
+        """Trend query engine, built off the event loop on first use
         
-        # Create tools for the agent
-        self.tools = [
+        Loading or embedding the knowledge base blocks; concurrent first
+        calls share one build through load_knowledge_base's lock.
+        """
+        engine = self.__dict__.get("query_engine")
+        if engine is None:
+            engine = await asyncio.to_thread(lambda: self.query_engine)
+        return engine
+    
+    @cached_property
+    def tools(self) -> List:
+        """Tools for the agent"""
+        return [
             QueryEngineTool(
                 query_engine=self.trending_engine,
                 metadata=ToolMetadata(
@@ -64,90 +176,220 @@ class NewsCollectionAgent:
             FunctionTool.from_defaults(fn=self._fetch_rss_news),
             FunctionTool.from_defaults(fn=self._analyze_engagement)
         ]
+    
+    def _load_feed_meta(self) -> Dict[str, Dict]:
+        """Load persisted feed validators, starting empty if unreadable"""
+        try:
+            return json.loads(FEED_CACHE_FILE.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def _write_feed_meta(data: str):
+        """Replace the feed cache file atomically"""
+        FEED_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = FEED_CACHE_FILE.with_suffix('.json.tmp')
+        tmp_file.write_text(data, encoding='utf-8')
+        os.replace(tmp_file, FEED_CACHE_FILE)
+    
+    async def _save_feed_meta(self):
+        """Persist feed validators without blocking the event loop"""
+        # Serialized one at a time so the shared temp file is never written twice at once
+        async with self._feed_meta_lock:
+            try:
+                await asyncio.to_thread(self._write_feed_meta, json.dumps(self._feed_meta))
+            except OSError as e:
+                logger.warning(f"Could not save feed cache: {e}")
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, reusing its connection pool and DNS cache"""
+        loop = asyncio.get_running_loop()
+        # A session belongs to the loop that created it; callers on another loop (scripts, tests) get a new one
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            release_stale_session(self._session, self._session_loop)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=32, limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=60
+                )
+            )
+            self._session_loop = loop
+            # Cap in-flight feed requests; created with the session so it shares its loop
+            self._fetch_semaphore = asyncio.Semaphore(8)
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+    
+    @staticmethod
+    def _entry_from_element(elem, source: str) -> Dict:
+        """Build a news item from an RSS 2.0/1.0 <item> or Atom <entry> element"""
+        def first_text(*tags):
+            for tag in tags:
+                value = elem.findtext(tag)
+                if value:
+                    return value.strip()
+            return ''
         
-        # Use simple query engine instead of agent for now
-        self.query_engine = self.trending_kb.as_query_engine(llm=self.llm)
-    
-    def _build_trending_knowledge_base(self) -> VectorStoreIndex:
-        """Build knowledge base for trending news patterns"""
-        documents = [
-            Document(text="News becomes trending when it has high social media engagement, multiple source coverage, and rapid spread across platforms within 6 hours."),
-            Document(text="Political news trends differently - requires controversy, policy impact, or election relevance."),
-            Document(text="Sports news peaks during match times and major tournaments."),
-            Document(text="Economic news trends when it affects common people - inflation, fuel prices, job market."),
-            Document(text="Entertainment news needs celebrity involvement or cultural significance."),
-            Document(text="Regional news trends when it impacts local communities or has state-wide implications.")
-        ]
-        return VectorStoreIndex.from_documents(documents)
-    
-    def _build_regional_knowledge_base(self) -> VectorStoreIndex:
-        """Build knowledge base for regional news relevance"""
-        documents = [
-            Document(text="Karnataka news should focus on Bangalore tech industry, regional politics, cultural events, and development projects."),
-            Document(text="Tamil Nadu news interests include Chennai industries, Tamil cinema, regional politics, and educational institutions."),
-            Document(text="Andhra Pradesh news covers Hyderabad tech sector, state bifurcation issues, and agricultural policies."),
-            Document(text="Kerala news includes maritime trade, tourism, agricultural issues, and Gulf migration topics."),
-            Document(text="National news relevant to South India: central policies affecting states, inter-state disputes, infrastructure projects."),
-            Document(text="International news relevant to South Indians: IT industry impacts, Gulf country policies, education opportunities.")
-        ]
-        return VectorStoreIndex.from_documents(documents)
+        link = first_text('link', f'{_RSS1}link')
+        if not link:
+            link_elem = elem.find(f'{_ATOM}link')
+            link = link_elem.get('href', '') if link_elem is not None else ''
+        
+        return {
+            'title': first_text('title', f'{_RSS1}title', f'{_ATOM}title'),
+            'summary': first_text('description', f'{_RSS1}description', f'{_ATOM}summary', f'{_ATOM}content'),
+            'link': link,
+            'published': first_text('pubDate', f'{_DC}date', f'{_ATOM}published', f'{_ATOM}updated'),
+            'source': source
+        }
+    
+    async def _stream_entries(self, response: aiohttp.ClientResponse, source: str) -> List[Dict]:
+        """Parse entries while the feed downloads, stopping after MAX_ENTRIES_PER_FEED"""
+        parser = etree.XMLPullParser(events=("end",), tag=("item", f"{_RSS1}item", f"{_ATOM}entry"), recover=True)
+        entries = []
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            parser.feed(chunk)
+            for _, elem in parser.read_events():
+                entries.append(self._entry_from_element(elem, source))
+                elem.clear()
+                if len(entries) >= MAX_ENTRIES_PER_FEED:
+                    # The rest of the body is never downloaded
+                    return entries
+        parser.close()
+        return entries
+    
+    async def _fetch_feed(self, session: aiohttp.ClientSession, source: str) -> List[Dict]:
+        """Fetch and parse the latest entries of a single RSS feed
+        
+        Sends the feed's ETag/Last-Modified validators so an unchanged feed
+        answers 304 and its previously parsed entries are reused.
+        """
+        meta = self._feed_meta.get(source)
+        headers = {}
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        
+        async with self._fetch_semaphore, session.get(source, headers=headers) as response:
+            if response.status == 304 and meta:
+                # Copies, since callers annotate items in place
+                return [dict(item) for item in meta['entries']]
+            if response.status != 200:
+                return []
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            
+            if etree is not None:
+                entries = await self._stream_entries(response, source)
+            else:
+                content = await response.text()
+        
+        if etree is None:
+            # Parse off the event loop so other downloads keep progressing
+            feed = await asyncio.to_thread(feedparser.parse, content)
+            entries = [
+                {
+                    'title': entry.title,
+                    'summary': entry.get('summary') or entry.get('description', ''),
+                    'link': entry.link,
+                    'published': entry.get('published', ''),
+                    'source': source
+                }
+                for entry in feed.entries[:MAX_ENTRIES_PER_FEED]
+            ]
+        
+        if etag or last_modified:
+            self._feed_meta[source] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'entries': [dict(item) for item in entries]
+            }
+        return entries
     
     async def _fetch_rss_news(self, sources: List[str]) -> List[Dict]:
         """Fetch news from RSS feeds"""
         all_news = []
-        async with aiohttp.ClientSession() as session:
-            for source in sources:
-                try:
-                    async with session.get(source) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            feed = feedparser.parse(content)
-                            
-                            for entry in feed.entries[:10]:  # Latest 10 from each source
-                                news_item = {
-                                    'title': entry.title,
-                                    'summary': entry.get('summary', ''),
-                                    'link': entry.link,
-                                    'published': entry.get('published', ''),
-                                    'source': source
-                                }
-                                all_news.append(news_item)
-                except Exception as e:
-                    logger.error(f"Error fetching from {source}: {e}")
-                    continue
+        session = await self._get_session()
+        
+        # Fetch all feeds concurrently
+        results = await asyncio.gather(
+            *(self._fetch_feed(session, source) for source in sources),
+            return_exceptions=True
+        )
+        
+        for source, result in zip(sources, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching from {source}: {result}")
+            else:
+                all_news.extend(result)
+        
+        await self._save_feed_meta()
         return all_news
     
     def _analyze_engagement(self, news_items: List[Dict]) -> List[Dict]:
         """Analyze engagement potential of news items"""
         # Simple engagement scoring based on title keywords and recency
-        engagement_keywords = {
-            'high': ['breaking', 'urgent', 'exclusive', 'scandal', 'victory', 'defeat'],
-            'medium': ['announces', 'launches', 'opens', 'closes', 'wins', 'loses'],
-            'low': ['meeting', 'discussion', 'routine', 'regular', 'annual']
-        }
-        
         for item in news_items:
             score = 0.5  # baseline
             title_lower = item['title'].lower()
             
-            for keyword in engagement_keywords['high']:
-                if keyword in title_lower:
-                    score += 0.3
+            # Each keyword counts once, however often it occurs
+            if _ENGAGEMENT_AUTOMATON is not None:
+                matched = sorted({index for _, index in _ENGAGEMENT_AUTOMATON.iter(title_lower)})
+            else:
+                matched = [
+                    index for index, (keyword, _) in enumerate(ENGAGEMENT_KEYWORDS)
+                    if keyword in title_lower
+                ]
             
-            for keyword in engagement_keywords['medium']:
-                if keyword in title_lower:
-                    score += 0.2
-                    
-            for keyword in engagement_keywords['low']:
-                if keyword in title_lower:
-                    score -= 0.1
+            for index in matched:
+                score += ENGAGEMENT_KEYWORDS[index][1]
             
             item['engagement_score'] = min(1.0, max(0.1, score))
         
         return sorted(news_items, key=lambda x: x['engagement_score'], reverse=True)
     
-    async def collect_trending_news(self, category: str) -> Dict:
-        """Collect top trending news for a category"""
+    async def _analyze_trends(self, category: str, prompt: str) -> str:
+        """Run the trend analysis prompt, cached per category for ANALYSIS_CACHE_TTL"""
+        key = (category, hashlib.sha1(prompt.encode('utf-8')).hexdigest())
+        cached = self._analysis_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < ANALYSIS_CACHE_TTL:
+            return cached[1]
+        
+        try:
+            query_engine = await self._get_query_engine()
+            response = await query_engine.aquery(prompt)
+        except Exception as e:
+            logger.warning(f"Trend analysis failed for {category}: {e}")
+            return ""
+        
+        self._analysis_cache[key] = (time.monotonic(), response.response)
+        return response.response
+    
+    async def _fetch_news_by_category(self, categories: List[str]) -> Dict[str, List[Dict]]:
+        """Fetch every category's feeds in one flat concurrent batch, bucketed by category"""
+        source_categories: Dict[str, List[str]] = {}
+        for category in categories:
+            for source in self.news_sources.get(category, []):
+                source_categories.setdefault(source, []).append(category)
+        
+        news_by_category: Dict[str, List[Dict]] = {category: [] for category in categories}
+        for item in await self._fetch_rss_news(list(source_categories)):
+            for category in source_categories[item['source']]:
+                news_by_category[category].append(dict(item))
+        return news_by_category
+    
+    async def collect_trending_news(self, category: str, news_data: Optional[List[Dict]] = None) -> Dict:
+        """Collect top trending news for a category
+        
+        Pass already fetched news_data to skip fetching the category's feeds.
+        """
         try:
             # Get news sources for category
             sources = self.news_sources.get(category, [])
@@ -170,10 +412,11 @@ class NewsCollectionAgent:
             Ensure the selected news is recent (within last 24 hours) and has high engagement potential.
             """
             
-            response = await self.agent.achat(prompt)
+            analysis = await self._analyze_trends(category, prompt)
             
             # Extract the actual news data (this would need proper parsing in real implementation)
-            news_data = await self._fetch_rss_news(sources)
+            if news_data is None:
+                news_data = await self._fetch_rss_news(sources)
             analyzed_news = self._analyze_engagement(news_data)
             
             if analyzed_news:
@@ -185,7 +428,7 @@ class NewsCollectionAgent:
                     'url': top_news['link'],
                     'engagement_score': top_news['engagement_score'],
                     'source': top_news['source'],
-                    'analysis': response.response
+                    'analysis': analysis
                 }
             else:
                 logger.warning(f"No news found for category: {category}")
@@ -197,9 +440,14 @@ class NewsCollectionAgent:
     
     async def collect_all_categories(self) -> Dict[str, Dict]:
         """Collect trending news for all categories"""
-        categories = ["international", "national", "karnataka", "tamilnadu", "andhra", "kerala"]
+        categories = list(CATEGORIES)
+        
+        news_by_category = await self._fetch_news_by_category(categories)
         
-        tasks = [self.collect_trending_news(category) for category in categories]
+        tasks = [
+            self.collect_trending_news(category, news_by_category[category])
+            for category in categories
+        ]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         collected_news = {}
@@ -1,11 +1,273 @@
 from moviepy.editor import *
+from moviepy.audio.AudioClip import AudioArrayClip
+import asyncio
+import gc
+import hashlib
+import json
 import os
-from typing import Dict, List, Optional, Tuple
+import shutil
+import subprocess
+import tempfile
+import time
+from fractions import Fraction
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import logging
 from datetime import datetime
 
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
 logger = logging.getLogger(__name__)
 
+# Output encoding shared by every ffmpeg render
+# (stillimage tuning suits slideshow-style segments)
+FFMPEG_PRESET = "veryfast"
+FFMPEG_QUALITY_ARGS = ("-crf", "23", "-tune", "stillimage", "-pix_fmt", "yuv420p")
+FFMPEG_AUDIO_ARGS = ("-c:a", "aac", "-ar", "44100", "-ac", "2")
+
+# One-second closed GOPs so independently encoded segments join with stream copy
+FFMPEG_SEGMENT_ARGS = ("-g", "30", "-keyint_min", "30", "-sc_threshold", "0")
+
+class _Encoder(NamedTuple):
+    codec: str
+    options: Tuple[str, ...]
+    video_filter: Optional[str] = None  # Upload step for encoders that take GPU frames
+    device_args: Tuple[str, ...] = ()
+
+SOFTWARE_ENCODER = _Encoder("libx264", ("-preset", FFMPEG_PRESET, *FFMPEG_QUALITY_ARGS))
+
+# Hardware H.264 encoders in order of preference
+HARDWARE_ENCODERS = (
+    _Encoder("h264_nvenc", ("-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "6M", "-maxrate", "8M", "-pix_fmt", "yuv420p")),
+    _Encoder("h264_qsv", ("-global_quality", "23", "-look_ahead", "1", "-pix_fmt", "nv12")),
+    _Encoder("h264_vaapi", ("-qp", "23"), "format=nv12,hwupload", ("-vaapi_device", "/dev/dri/renderD128")),
+)
+
+@lru_cache(maxsize=1)
+def _select_encoder() -> _Encoder:
+    """Pick the first H.264 encoder that can encode here, or libx264
+
+    Set VIDEO_ENCODER to a codec name (e.g. libx264) to skip detection.
+    """
+    candidates = HARDWARE_ENCODERS
+    requested = os.getenv("VIDEO_ENCODER")
+    if requested:
+        if requested == SOFTWARE_ENCODER.codec:
+            return SOFTWARE_ENCODER
+        candidates = [encoder for encoder in HARDWARE_ENCODERS if encoder.codec == requested]
+    
+    if not shutil.which("ffmpeg"):
+        return SOFTWARE_ENCODER
+    
+    try:
+        listed = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"], capture_output=True, text=True, timeout=15
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return SOFTWARE_ENCODER
+    
+    for encoder in candidates:
+        if encoder.codec not in listed:
+            continue
+        # Listed encoders may still lack a device or driver, so try a tiny encode
+        try:
+            probe = subprocess.run(
+                [
+                    "ffmpeg", "-hide_banner", "-loglevel", "error", *encoder.device_args,
+                    "-f", "lavfi", "-i", "color=s=256x256:d=0.1",
+                    *(("-vf", encoder.video_filter) if encoder.video_filter else ()),
+                    "-c:v", encoder.codec, *encoder.options,
+                    "-f", "null", "-"
+                ],
+                capture_output=True,
+                timeout=15
+            )
+        except (OSError, subprocess.SubprocessError):
+            continue
+        if probe.returncode == 0:
+            logger.info(f"Using hardware video encoder {encoder.codec}")
+            return encoder
+    
+    return SOFTWARE_ENCODER
+
+# Encoded intro/outro segments, keyed on their content and encoding settings
+# (the intro changes daily with its date line)
+SEGMENT_CACHE_DIR = Path("./data/segment_cache")
+
+# Sample rate for generated and resampled segment audio
+AUDIO_FPS = 44100
+
+# Title fonts in order of preference; the intro/outro need Kannada glyphs.
+# Pillow shapes text through libraqm (HarfBuzz) when it is available.
+VIDEO_FONT_FILE = os.getenv("VIDEO_FONT_FILE")
+TITLE_FONT_FILES = tuple(
+    font_file for font_file in (VIDEO_FONT_FILE, "NotoSansKannada-Bold.ttf", "DejaVuSans-Bold.ttf")
+    if font_file
+)
+
+# Rasterized titles, so later runs skip font loading and shaping
+TEXT_CACHE_DIR = Path("./data/text_cache")
+
+# Segment and text cache files untouched for this long are deleted
+RENDER_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds
+
+def _prune_render_caches():
+    """Delete segment and text cache files older than RENDER_CACHE_MAX_AGE"""
+    cutoff = time.time() - RENDER_CACHE_MAX_AGE
+    for cache_dir in (SEGMENT_CACHE_DIR, TEXT_CACHE_DIR):
+        try:
+            cached = list(cache_dir.iterdir())
+        except OSError:
+            continue
+        for path in cached:
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                continue
+
+def _ffmpeg_color(rgb: Tuple[int, int, int]) -> str:
+    return "0x%02X%02X%02X" % rgb
+
+def _ffmpeg_quote(value: str) -> str:
+    """Quote a path for an ffmpeg concat list"""
+    return "'" + value.replace("'", "'\\''") + "'"
+
+@lru_cache(maxsize=1)
+def _title_font_file() -> str:
+    """First title font Pillow can load, or "" for its built-in font"""
+    for font_file in TITLE_FONT_FILES:
+        try:
+            ImageFont.truetype(font_file, 12)
+            return font_file
+        except OSError:
+            continue
+    logger.warning("No title font found; set VIDEO_FONT_FILE to a font with Kannada glyphs")
+    return ""
+
+@lru_cache(maxsize=64)
+def _render_text_rgba(text: str, fontsize: int, color: str, stroke_width: int = 2) -> np.ndarray:
+    """Rasterize stroked, centered text to a read-only RGBA array with Pillow
+
+    Cached in memory and under TEXT_CACHE_DIR, since the same titles
+    repeat across segments and runs.
+    """
+    font_file = _title_font_file()
+    key = "|".join((text, font_file, str(fontsize), color, str(stroke_width)))
+    cache_path = TEXT_CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.npy"
+    try:
+        cached = np.load(cache_path)
+        cached.flags.writeable = False
+        return cached
+    except (OSError, ValueError):
+        pass
+    
+    font = ImageFont.truetype(font_file, fontsize) if font_file else ImageFont.load_default()
+    measure = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+    left, top, right, bottom = measure.multiline_textbbox(
+        (0, 0), text, font=font, align="center", stroke_width=stroke_width
+    )
+    image = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+    ImageDraw.Draw(image).multiline_text(
+        (-left, -top), text, font=font, fill=color, align="center",
+        stroke_width=stroke_width, stroke_fill="black"
+    )
+    rendered = np.asarray(image)
+    
+    try:
+        TEXT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        np.save(cache_path, rendered)
+    except OSError as e:
+        logger.warning(f"Could not cache rendered text: {e}")
+    return rendered
+
+@lru_cache(maxsize=16)
+def _solid_frame(color: Tuple[int, int, int], size: Tuple[int, int]) -> np.ndarray:
+    """A read-only solid-color frame, allocated once per color and size"""
+    width, height = size
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[...] = color
+    frame.flags.writeable = False
+    return frame
+
+def _fit_frame(frame: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """Center-crop or pad a frame to exactly size (width, height)"""
+    width, height = size
+    frame_height, frame_width = frame.shape[:2]
+    if frame_height > height or frame_width > width:
+        y0 = max(0, (frame_height - height) // 2)
+        x0 = max(0, (frame_width - width) // 2)
+        frame = frame[y0:y0 + height, x0:x0 + width]
+        frame_height, frame_width = frame.shape[:2]
+    if frame_height < height or frame_width < width:
+        canvas = np.zeros((height, width, 3), dtype=np.uint8)
+        y0 = (height - frame_height) // 2
+        x0 = (width - frame_width) // 2
+        canvas[y0:y0 + frame_height, x0:x0 + frame_width] = frame[..., :3]
+        frame = canvas
+    return frame
+
+def _blend_overlay(frame: np.ndarray, overlay: np.ndarray, x: int, y: int) -> np.ndarray:
+    """Alpha-blend an RGBA overlay onto a copy of the frame"""
+    height = min(overlay.shape[0], frame.shape[0] - y)
+    width = min(overlay.shape[1], frame.shape[1] - x)
+    overlay = overlay[:height, :width]
+    alpha = overlay[..., 3:4].astype(np.float32) / 255.0
+    
+    frame = frame.copy()
+    region = frame[y:y + height, x:x + width]
+    region[...] = (overlay[..., :3] * alpha + region * (1.0 - alpha)).astype(np.uint8)
+    return frame
+
+# Background colors for categories without usable media
+CATEGORY_COLORS = MappingProxyType({
+    "international": (40, 60, 100),
+    "national": (100, 50, 40),
+    "karnataka": (80, 40, 100),
+    "tamilnadu": (40, 100, 60),
+    "andhra": (100, 80, 40),
+    "kerala": (60, 100, 40)
+})
+
+@lru_cache(maxsize=64)
+def _probe_video_info(video_path: str, mtime_ns: int, file_size: int) -> Dict:
+    """Read video metadata with one ffprobe call; cached per file version"""
+    result = subprocess.run(
+        [
+            "ffprobe", "-v", "error",
+            "-show_entries", "format=duration:stream=codec_type,width,height,avg_frame_rate,r_frame_rate",
+            "-print_format", "json",
+            video_path
+        ],
+        capture_output=True,
+        check=True,
+        text=True
+    )
+    probe = json.loads(result.stdout)
+    streams = probe.get("streams", [])
+    video = next((stream for stream in streams if stream.get("codec_type") == "video"), {})
+    frame_rate = next(
+        (rate for rate in (video.get("avg_frame_rate"), video.get("r_frame_rate")) if rate and rate != "0/0"),
+        None
+    )
+    
+    return {
+        "duration": float(probe.get("format", {}).get("duration", 0.0)),
+        "resolution": f"{video.get('width')}x{video.get('height')}",
+        "fps": float(Fraction(frame_rate)) if frame_rate else None,
+        "file_size": file_size,
+        "has_audio": any(stream.get("codec_type") == "audio" for stream in streams)
+    }
+
+def _remove_prerendered(task: asyncio.Task):
+    """Delete the temporary directory of a prerendered segment that went unused"""
+    if not task.cancelled() and task.exception() is None:
+        shutil.rmtree(os.path.dirname(task.result()), ignore_errors=True)
+
 class VideoAssemblyAgent:
     def __init__(self):
         """Initialize video assembly with precise timing controls"""
@@ -20,24 +282,38 @@ class VideoAssemblyAgent:
             "andhra": 8,
             "kerala": 8
         }
+        
+        # libx264 is CPU-bound, so run at most one encoder per core
+        self._encode_semaphore = asyncio.Semaphore(min(6, os.cpu_count() or 1))
+        
+        # News segments encoded ahead of assembly, by segment digest
+        self._prerendered: Dict[str, asyncio.Task] = {}
     
-    def _create_text_clip(
-        self, 
-        text: str, 
-        duration: float, 
-        position: str = "center",
-        fontsize: int = 50,
-        color: str = "white"
-    ) -> TextClip:
-        """Create styled text clip for titles and overlays"""
-        return TextClip(
-            text,
-            fontsize=fontsize,
-            color=color,
-            font="Arial-Bold",
-            stroke_color="black",
-            stroke_width=2
-        ).set_duration(duration).set_position(position)
+    def _silence(self, duration: float) -> AudioArrayClip:
+        """Silent stereo audio backed by a zero array rather than a per-sample callback"""
+        return AudioArrayClip(np.zeros((int(round(duration * AUDIO_FPS)), 2), dtype=np.float32), fps=AUDIO_FPS)
+    
+    def _color_clip(self, color: Tuple[int, int, int], duration: float) -> ImageClip:
+        """Solid background clip over a cached frame"""
+        return ImageClip(_solid_frame(color, self.output_resolution)).set_duration(duration)
+    
+    def _text_card(
+        self,
+        color: Tuple[int, int, int],
+        texts: List[Tuple[str, int, str, object]],
+        duration: float
+    ) -> ImageClip:
+        """Static clip with (text, fontsize, color, y) lines baked into one frame
+
+        y is "center", "bottom" or a pixel offset; text is centered horizontally.
+        """
+        width, height = self.output_resolution
+        frame = _solid_frame(color, self.output_resolution)
+        for text, fontsize, text_color, y in texts:
+            overlay = _render_text_rgba(text, fontsize, text_color)
+            top = {"center": (height - overlay.shape[0]) // 2, "bottom": height - overlay.shape[0]}.get(y, y)
+            frame = _blend_overlay(frame, overlay, max(0, (width - overlay.shape[1]) // 2), max(0, top))
+        return ImageClip(frame).set_duration(duration)
     
     def _prepare_image_clip(
         self, 
@@ -47,37 +323,48 @@ class VideoAssemblyAgent:
     ) -> VideoClip:
         """Prepare image clip with effects for video segment"""
         try:
-            # Load and resize image
-            clip = ImageClip(image_path).set_duration(duration)
+            width, height = self.output_resolution
             
-            # Resize to fit 9:16 aspect ratio
-            clip = clip.resize(height=self.output_resolution[1])
+            # Load and resize once with OpenCV, covering the 9:16 frame
+            image = cv2.imread(image_path, cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError("unreadable image")
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
             
-            # Center crop if needed
-            if clip.w > self.output_resolution[0]:
-                clip = clip.crop(
-                    x_center=clip.w/2,
-                    width=self.output_resolution[0]
-                )
+            scale = max(width / image.shape[1], height / image.shape[0])
+            resized = cv2.resize(
+                image,
+                (max(width, round(image.shape[1] * scale)), max(height, round(image.shape[0] * scale))),
+                interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+            )
+            
+            # Center crop as a numpy view
+            y0 = (resized.shape[0] - height) // 2
+            x0 = (resized.shape[1] - width) // 2
+            base = resized[y0:y0 + height, x0:x0 + width]
             
             # Apply effects
             if effect == "zoom":
-                # Subtle zoom effect
-                clip = clip.resize(lambda t: 1 + 0.02 * t)
-            elif effect == "pan":
-                # Subtle pan effect
-                clip = clip.set_position(lambda t: ('center', 'center'))
+                # Subtle zoom effect: crop the shrinking center window and scale it back up
+                def make_frame(t):
+                    zoom = 1 + 0.02 * t
+                    crop_w, crop_h = round(width / zoom), round(height / zoom)
+                    cx0, cy0 = (width - crop_w) // 2, (height - crop_h) // 2
+                    return cv2.resize(
+                        base[cy0:cy0 + crop_h, cx0:cx0 + crop_w],
+                        (width, height),
+                        interpolation=cv2.INTER_LINEAR
+                    )
+                
+                return VideoClip(make_frame, duration=duration)
             
-            return clip
+            # "pan" keeps the centered still frame
+            return ImageClip(base).set_duration(duration)
             
         except Exception as e:
             logger.error(f"Error preparing image clip {image_path}: {e}")
             # Return colored background as fallback
-            return ColorClip(
-                size=self.output_resolution,
-                color=(50, 50, 50),
-                duration=duration
-            )
+            return self._color_clip((50, 50, 50), duration)
     
     def _create_news_segment(
         self,
@@ -92,20 +379,20 @@ class VideoAssemblyAgent:
             
             # Load audio
             if audio_path and os.path.exists(audio_path):
-                audio_clip = AudioFileClip(audio_path)
+                source = AudioFileClip(audio_path)
+                samples = source.to_soundarray(fps=AUDIO_FPS).astype(np.float32)
+                source.close()
+                
                 # Trim or pad audio to match segment duration
-                if audio_clip.duration > segment_duration:
-                    audio_clip = audio_clip.subclip(0, segment_duration)
-                else:
-                    # Pad with silence if needed
-                    silence_duration = segment_duration - audio_clip.duration
-                    if silence_duration > 0:
-                        silence = AudioClip(lambda t: 0, duration=silence_duration)
-                        audio_clip = concatenate_audioclips([audio_clip, silence])
+                target_samples = int(round(segment_duration * AUDIO_FPS))
+                samples = samples[:target_samples]
+                if len(samples) < target_samples:
+                    samples = np.pad(samples, ((0, target_samples - len(samples)), (0, 0)))
+                audio_clip = AudioArrayClip(samples, fps=AUDIO_FPS)
             else:
                 # Create silent audio if no audio file
                 logger.warning(f"No audio file for {category}, creating silent segment")
-                audio_clip = AudioClip(lambda t: 0, duration=segment_duration)
+                audio_clip = self._silence(segment_duration)
             
             # Prepare visual clips
             visual_clips = []
@@ -126,27 +413,11 @@ class VideoAssemblyAgent:
                         visual_clips.append(image_clip)
                 else:
                     # Fallback to colored background
-                    visual_clips.append(ColorClip(
-                        size=self.output_resolution,
-                        color=(30, 50, 80),
-                        duration=segment_duration
-                    ))
+                    visual_clips.append(self._color_clip((30, 50, 80), segment_duration))
             else:
                 # Create category-themed background
-                category_colors = {
-                    "international": (40, 60, 100),
-                    "national": (100, 50, 40),
-                    "karnataka": (80, 40, 100),
-                    "tamilnadu": (40, 100, 60),
-                    "andhra": (100, 80, 40),
-                    "kerala": (60, 100, 40)
-                }
-                color = category_colors.get(category, (50, 50, 50))
-                visual_clips.append(ColorClip(
-                    size=self.output_resolution,
-                    color=color,
-                    duration=segment_duration
-                ))
+                color = CATEGORY_COLORS.get(category, (50, 50, 50))
+                visual_clips.append(self._color_clip(color, segment_duration))
             
             # Combine visual clips
             if len(visual_clips) > 1:
@@ -154,20 +425,18 @@ class VideoAssemblyAgent:
             else:
                 video_clip = visual_clips[0]
             
-            # Add category title
-            title_clip = self._create_text_clip(
-                category.upper(),
-                duration=2.0,
-                position=("center", 100),
-                fontsize=40,
-                color="white"
-            )
+            # Bake the category title into the first two seconds of frames,
+            # avoiding a per-frame CompositeVideoClip traversal
+            title = _render_text_rgba(category.upper(), fontsize=40, color="white")
+            title_x = max(0, (self.output_resolution[0] - title.shape[1]) // 2)
+            
+            def add_title(get_frame, t):
+                frame = _fit_frame(get_frame(t), self.output_resolution)
+                if t < 2.0:
+                    frame = _blend_overlay(frame, title, title_x, 100)
+                return frame
             
-            # Compose final segment
-            final_segment = CompositeVideoClip([
-                video_clip,
-                title_clip
-            ]).set_audio(audio_clip).set_duration(segment_duration)
+            final_segment = video_clip.fl(add_title).set_audio(audio_clip).set_duration(segment_duration)
             
             logger.info(f"Created segment for {category}: {segment_duration}s")
             return final_segment
@@ -175,112 +444,394 @@ class VideoAssemblyAgent:
         except Exception as e:
             logger.error(f"Error creating segment for {category}: {e}")
             # Return fallback segment
-            fallback_audio = AudioClip(lambda t: 0, duration=8)
-            fallback_video = ColorClip(
-                size=self.output_resolution,
-                color=(100, 100, 100),
+            fallback_audio = self._silence(8)
+            fallback_video = self._text_card(
+                (100, 100, 100),
+                [(f"{category.upper()}\nCONTENT ERROR", 36, "white", "center")],
                 duration=8
             )
-            error_text = self._create_text_clip(
-                f"{category.upper()}\nCONTENT ERROR",
-                duration=8,
-                fontsize=36
-            )
             
-            return CompositeVideoClip([
-                fallback_video,
-                error_text
-            ]).set_audio(fallback_audio)
+            return fallback_video.set_audio(fallback_audio)
     
     def _create_intro_segment(self) -> VideoClip:
         """Create intro segment for the video"""
         intro_duration = 3.0
         
-        # Create intro background
-        intro_bg = ColorClip(
-            size=self.output_resolution,
-            color=(20, 30, 50),
+        # Intro background with title and date baked into one frame
+        intro_card = self._text_card(
+            (20, 30, 50),
+            [
+                ("ಕನ್ನಡ ನ್ಯೂಸ್\nKANNADA NEWS", 60, "gold", "center"),
+                (datetime.now().strftime("%B %d, %Y"), 30, "white", "bottom")
+            ],
             duration=intro_duration
         )
         
-        # Create intro text
-        title_text = self._create_text_clip(
-            "ಕನ್ನಡ ನ್ಯೂಸ್\nKANNADA NEWS",
-            duration=intro_duration,
-            fontsize=60,
-            color="gold"
-        )
-        
-        subtitle_text = self._create_text_clip(
-            datetime.now().strftime("%B %d, %Y"),
-            duration=intro_duration,
-            position=("center", "bottom"),
-            fontsize=30,
-            color="white"
-        )
-        
         # Create silent audio
-        intro_audio = AudioClip(lambda t: 0, duration=intro_duration)
+        intro_audio = self._silence(intro_duration)
         
-        return CompositeVideoClip([
-            intro_bg,
-            title_text,
-            subtitle_text
-        ]).set_audio(intro_audio)
+        return intro_card.set_audio(intro_audio)
     
     def _create_outro_segment(self) -> VideoClip:
         """Create outro segment for the video"""
         outro_duration = 2.0
         
-        # Create outro background
-        outro_bg = ColorClip(
-            size=self.output_resolution,
-            color=(30, 20, 50),
+        # Outro background with thanks and subscribe line baked into one frame
+        outro_card = self._text_card(
+            (30, 20, 50),
+            [
+                ("ಧನ್ಯವಾದಗಳು\nTHANK YOU", 50, "gold", "center"),
+                ("SUBSCRIBE FOR MORE NEWS", 25, "white", "bottom")
+            ],
             duration=outro_duration
         )
         
-        # Create outro text
-        outro_text = self._create_text_clip(
-            "ಧನ್ಯವಾದಗಳು\nTHANK YOU",
-            duration=outro_duration,
-            fontsize=50,
-            color="gold"
-        )
+        # Create silent audio
+        outro_audio = self._silence(outro_duration)
         
-        subscribe_text = self._create_text_clip(
-            "SUBSCRIBE FOR MORE NEWS",
-            duration=outro_duration,
-            position=("center", "bottom"),
-            fontsize=25,
-            color="white"
-        )
+        return outro_card.set_audio(outro_audio)
+    
+    def _plan_segments(
+        self,
+        audio_files: Dict[str, str],
+        media_collections: Dict[str, List[Dict]]
+    ) -> List[Dict]:
+        """Describe the intro, news and outro segments for the ffmpeg renderer"""
+        segments = [{
+            "duration": 3.0,
+            "color": (20, 30, 50),
+            "images": [],
+            "audio": None,
+            "texts": [
+                {"text": "ಕನ್ನಡ ನ್ಯೂಸ್\nKANNADA NEWS", "fontsize": 60, "color": "gold", "y": "center"},
+                {"text": datetime.now().strftime("%B %d, %Y"), "fontsize": 30, "color": "white", "y": "bottom"}
+            ]
+        }]
         
-        # Create silent audio
-        outro_audio = AudioClip(lambda t: 0, duration=outro_duration)
+        total_content_duration = 0
+        for category, audio_path in audio_files.items():
+            if not audio_path:
+                continue
+            
+            segment = self._news_segment(category, audio_path, media_collections.get(category, []))
+            segments.append(segment)
+            total_content_duration += segment["duration"]
+        
+        # Add outro if there's time
+        if total_content_duration < 55:
+            segments.append({
+                "duration": 2.0,
+                "color": (30, 20, 50),
+                "images": [],
+                "audio": None,
+                "texts": [
+                    {"text": "ಧನ್ಯವಾದಗಳು\nTHANK YOU", "fontsize": 50, "color": "gold", "y": "center"},
+                    {"text": "SUBSCRIBE FOR MORE NEWS", "fontsize": 25, "color": "white", "y": "bottom"}
+                ]
+            })
+        
+        return segments
+    
+    def _news_segment(self, category: str, audio_path: str, media_items: List[Dict]) -> Dict:
+        """Describe one category's news segment for the ffmpeg renderer"""
+        if not os.path.exists(audio_path):
+            logger.warning(f"No audio file for {category}, creating silent segment")
+            audio_path = None
+        
+        images = [
+            item['local_path'] for item in media_items
+            if item.get('local_path') and os.path.exists(item['local_path'])
+        ]
+        has_media = any(item.get('local_path') for item in media_items)
+        
+        return {
+            "duration": self.segment_durations.get(category, 8),
+            "color": (30, 50, 80) if has_media else CATEGORY_COLORS.get(category, (50, 50, 50)),
+            "images": images,
+            "audio": audio_path,
+            "texts": [
+                {"text": category.upper(), "fontsize": 40, "color": "white", "y": 100, "duration": 2.0}
+            ]
+        }
+    
+    @staticmethod
+    def _segment_digest(segment: Dict) -> str:
+        """Identity of a planned segment, matching a prerender to its place in the video"""
+        return hashlib.blake2b(repr(segment).encode("utf-8"), digest_size=16).hexdigest()
+    
+    def prerender_segment(self, category: str, audio_path: str, media_items: List[Dict]):
+        """Start encoding a category's news segment as soon as its audio and media are ready
         
-        return CompositeVideoClip([
-            outro_bg,
-            outro_text,
-            subscribe_text
-        ]).set_audio(outro_audio)
+        Assembly then only waits for the slowest category's segment instead
+        of encoding every segment after the last TTS call finishes. Has no
+        effect without ffmpeg, where assembly goes through MoviePy.
+        """
+        if not shutil.which("ffmpeg"):
+            return
+        segment = self._news_segment(category, audio_path, media_items)
+        digest = self._segment_digest(segment)
+        if digest not in self._prerendered:
+            self._prerendered[digest] = asyncio.create_task(self._prerender(segment))
+    
+    async def _prerender(self, segment: Dict) -> str:
+        """Encode a segment into its own temporary directory, returning the MP4 path"""
+        encoder = await asyncio.to_thread(_select_encoder)
+        tmp_dir = tempfile.mkdtemp(prefix="segment_")
+        try:
+            segment_path = os.path.join(tmp_dir, "segment.mp4")
+            await self._encode_segment(segment, segment_path, tmp_dir, self._encode_semaphore, encoder)
+            return segment_path
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+    
+    async def _use_prerendered(
+        self,
+        task: asyncio.Task,
+        segment: Dict,
+        segment_path: str,
+        tmp_dir: str,
+        encoder: _Encoder
+    ):
+        """Move a prerendered segment into place, encoding it now if the prerender failed"""
+        try:
+            prerendered_path = await task
+        except Exception as e:
+            logger.warning(f"Segment prerender failed, encoding during assembly: {e}")
+            await self._encode_segment(segment, segment_path, tmp_dir, self._encode_semaphore, encoder)
+            return
+        shutil.move(prerendered_path, segment_path)
+        shutil.rmtree(os.path.dirname(prerendered_path), ignore_errors=True)
+    
+    def discard_prerendered(self):
+        """Drop prerendered segments the finished assembly did not use"""
+        for task in self._prerendered.values():
+            task.cancel()
+            task.add_done_callback(_remove_prerendered)
+        self._prerendered.clear()
+    
+    def _segment_graph(
+        self,
+        segment: Dict,
+        index: int,
+        first_input: int,
+        tmp_dir: str
+    ) -> Tuple[List[str], List[str]]:
+        """ffmpeg inputs and filter chains producing [v<index>] and [a<index>] for one segment"""
+        width, height = self.output_resolution
+        duration = segment["duration"]
+        inputs, filters = [], []
+        n = first_input
+        
+        # Visuals: images (alternating zoom, as in the MoviePy path) or a solid color
+        images = segment["images"]
+        if images:
+            per_image = duration / len(images)
+            for i, image_path in enumerate(images):
+                inputs += ["-loop", "1", "-framerate", str(self.fps), "-t", f"{per_image:.3f}", "-i", image_path]
+                chain = (
+                    f"[{n}:v]scale={width}:{height}:force_original_aspect_ratio=increase,"
+                    f"crop={width}:{height},setsar=1"
+                )
+                if i % 2 == 0:
+                    chain += (
+                        f",zoompan=z='1+0.02*in/{self.fps}':x='iw/2-iw/zoom/2':y='ih/2-ih/zoom/2'"
+                        f":d=1:s={width}x{height}:fps={self.fps}"
+                    )
+                filters.append(f"{chain}[s{index}_{i}]")
+                n += 1
+            labels = "".join(f"[s{index}_{i}]" for i in range(len(images)))
+            filters.append(f"{labels}concat=n={len(images)}:v=1:a=0[bg{index}]")
+            video = f"[bg{index}]"
+        else:
+            inputs += [
+                "-f", "lavfi",
+                "-i", f"color=c={_ffmpeg_color(segment['color'])}:s={width}x{height}:r={self.fps}:d={duration}"
+            ]
+            video = f"[{n}:v]"
+            n += 1
+        
+        # Titles are rasterized with Pillow, which shapes Kannada correctly,
+        # and overlaid as still images
+        for j, text in enumerate(segment["texts"]):
+            text_image = os.path.join(tmp_dir, f"text_{index}_{j}.png")
+            Image.fromarray(_render_text_rgba(text["text"], text["fontsize"], text["color"])).save(text_image)
+            inputs += ["-i", text_image]
+            
+            y = {"center": "(H-h)/2", "bottom": "H-h"}.get(text["y"], str(text["y"]))
+            enable = f":enable='lt(t,{text['duration']})'" if text.get("duration") else ""
+            filters.append(f"{video}[{n}:v]overlay=x=(W-w)/2:y={y}{enable}[t{index}_{j}]")
+            video = f"[t{index}_{j}]"
+            n += 1
+        filters.append(f"{video}format=yuv420p[v{index}]")
+        
+        # Audio trimmed or padded with silence to the segment duration
+        if segment["audio"]:
+            inputs += ["-i", segment["audio"]]
+            filters.append(
+                f"[{n}:a]aformat=sample_rates=44100:channel_layouts=stereo,"
+                f"apad,atrim=0:{duration},asetpts=N/SR/TB[a{index}]"
+            )
+        else:
+            inputs += ["-f", "lavfi", "-t", str(duration), "-i", "anullsrc=r=44100:cl=stereo"]
+            filters.append(f"[{n}:a]anull[a{index}]")
+        
+        return inputs, filters
+    
+    async def _run_ffmpeg(self, args: List[str]):
+        """Run ffmpeg, raising with its error output on failure"""
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-hide_banner", "-loglevel", "error", "-y", *args,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await proc.communicate()
+        except BaseException:
+            # Cancelled (e.g. a step timeout) or failed: don't leave ffmpeg running
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            raise
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()[-500:]}")
+    
+    async def _encode_segment(
+        self,
+        segment: Dict,
+        segment_path: str,
+        tmp_dir: str,
+        semaphore: asyncio.Semaphore,
+        encoder: _Encoder
+    ):
+        """Encode one segment to its own MP4 with keyframe-aligned GOPs"""
+        async with semaphore:
+            inputs, filters = self._segment_graph(segment, 0, 0, tmp_dir)
+            video = "[v0]"
+            if encoder.video_filter:
+                filters.append(f"[v0]{encoder.video_filter}[venc]")
+                video = "[venc]"
+            
+            await self._run_ffmpeg([
+                *encoder.device_args,
+                *inputs,
+                "-filter_complex", ";".join(filters),
+                "-map", video, "-map", "[a0]",
+                "-r", str(self.fps),
+                "-c:v", encoder.codec, *encoder.options,
+                *FFMPEG_AUDIO_ARGS,
+                *FFMPEG_SEGMENT_ARGS,
+                segment_path
+            ])
+    
+    def _segment_cache_path(self, segment: Dict, encoder: _Encoder) -> Optional[Path]:
+        """Cache path for segments made only of color, text and silence (intro/outro)"""
+        if segment["images"] or segment["audio"]:
+            return None
+        key = repr((
+            segment, encoder, FFMPEG_AUDIO_ARGS, FFMPEG_SEGMENT_ARGS,
+            self.fps, self.output_resolution, _title_font_file()
+        ))
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return SEGMENT_CACHE_DIR / f"{digest}.mp4"
+    
+    async def _encode_cached_segment(
+        self,
+        segment: Dict,
+        cache_path: Path,
+        tmp_dir: str,
+        semaphore: asyncio.Semaphore,
+        encoder: _Encoder
+    ):
+        """Encode a static segment into the cache, publishing it atomically"""
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = cache_path.with_suffix(".tmp.mp4")
+        await self._encode_segment(segment, str(partial_path), tmp_dir, semaphore, encoder)
+        os.replace(partial_path, cache_path)
+    
+    async def _render_with_ffmpeg(self, segments: List[Dict], output_path: str):
+        """Encode segments in parallel ffmpeg workers, then join them without re-encoding"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            encoder = await asyncio.to_thread(_select_encoder)
+            
+            semaphore = self._encode_semaphore
+            segment_paths, jobs = [], []
+            for index, segment in enumerate(segments):
+                # Each segment directory gets its own text files so workers don't collide
+                segment_dir = os.path.join(tmp_dir, f"seg_{index}")
+                os.makedirs(segment_dir)
+                
+                cache_path = self._segment_cache_path(segment, encoder)
+                if cache_path is None:
+                    segment_path = os.path.join(tmp_dir, f"seg_{index}.mp4")
+                    prerendered = self._prerendered.pop(self._segment_digest(segment), None)
+                    if prerendered is not None:
+                        jobs.append(self._use_prerendered(prerendered, segment, segment_path, segment_dir, encoder))
+                    else:
+                        jobs.append(self._encode_segment(segment, segment_path, segment_dir, semaphore, encoder))
+                else:
+                    segment_path = str(cache_path.resolve())
+                    if cache_path.exists():
+                        cache_path.touch()  # Marks it used, so pruning keeps it
+                    else:
+                        jobs.append(self._encode_cached_segment(segment, cache_path, segment_dir, semaphore, encoder))
+                segment_paths.append(segment_path)
+            
+            # On the first failure stop the other encodes before tmp_dir is removed
+            tasks = [asyncio.ensure_future(job) for job in jobs]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            
+            concat_list = os.path.join(tmp_dir, "concat.txt")
+            with open(concat_list, "w", encoding="utf-8") as f:
+                f.writelines(f"file {_ffmpeg_quote(path)}\n" for path in segment_paths)
+            
+            await self._run_ffmpeg([
+                "-f", "concat", "-safe", "0", "-i", concat_list,
+                "-t", str(self.target_duration),  # Ensure video doesn't exceed 60 seconds
+                "-c", "copy", "-movflags", "+faststart",
+                output_path
+            ])
     
     async def create_complete_video(
         self,
         audio_files: Dict[str, str],
         media_collections: Dict[str, List[Dict]],
         metadata: Dict
-    ) -> str:
-        """Assemble complete 60-second news video"""
+    ) -> Optional[str]:
+        """Assemble complete 60-second news video
+        
+        Returns the output path once the file is fully written, or None on failure.
+        """
         try:
             logger.info("Starting video assembly...")
             
             # Create output directory
             os.makedirs("./data/output_videos", exist_ok=True)
             
+            # Dated intros and news titles add new cache entries every day
+            await asyncio.to_thread(_prune_render_caches)
+            
             # Generate output filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = f"./data/output_videos/kannada_news_{timestamp}.mp4"
             
+            # Prefer a single native ffmpeg filter graph; MoviePy renders frame by frame in Python
+            if shutil.which("ffmpeg"):
+                try:
+                    segments = self._plan_segments(audio_files, media_collections)
+                    logger.info(f"Rendering video with ffmpeg to {output_path}...")
+                    await self._render_with_ffmpeg(segments, output_path)
+                    logger.info(f"Video assembled successfully: {output_path}")
+                    return output_path
+                except Exception as e:
+                    logger.warning(f"ffmpeg render failed, falling back to MoviePy: {e}")
+            
             # Create video segments
             segments = []
             
@@ -313,32 +864,48 @@ class VideoAssemblyAgent:
             
             # Concatenate all segments
             if segments:
-                final_video = concatenate_videoclips(segments, method="compose")
-                
-                # Ensure video doesn't exceed 60 seconds
-                if final_video.duration > 60:
-                    final_video = final_video.subclip(0, 60)
-                
-                # Export video
-                logger.info(f"Exporting video to {output_path}...")
-                final_video.write_videofile(
-                    output_path,
-                    fps=self.fps,
-                    codec='libx264',
-                    audio_codec='aac',
-                    temp_audiofile='temp-audio.m4a',
-                    remove_temp=True,
-                    verbose=False,
-                    logger=None  # Suppress MoviePy logging
-                )
-                
-                # Clean up
-                final_video.close()
-                for segment in segments:
-                    segment.close()
+                # Every segment is rendered at output_resolution, so chain without compositing
+                final_video = concatenate_videoclips(segments, method="chain")
+                try:
+                    # Ensure video doesn't exceed 60 seconds
+                    if final_video.duration > 60:
+                        final_video = final_video.subclip(0, 60)
+                    final_duration = final_video.duration
+                    
+                    # Export video
+                    logger.info(f"Exporting video to {output_path}...")
+                    encoder = _select_encoder()
+                    final_video.write_videofile(
+                        output_path,
+                        fps=self.fps,
+                        codec=encoder.codec,
+                        audio_codec='aac',
+                        preset=FFMPEG_PRESET,
+                        ffmpeg_params=[
+                            *encoder.device_args,
+                            *(("-vf", encoder.video_filter) if encoder.video_filter else ()),
+                            *encoder.options,
+                            *FFMPEG_SEGMENT_ARGS,
+                            "-movflags", "+faststart"
+                        ],
+                        threads=os.cpu_count(),
+                        temp_audiofile='temp-audio.m4a',
+                        remove_temp=True,
+                        verbose=False,
+                        logger=None  # Suppress MoviePy logging
+                    )
+                finally:
+                    # Clean up, even when the export fails, and release decoded
+                    # images and audio arrays before the next run
+                    final_video.close()
+                    for segment in segments:
+                        segment.close()
+                    segments.clear()
+                    del final_video
+                    gc.collect()
                 
                 logger.info(f"Video assembled successfully: {output_path}")
-                logger.info(f"Final duration: {final_video.duration:.2f} seconds")
+                logger.info(f"Final duration: {final_duration:.2f} seconds")
                 
                 return output_path
             else:
@@ -348,6 +915,9 @@ class VideoAssemblyAgent:
         except Exception as e:
             logger.error(f"Error assembling video: {e}")
             return None
+        
+        finally:
+            self.discard_prerendered()
     
     def get_video_info(self, video_path: str) -> Dict:
         """Get information about the assembled video"""
@@ -355,7 +925,13 @@ class VideoAssemblyAgent:
             if not os.path.exists(video_path):
                 return {"error": "Video file not found"}
             
-            clip = VideoFileClip(video_path)
+            # Metadata only, so probe the container instead of decoding frames;
+            # repeat calls for an unchanged file reuse the earlier probe
+            if shutil.which("ffprobe"):
+                stat = os.stat(video_path)
+                return dict(_probe_video_info(video_path, stat.st_mtime_ns, stat.st_size))
+            
+            clip = VideoFileClip(video_path, target_resolution=self.output_resolution[::-1])
             info = {
                 "duration": clip.duration,
                 "resolution": f"{clip.w}x{clip.h}",
@@ -369,4 +945,4 @@ class VideoAssemblyAgent:
             
         except Exception as e:
             logger.error(f"Error getting video info: {e}")
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
@@ -1,86 +1,164 @@
-from llama_index.core import VectorStoreIndex, Document
 from llama_index.llms.openai import OpenAI
 # from llama_index.core.agent import ReActAgent  # Disabled for compatibility
-from llama_index.core.tools import QueryEngineTool, ToolMetadata, FunctionTool
+from llama_index.core.tools import FunctionTool
+from ..knowledge_bases.store import search_knowledge_base
+from ..utils.http_session import release_stale_session
 import asyncio
+import aiofiles
 import aiohttp
+import hashlib
+import json
 import requests
 import os
+import re
+import time
+from urllib.parse import urlencode, urlsplit
+from functools import cached_property
+from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Download stream chunk size
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Long edge of the 1080x1920 output frame; downloaded renditions are at
+# least this tall so cover-fitting them never upscales
+MEDIA_LONG_EDGE = 1920
+
+# Base search terms by category
+CATEGORY_SEARCH_TERMS = MappingProxyType({
+    "international": ("world news", "global", "international", "diplomacy"),
+    "national": ("india", "government", "parliament", "delhi"),
+    "karnataka": ("bangalore", "karnataka", "india tech", "silicon valley india"),
+    "tamilnadu": ("chennai", "tamil nadu", "south india"),
+    "andhra": ("hyderabad", "andhra pradesh", "telangana"),
+    "kerala": ("kerala", "cochin", "backwaters")
+})
+
+# Key nouns and topics, matched anywhere inside words in one regex scan
+KEY_PATTERNS = (
+    "government", "minister", "election", "policy", "economy",
+    "technology", "business", "education", "health", "sports"
+)
+_KEY_PATTERN_RE = re.compile("|".join(map(re.escape, KEY_PATTERNS)))
+
+# Media files are stored by URL hash and listed in a manifest with their
+# validators; entries older than this are revalidated with a conditional GET
+MEDIA_CACHE_DIR = Path("./data/media_cache")
+MEDIA_MANIFEST_FILE = MEDIA_CACHE_DIR / "manifest.json"
+MEDIA_REVALIDATE_SECONDS = 7 * 24 * 3600
+
+# Knowledge base documents: visual concept mapping
+VISUAL_DOCUMENTS = (
+    "Political news visuals should include government buildings, official meetings, or symbolic imagery like flags.",
+    "Economic news works well with business district shots, market imagery, currency symbols, or charts/graphs.",
+    "Technology news should feature modern cityscapes, office buildings, computer/mobile device imagery.",
+    "International news can use world maps, airplane imagery, or landmark buildings from relevant countries.",
+    "Regional Karnataka news benefits from Bangalore skyline, tech parks, or cultural landmarks.",
+    "Sports news should show stadiums, sports equipment, or celebration imagery.",
+    "Weather/disaster news requires relevant environmental imagery - rain, storms, clear skies.",
+    "Cultural news works with festivals, traditional imagery, or community gatherings.",
+    "Healthcare news should feature hospitals, medical equipment, or health-related imagery.",
+    "Education news benefits from school/university buildings, students, or academic settings."
+)
+
+# Knowledge base documents: media selection
+MEDIA_DOCUMENTS = (
+    "YouTube Shorts require vertical 9:16 aspect ratio images that work well on mobile devices.",
+    "News videos need professional, high-quality imagery that conveys credibility and authority.",
+    "Each 8-10 second news segment should have 2-3 complementary images to maintain visual interest.",
+    "Images should be copyright-free and safe for commercial use to avoid legal issues.",
+    "Color schemes should be neutral and professional, avoiding overly bright or distracting colors.",
+    "Text overlays require images with clear spaces for readable typography.",
+    "Regional news benefits from location-specific imagery when available.",
+    "Stock photography should look natural and not overly staged for news credibility.",
+    "Image resolution should be minimum 1080x1920 for crisp video quality.",
+    "Sequential images should have visual coherence and smooth transitions."
+)
+
 class VisualContentAgent:
     def __init__(self):
         """Initialize visual content collection with copyright-free sources"""
         self.llm = OpenAI(model="gpt-4")
-        self.visual_kb = self._build_visual_knowledge_base()
-        self.media_kb = self._build_media_knowledge_base()
         
         # API keys
         self.unsplash_key = os.getenv("UNSPLASH_API_KEY")
         self.pexels_key = os.getenv("PEXELS_API_KEY")
         
-        # Create query engines
-        self.visual_engine = self.visual_kb.as_query_engine()
-        self.media_engine = self.media_kb.as_query_engine()
+        # Shared HTTP session, created on first use
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
+        
+        # Cap concurrent searches per provider; all categories search at once
+        search_concurrency = int(os.getenv("MEDIA_SEARCH_MAX_CONCURRENCY", "4"))
+        self._unsplash_semaphore = asyncio.Semaphore(search_concurrency)
+        self._pexels_semaphore = asyncio.Semaphore(search_concurrency)
+        
+        # Media cache manifest and in-flight downloads by URL hash
+        self._media_manifest: Dict[str, Dict] = self._load_media_manifest()
+        self._media_manifest_lock = asyncio.Lock()
+        self._media_downloads: Dict[str, asyncio.Future] = {}
         
-        # Create tools
-        self.tools = [
-            QueryEngineTool(
-                query_engine=self.visual_engine,
-                metadata=ToolMetadata(
-                    name="visual_concept_mapper",
-                    description="Maps news content to relevant visual concepts"
-                )
+        # Simplified without agent for compatibility
+        # self.agent = ReActAgent.from_tools(self.tools, llm=self.llm, verbose=True)
+    
+    async def map_visual_concepts(self, content: str) -> List[str]:
+        """Maps news content to relevant visual concepts"""
+        return await search_knowledge_base("visual", VISUAL_DOCUMENTS, content, top_k=2)
+    
+    async def select_media_guidelines(self, content: str) -> List[str]:
+        """Selects appropriate media types for news categories"""
+        return await search_knowledge_base("media", MEDIA_DOCUMENTS, content, top_k=2)
+    
+    # Tools are built on first use; the knowledge bases behind them are
+    # searched as cached embedding matrices rather than LLM query engines
+    @cached_property
+    def tools(self) -> List:
+        """Tools for the agent"""
+        return [
+            FunctionTool.from_defaults(
+                fn=self.map_visual_concepts,
+                name="visual_concept_mapper",
+                description="Maps news content to relevant visual concepts"
             ),
-            QueryEngineTool(
-                query_engine=self.media_engine,
-                metadata=ToolMetadata(
-                    name="media_selector",
-                    description="Selects appropriate media types for news categories"
-                )
+            FunctionTool.from_defaults(
+                fn=self.select_media_guidelines,
+                name="media_selector",
+                description="Selects appropriate media types for news categories"
             ),
             FunctionTool.from_defaults(fn=self._search_unsplash),
             FunctionTool.from_defaults(fn=self._search_pexels),
             FunctionTool.from_defaults(fn=self._download_media)
         ]
-        
-        # Simplified without agent for compatibility
-        # self.agent = ReActAgent.from_tools(self.tools, llm=self.llm, verbose=True)
     
-    def _build_visual_knowledge_base(self) -> VectorStoreIndex:
-        """Build knowledge base for visual concept mapping"""
-        documents = [
-            Document(text="Political news visuals should include government buildings, official meetings, or symbolic imagery like flags."),
-            Document(text="Economic news works well with business district shots, market imagery, currency symbols, or charts/graphs."),
-            Document(text="Technology news should feature modern cityscapes, office buildings, computer/mobile device imagery."),
-            Document(text="International news can use world maps, airplane imagery, or landmark buildings from relevant countries."),
-            Document(text="Regional Karnataka news benefits from Bangalore skyline, tech parks, or cultural landmarks."),
-            Document(text="Sports news should show stadiums, sports equipment, or celebration imagery."),
-            Document(text="Weather/disaster news requires relevant environmental imagery - rain, storms, clear skies."),
-            Document(text="Cultural news works with festivals, traditional imagery, or community gatherings."),
-            Document(text="Healthcare news should feature hospitals, medical equipment, or health-related imagery."),
-            Document(text="Education news benefits from school/university buildings, students, or academic settings.")
-        ]
-        return VectorStoreIndex.from_documents(documents)
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, reusing its connection pool and DNS cache"""
+        loop = asyncio.get_running_loop()
+        # Sessions can't cross event loops (e.g. separate asyncio.run calls in scripts)
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            release_stale_session(self._session, self._session_loop)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+            self._session_loop = loop
+        return self._session
     
-    def _build_media_knowledge_base(self) -> VectorStoreIndex:
-        """Build knowledge base for media selection"""
-        documents = [
-            Document(text="YouTube Shorts require vertical 9:16 aspect ratio images that work well on mobile devices."),
-            Document(text="News videos need professional, high-quality imagery that conveys credibility and authority."),
-            Document(text="Each 8-10 second news segment should have 2-3 complementary images to maintain visual interest."),
-            Document(text="Images should be copyright-free and safe for commercial use to avoid legal issues."),
-            Document(text="Color schemes should be neutral and professional, avoiding overly bright or distracting colors."),
-            Document(text="Text overlays require images with clear spaces for readable typography."),
-            Document(text="Regional news benefits from location-specific imagery when available."),
-            Document(text="Stock photography should look natural and not overly staged for news credibility."),
-            Document(text="Image resolution should be minimum 1080x1920 for crisp video quality."),
-            Document(text="Sequential images should have visual coherence and smooth transitions.")
-        ]
-        return VectorStoreIndex.from_documents(documents)
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+    
+    @staticmethod
+    def _resized_url(url: str, **params) -> str:
+        """Append image CDN resize parameters to a rendition URL"""
+        separator = '&' if urlsplit(url).query else '?'
+        return f"{url}{separator}{urlencode(params)}"
     
     async def _search_unsplash(self, query: str, count: int = 5) -> List[Dict]:
         """Search Unsplash for copyright-free images"""
@@ -98,26 +176,29 @@ class VisualContentAgent:
                 "order_by": "relevant"
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        results = []
-                        
-                        for photo in data.get("results", []):
-                            results.append({
-                                "id": photo["id"],
-                                "url": photo["urls"]["regular"],
-                                "download_url": photo["urls"]["full"],
-                                "description": photo.get("alt_description", ""),
-                                "source": "unsplash",
-                                "attribution": f"Photo by {photo['user']['name']} on Unsplash"
-                            })
-                        
-                        return results
-                    else:
-                        logger.error(f"Unsplash API error: {response.status}")
-                        return []
+            session = await self._get_session()
+            async with self._unsplash_semaphore, session.get(url, headers=headers, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    results = []
+                    
+                    for photo in data.get("results", []):
+                        results.append({
+                            "id": photo["id"],
+                            # "regular" is only 1080px wide; have imgix size the original instead
+                            "url": self._resized_url(
+                                photo["urls"]["raw"], fm="jpg", q=80, fit="max", h=MEDIA_LONG_EDGE
+                            ),
+                            "download_url": photo["urls"]["full"],
+                            "description": photo.get("alt_description", ""),
+                            "source": "unsplash",
+                            "attribution": f"Photo by {photo['user']['name']} on Unsplash"
+                        })
+                    
+                    return results
+                else:
+                    logger.error(f"Unsplash API error: {response.status}")
+                    return []
         
         except Exception as e:
             logger.error(f"Error searching Unsplash: {e}")
@@ -139,87 +220,144 @@ class VisualContentAgent:
                 "size": "large"
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        results = []
-                        
-                        for photo in data.get("photos", []):
-                            results.append({
-                                "id": photo["id"],
-                                "url": photo["src"]["large"],
-                                "download_url": photo["src"]["original"],
-                                "description": photo.get("alt", ""),
-                                "source": "pexels",
-                                "attribution": f"Photo by {photo['photographer']} on Pexels"
-                            })
-                        
-                        return results
-                    else:
-                        logger.error(f"Pexels API error: {response.status}")
-                        return []
+            session = await self._get_session()
+            async with self._pexels_semaphore, session.get(url, headers=headers, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    results = []
+                    
+                    for photo in data.get("photos", []):
+                        results.append({
+                            "id": photo["id"],
+                            # "large2x" tops out at 1300px tall
+                            "url": self._resized_url(
+                                photo["src"]["original"], auto="compress", cs="tinysrgb", h=MEDIA_LONG_EDGE
+                            ),
+                            "download_url": photo["src"]["original"],
+                            "description": photo.get("alt", ""),
+                            "source": "pexels",
+                            "attribution": f"Photo by {photo['photographer']} on Pexels"
+                        })
+                    
+                    return results
+                else:
+                    logger.error(f"Pexels API error: {response.status}")
+                    return []
         
         except Exception as e:
             logger.error(f"Error searching Pexels: {e}")
             return []
     
+    def _load_media_manifest(self) -> Dict[str, Dict]:
+        """Load the media cache manifest, starting empty if unreadable"""
+        try:
+            return json.loads(MEDIA_MANIFEST_FILE.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def _write_media_manifest(data: str):
+        """Replace the media manifest file atomically"""
+        MEDIA_MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = MEDIA_MANIFEST_FILE.with_suffix('.json.tmp')
+        tmp_file.write_text(data, encoding='utf-8')
+        os.replace(tmp_file, MEDIA_MANIFEST_FILE)
+    
+    async def _save_media_manifest(self):
+        """Persist the media cache manifest without blocking the event loop"""
+        # Concurrent downloads save one at a time so the shared temp file is never written twice at once
+        async with self._media_manifest_lock:
+            try:
+                await asyncio.to_thread(self._write_media_manifest, json.dumps(self._media_manifest))
+            except OSError as e:
+                logger.warning(f"Could not save media manifest: {e}")
+    
     async def _download_media(self, media_item: Dict, category: str) -> Optional[str]:
         """Download media file to local cache"""
         try:
-            os.makedirs("./data/media_cache", exist_ok=True)
-            
-            file_extension = ".jpg"  # Default to jpg
-            filename = f"{category}_{media_item['id']}{file_extension}"
-            filepath = f"./data/media_cache/{filename}"
+            # The MEDIA_LONG_EDGE rendition covers the output frame and is far
+            # smaller than the full-size original
+            url = media_item.get('url') or media_item['download_url']
+            key = hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()
             
-            # Check if already cached
-            if os.path.exists(filepath):
-                return filepath
+            # The same photo found for several categories downloads once
+            task = self._media_downloads.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._fetch_media(url, key))
+                self._media_downloads[key] = task
+                task.add_done_callback(lambda _: self._media_downloads.pop(key, None))
+            filepath = await asyncio.shield(task)
             
-            # Download the image
-            async with aiohttp.ClientSession() as session:
-                async with session.get(media_item['download_url']) as response:
-                    if response.status == 200:
-                        with open(filepath, 'wb') as f:
-                            f.write(await response.read())
-                        
-                        logger.info(f"Downloaded media: {filepath}")
-                        return filepath
-                    else:
-                        logger.error(f"Failed to download media: {response.status}")
-                        return None
+            if filepath:
+                self._link_by_category(filepath, category, str(media_item['id']))
+            return filepath
         
         except Exception as e:
             logger.error(f"Error downloading media: {e}")
             return None
     
-    def _generate_search_terms(self, content: str, category: str) -> List[str]:
-        """Generate relevant search terms from content and category"""
-        # Base terms by category
-        category_terms = {
-            "international": ["world news", "global", "international", "diplomacy"],
-            "national": ["india", "government", "parliament", "delhi"],
-            "karnataka": ["bangalore", "karnataka", "india tech", "silicon valley india"],
-            "tamilnadu": ["chennai", "tamil nadu", "south india"],
-            "andhra": ["hyderabad", "andhra pradesh", "telangana"],
-            "kerala": ["kerala", "cochin", "backwaters"]
-        }
+    async def _fetch_media(self, url: str, key: str) -> Optional[str]:
+        """Fetch a URL into the content-addressed cache, revalidating stale entries"""
+        filepath = MEDIA_CACHE_DIR / "by_hash" / f"{key}.jpg"
+        entry = self._media_manifest.get(key)
         
-        base_terms = category_terms.get(category, ["news", "india"])
+        # Check if already cached
+        headers = {}
+        if filepath.exists():
+            if entry is None or time.time() - entry.get('checked', 0) < MEDIA_REVALIDATE_SECONDS:
+                return str(filepath)
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
         
-        # Extract keywords from content
-        content_words = content.lower().split()
-        important_words = []
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = filepath.with_suffix('.part')
+        session = await self._get_session()
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304 and headers:
+                entry['checked'] = time.time()
+                await self._save_media_manifest()
+                return str(filepath)
+            if response.status != 200:
+                logger.error(f"Failed to download media: {response.status}")
+                return None
+            
+            # Stream to disk so memory stays constant and the loop isn't blocked
+            async with aiofiles.open(partial_path, 'wb') as f:
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    await f.write(chunk)
+            os.replace(partial_path, filepath)
+            
+            self._media_manifest[key] = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'checked': time.time()
+            }
         
-        # Look for key nouns and topics
-        key_patterns = ["government", "minister", "election", "policy", "economy", 
-                       "technology", "business", "education", "health", "sports"]
+        await self._save_media_manifest()
+        logger.info(f"Downloaded media: {filepath}")
+        return str(filepath)
+    
+    def _link_by_category(self, filepath: str, category: str, media_id: str):
+        """Symlink a cached file under by_cat/<category>/ for browsing the cache"""
+        link = MEDIA_CACHE_DIR / "by_cat" / category / f"{media_id}.jpg"
+        try:
+            link.parent.mkdir(parents=True, exist_ok=True)
+            if not link.is_symlink():
+                link.symlink_to(os.path.relpath(filepath, link.parent))
+        except OSError:
+            pass  # Symlinks are only a convenience, e.g. unsupported on some Windows setups
+    
+    def _generate_search_terms(self, content: str, category: str) -> List[str]:
+        """Generate relevant search terms from content and category"""
+        base_terms = list(CATEGORY_SEARCH_TERMS.get(category, ("news", "india")))
         
-        for word in content_words:
-            for pattern in key_patterns:
-                if pattern in word:
-                    important_words.append(pattern)
+        # Key topics mentioned anywhere in the content, once each in order of appearance
+        important_words = list(dict.fromkeys(
+            match.group(0) for match in _KEY_PATTERN_RE.finditer(content.lower())
+        ))
         
         # Combine base terms with content-derived terms
         search_terms = base_terms + important_words[:3]  # Limit to avoid too many terms
@@ -229,44 +367,30 @@ class VisualContentAgent:
     async def find_relevant_media(self, content: str, category: str) -> List[Dict]:
         """Find relevant media for news content"""
         try:
-            # Use agent to analyze and find media
-            prompt = f"""
-            Find relevant visual media for {category} news content:
-            
-            Content: {content}
-            Category: {category}
-            
-            Steps:
-            1. Use visual_concept_mapper to identify key visual concepts
-            2. Use media_selector to determine appropriate media types
-            3. Generate search terms for stock photo APIs
-            4. Search both Unsplash and Pexels for relevant images
-            5. Select best 3-4 images for 8-10 second segment
-            
-            Focus on professional, copyright-free imagery suitable for news video.
-            """
-            
-            response = await self.agent.achat(prompt)
-            
             # Generate search terms
             search_terms = self._generate_search_terms(content, category)
             
-            # Search multiple sources
-            all_media = []
+            # Search Unsplash and Pexels for the top 2 terms concurrently
+            searches = []
+            for term in search_terms[:2]:
+                searches.append(self._search_unsplash(term, 3))
+                searches.append(self._search_pexels(term, 3))
             
-            for term in search_terms[:2]:  # Use top 2 search terms
-                # Search Unsplash
-                unsplash_results = await self._search_unsplash(term, 3)
-                all_media.extend(unsplash_results)
-                
-                # Search Pexels
-                pexels_results = await self._search_pexels(term, 3)
-                all_media.extend(pexels_results)
+            all_media = []
+            for results in await asyncio.gather(*searches, return_exceptions=True):
+                if isinstance(results, Exception):
+                    logger.error(f"Media search failed for {category}: {results}")
+                else:
+                    all_media.extend(results)
             
             # Download and cache selected media
+            candidates = all_media[:4]  # Select top 4 images
+            local_paths = await asyncio.gather(
+                *(self._download_media(media_item, category) for media_item in candidates)
+            )
+            
             selected_media = []
-            for media_item in all_media[:4]:  # Select top 4 images
-                local_path = await self._download_media(media_item, category)
+            for media_item, local_path in zip(candidates, local_paths):
                 if local_path:
                     media_item['local_path'] = local_path
                     selected_media.append(media_item)
@@ -288,20 +412,22 @@ class VisualContentAgent:
         """Collect media for multiple news items"""
         media_collections = {}
         
-        # Create tasks for concurrent execution
-        tasks = []
-        for category, content in content_dict.items():
-            if content and content.strip():
-                task = self.find_relevant_media(content, category)
-                tasks.append((category, task))
+        categories = [
+            category for category, content in content_dict.items()
+            if content and content.strip()
+        ]
         
         # Execute all tasks concurrently
-        for category, task in tasks:
-            try:
-                media_items = await task
-                media_collections[category] = media_items
-            except Exception as e:
-                logger.error(f"Failed to collect media for {category}: {e}")
+        results = await asyncio.gather(
+            *(self.find_relevant_media(content_dict[category], category) for category in categories),
+            return_exceptions=True
+        )
+        
+        for category, result in zip(categories, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to collect media for {category}: {result}")
                 media_collections[category] = []
+            else:
+                media_collections[category] = result
         
         return media_collections
\ No newline at end of file
@@ -1,17 +1,215 @@
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, MediaUpload
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+import aiohttp
+import asyncio
+import httplib2
 import os
 import json
-from typing import Dict, Optional, List
+import mmap
+import threading
+import time
+from bisect import bisect_right
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import accumulate, chain
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Optional, List, Union
 import logging
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from ..utils.http_session import release_stale_session
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process token lock
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+# Uploads below this size go in a single request; larger ones are resumable
+SINGLE_REQUEST_UPLOAD_LIMIT = 64 * 1024 * 1024
+RESUMABLE_CHUNK_SIZE = 100 * 1024 * 1024
+RETRYABLE_STATUS_CODES = (500, 502, 503, 504)
+MAX_UPLOAD_RETRIES = 3
+
+# Multipart endpoint for single-request uploads made over aiohttp
+YOUTUBE_UPLOAD_URL = "https://www.googleapis.com/upload/youtube/v3/videos"
+
+# videos.list accepts up to 50 comma-separated ids per request
+MAX_IDS_PER_LIST_REQUEST = 50
+
+# Resource parts sent on upload (the keys of _video_body) and fetched for analytics
+UPLOAD_PARTS = "snippet,status"
+VIDEO_LIST_PARTS = "statistics,snippet,contentDetails"
+
+# SEO metadata
+CATEGORY_NAMES = MappingProxyType({
+    'international': 'International News',
+    'national': 'National News',
+    'karnataka': 'Karnataka News',
+    'tamilnadu': 'Tamil Nadu News',
+    'andhra': 'Andhra Pradesh News',
+    'kerala': 'Kerala News'
+})
+
+BASE_TAGS = (
+    "Kannada news", "Karnataka news", "Bangalore news", "South India news",
+    "India news", "Kannada updates", "news in Kannada", "today's news",
+    "breaking news", "latest news", "current affairs", "news update"
+)
+
+CATEGORY_TAGS = MappingProxyType({
+    'international': ("international news", "world news", "global news"),
+    'national': ("national news", "India news", "central government"),
+    'karnataka': ("Karnataka", "Bangalore", "Bengaluru", "Karnataka government"),
+    'tamilnadu': ("Tamil Nadu", "Chennai", "TN news"),
+    'andhra': ("Andhra Pradesh", "Hyderabad", "AP news", "Telangana"),
+    'kerala': ("Kerala", "Kochi", "Kerala news")
+})
+
+MAX_TAGS_LENGTH = 500
+
+DESCRIPTION_TEMPLATE = """🎥 Today's top news stories in Kannada - {timestamp}
+
+📰 In this video:
+{category_lines}
+🔔 Subscribe for daily Kannada news updates!
+👍 Like if you found this helpful
+💬 Comment your thoughts below
+
+🏷️ Tags:
+#KannadaNews #Karnataka #BangaloreNews #SouthIndiaNews #IndiaNews
+#KannadaUpdates #NewsInKannada #TodaysNews #BreakingNews
+
+📱 Follow us for more updates!
+
+🎬 Generated with AI technology on {timestamp}
+🤖 Automated news compilation with ElevenLabs TTS"""
+
+# Refresh the access token this long before it expires (tokens last about an hour)
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+def _advise_sequential(video_file):
+    """Hint a sequential whole-file read so disk reads overlap the network send"""
+    if hasattr(os, 'posix_fadvise'):
+        fd = video_file.fileno()
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+
+
+class MmapMediaUpload(MediaUpload):
+    """Resumable upload body served straight from a read-only memory map
+    
+    Each chunk is a memoryview into the page cache, rather than a copy read
+    through a buffered file object as MediaFileUpload does.
+    """
+    
+    def __init__(self, filename: str, mimetype: str, chunksize: int = RESUMABLE_CHUNK_SIZE):
+        self._filename = filename
+        self._mimetype = mimetype
+        self._chunksize = chunksize
+        with open(filename, 'rb') as fd:
+            self._mm = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        self._size = len(self._mm)
+        if hasattr(self._mm, 'madvise'):
+            # Let the kernel read ahead while earlier chunks are on the wire
+            self._mm.madvise(mmap.MADV_SEQUENTIAL)
+    
+    def chunksize(self):
+        return self._chunksize
+    
+    def mimetype(self):
+        return self._mimetype
+    
+    def size(self):
+        return self._size
+    
+    def resumable(self):
+        return True
+    
+    def getbytes(self, begin, length):
+        return memoryview(self._mm)[begin:begin + length]
+    
+    def has_stream(self):
+        return False
+    
+    def close(self):
+        """Unmap the file, leaving it to garbage collection while a chunk is still referenced"""
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+    
+    def __del__(self):
+        self.close()
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive advisory lock shared by every worker process using the token file"""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _expiring(credentials: Credentials) -> bool:
+    """Whether the access token is within TOKEN_REFRESH_MARGIN of expiring"""
+    # google-auth keeps expiry as naive UTC
+    return credentials.expiry - datetime.utcnow() < TOKEN_REFRESH_MARGIN
+
+
+@lru_cache(maxsize=1)
+def _date_label(day_ordinal: int) -> str:
+    """Title/description date, formatted once per day (keyed on date.toordinal())"""
+    return date.fromordinal(day_ordinal).strftime("%B %d, %Y")
+
+
+@lru_cache(maxsize=64)
+def _tags_for(categories: tuple) -> tuple:
+    """Relevant tags for a category combination, de-duplicated and truncated once"""
+    tags = tuple(dict.fromkeys(chain(
+        BASE_TAGS,
+        *(CATEGORY_TAGS.get(category, ()) for category in categories)
+    )))
+    
+    # Limit to 500 characters (YouTube limit), counting ", " between tags; measured
+    # in UTF-8 bytes so Kannada tags (3 bytes per character) stay within budget
+    tag_lengths = list(accumulate(len(tag.encode('utf-8')) + 2 for tag in tags))
+    return tags[:bisect_right(tag_lengths, MAX_TAGS_LENGTH)]
+
+
+@lru_cache(maxsize=None)
+def _discovery_document(service_name: str, version: str) -> Optional[Dict]:
+    """Parsed discovery document packaged with google-api-python-client
+    
+    Parsed once per process, so every agent built in it reuses the document
+    instead of re-reading (or fetching) the 200+ KB JSON.
+    """
+    document = get_static_doc(service_name, version)
+    return json.loads(document) if document else None
+
+
+def _build_service(service_name: str, version: str, credentials: Credentials):
+    """Build an API client from the packaged discovery document, without network discovery"""
+    document = _discovery_document(service_name, version)
+    if document is None:
+        return build(service_name, version, credentials=credentials, cache_discovery=False)
+    return build_from_document(document, credentials=credentials)
+
+
 class YouTubeUploadAgent:
     def __init__(self):
         """Initialize YouTube upload with OAuth2 authentication"""
@@ -20,49 +218,103 @@ class YouTubeUploadAgent:
         self.scopes = ["https://www.googleapis.com/auth/youtube.upload"]
         self.client_secrets_file = os.getenv("YOUTUBE_CLIENT_SECRET_FILE", "./config/youtube_client_secret.json")
         self.credentials_file = "./config/youtube_credentials.json"
+        self.credentials_lock_file = f"{self.credentials_file}.lock"
+        self.daily_playlist_id = os.getenv("YOUTUBE_DAILY_PLAYLIST_ID")
         
         self.youtube = None
+        self._credentials: Optional[Credentials] = None
+        self._refresh_lock = threading.Lock()  # Calls may run in worker threads
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
         self._authenticate()
     
     def _authenticate(self):
         """Authenticate with YouTube API using OAuth2"""
         try:
-            credentials = None
-            
-            # Check if we have saved credentials
-            if os.path.exists(self.credentials_file):
-                credentials = Credentials.from_authorized_user_file(self.credentials_file, self.scopes)
-            
-            # If credentials are invalid or don't exist, go through OAuth flow
-            if not credentials or not credentials.valid:
-                if credentials and credentials.expired and credentials.refresh_token:
-                    credentials.refresh(Request())
-                else:
-                    if not os.path.exists(self.client_secrets_file):
-                        logger.error(f"YouTube client secrets file not found: {self.client_secrets_file}")
-                        return
-                    
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        self.client_secrets_file, self.scopes
-                    )
-                    credentials = flow.run_local_server(port=0)
+            # Workers starting together wait here for whichever one refreshes
+            # (or runs the OAuth flow), then load the token it saved
+            with _file_lock(self.credentials_lock_file):
+                credentials = self._load_saved_credentials()
                 
-                # Save credentials for next run
-                with open(self.credentials_file, 'w') as token:
-                    token.write(credentials.to_json())
+                # If credentials are invalid or don't exist, go through OAuth flow
+                if not credentials or not credentials.valid:
+                    if credentials and credentials.expired and credentials.refresh_token:
+                        credentials.refresh(Request())
+                    else:
+                        if not os.path.exists(self.client_secrets_file):
+                            logger.error(f"YouTube client secrets file not found: {self.client_secrets_file}")
+                            return
+                        
+                        flow = InstalledAppFlow.from_client_secrets_file(
+                            self.client_secrets_file, self.scopes
+                        )
+                        credentials = flow.run_local_server(port=0)
+                    
+                    # Save credentials (including the token expiry) for next run;
+                    # a still-valid cached token is not rewritten
+                    self._save_credentials(credentials)
             
             # Build YouTube API client
-            self.youtube = build(self.api_service_name, self.api_version, credentials=credentials)
+            self._credentials = credentials
+            self.youtube = _build_service(self.api_service_name, self.api_version, credentials)
             logger.info("YouTube API authentication successful")
             
         except Exception as e:
             logger.error(f"YouTube authentication failed: {e}")
             self.youtube = None
     
+    def _load_saved_credentials(self) -> Optional[Credentials]:
+        """Credentials from the shared token file, if present"""
+        if not os.path.exists(self.credentials_file):
+            return None
+        return Credentials.from_authorized_user_file(self.credentials_file, self.scopes)
+    
+    def _save_credentials(self, credentials: Credentials):
+        """Persist credentials so a restart within the token lifetime skips the refresh
+        
+        Written to a temporary file and renamed, so other workers never read
+        a partly written token.
+        """
+        tmp_path = f"{self.credentials_file}.tmp"
+        with open(tmp_path, 'w') as token:
+            token.write(credentials.to_json())
+        os.replace(tmp_path, self.credentials_file)
+    
+    def _refresh_if_needed(self):
+        """Refresh the access token shortly before it expires
+        
+        Avoids a request failing on an expired token mid-run and the extra
+        round-trip to retry it.
+        """
+        credentials = self._credentials
+        if not credentials or not credentials.refresh_token or not credentials.expiry:
+            return
+        
+        with self._refresh_lock:
+            if not _expiring(credentials):
+                return
+            try:
+                with _file_lock(self.credentials_lock_file):
+                    # Another worker may have refreshed the shared token while we waited
+                    saved = self._load_saved_credentials()
+                    if saved and saved.token and saved.expiry and not _expiring(saved):
+                        credentials.token = saved.token
+                        credentials.expiry = saved.expiry
+                        return
+                    
+                    credentials.refresh(Request())
+                    self._save_credentials(credentials)
+            except Exception as e:
+                logger.warning(f"YouTube token refresh failed: {e}")
+    
+    def _new_http(self) -> AuthorizedHttp:
+        """A separate authorized connection, since httplib2 is not thread-safe"""
+        return AuthorizedHttp(self._credentials, http=httplib2.Http())
+    
     def _generate_seo_optimized_metadata(self, video_metadata: Dict) -> Dict:
         """Generate SEO-optimized title, description, and tags"""
         categories = video_metadata.get('categories', [])
-        timestamp = datetime.now().strftime("%B %d, %Y")
+        timestamp = _date_label(date.today().toordinal())
         
         # Create engaging title
         if 'karnataka' in categories:
@@ -71,165 +323,192 @@ class YouTubeUploadAgent:
             title = f"Latest Kannada News Updates | {timestamp} | South India News"
         
         # Create comprehensive description
-        description_parts = [
-            f"🎥 Today's top news stories in Kannada - {timestamp}",
-            "",
-            "📰 In this video:",
-        ]
-        
-        for i, category in enumerate(categories, 1):
-            category_name = {
-                'international': 'International News',
-                'national': 'National News', 
-                'karnataka': 'Karnataka News',
-                'tamilnadu': 'Tamil Nadu News',
-                'andhra': 'Andhra Pradesh News',
-                'kerala': 'Kerala News'
-            }.get(category, category.title())
-            
-            description_parts.append(f"{i}. {category_name}")
-        
-        description_parts.extend([
-            "",
-            "🔔 Subscribe for daily Kannada news updates!",
-            "👍 Like if you found this helpful",
-            "💬 Comment your thoughts below",
-            "",
-            "🏷️ Tags:",
-            "#KannadaNews #Karnataka #BangaloreNews #SouthIndiaNews #IndiaNews",
-            "#KannadaUpdates #NewsInKannada #TodaysNews #BreakingNews",
-            "",
-            "📱 Follow us for more updates!",
-            "",
-            f"🎬 Generated with AI technology on {timestamp}",
-            "🤖 Automated news compilation with ElevenLabs TTS"
-        ])
-        
-        description = "\n".join(description_parts)
-        
-        # Generate relevant tags
-        base_tags = [
-            "Kannada news", "Karnataka news", "Bangalore news", "South India news",
-            "India news", "Kannada updates", "news in Kannada", "today's news",
-            "breaking news", "latest news", "current affairs", "news update"
-        ]
-        
-        category_specific_tags = {
-            'international': ["international news", "world news", "global news"],
-            'national': ["national news", "India news", "central government"],
-            'karnataka': ["Karnataka", "Bangalore", "Bengaluru", "Karnataka government"],
-            'tamilnadu': ["Tamil Nadu", "Chennai", "TN news"],
-            'andhra': ["Andhra Pradesh", "Hyderabad", "AP news", "Telangana"],
-            'kerala': ["Kerala", "Kochi", "Kerala news"]
-        }
-        
-        for category in categories:
-            if category in category_specific_tags:
-                base_tags.extend(category_specific_tags[category])
-        
-        # Remove duplicates and limit to 500 characters (YouTube limit)
-        tags = list(set(base_tags))
-        tags_string = ", ".join(tags)
-        if len(tags_string) > 500:
-            # Truncate tags to fit YouTube's limit
-            truncated_tags = []
-            current_length = 0
-            for tag in tags:
-                if current_length + len(tag) + 2 <= 500:  # +2 for ", "
-                    truncated_tags.append(tag)
-                    current_length += len(tag) + 2
-                else:
-                    break
-            tags = truncated_tags
+        category_lines = "".join(
+            f"{i}. {CATEGORY_NAMES.get(category, category.title())}\n"
+            for i, category in enumerate(categories, 1)
+        )
+        description = DESCRIPTION_TEMPLATE.format(timestamp=timestamp, category_lines=category_lines)
         
         return {
             "title": title,
             "description": description,
-            "tags": tags
+            "tags": list(_tags_for(tuple(categories)))
         }
     
-    def _upload_video(self, video_path: str, metadata: Dict) -> Optional[str]:
-        """Upload video to YouTube"""
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared upload session, reusing its connection to the upload host"""
+        loop = asyncio.get_running_loop()
+        # Rebuilt for a new event loop, e.g. when a script drives the agent with asyncio.run
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            release_stale_session(self._session, self._session_loop)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=600, sock_connect=15)
+            )
+            self._session_loop = loop
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+    
+    async def prepare_upload(self):
+        """Refresh the access token and open the upload session ahead of the upload
+        
+        Run while the video is still being assembled, so neither sits on the
+        upload's critical path.
+        """
+        if not self.youtube:
+            return
+        await asyncio.to_thread(self._refresh_if_needed)
+        await self._get_session()
+    
+    def _video_body(self, metadata: Dict) -> Dict:
+        """Build the videos.insert resource body"""
+        seo_metadata = self._generate_seo_optimized_metadata(metadata)
+        return {
+            'snippet': {
+                'title': seo_metadata['title'],
+                'description': seo_metadata['description'],
+                'tags': seo_metadata['tags'],
+                'categoryId': '25',  # News & Politics category
+                'defaultLanguage': 'kn',  # Kannada
+                'defaultAudioLanguage': 'kn'
+            },
+            'status': {
+                'privacyStatus': 'public',
+                'madeForKids': False,
+                'selfDeclaredMadeForKids': False
+            }
+        }
+    
+    async def _upload_video_async(self, video_path: str, metadata: Dict) -> Optional[str]:
+        """Upload a small video in one multipart request without blocking the event loop
+        
+        Sent over the shared aiohttp session, so no worker thread is tied up
+        for the duration of the transfer and the connection is reused.
+        """
         if not self.youtube:
             logger.error("YouTube API not authenticated")
             return None
         
         try:
-            seo_metadata = self._generate_seo_optimized_metadata(metadata)
+            await asyncio.to_thread(self._refresh_if_needed)
+            body = self._video_body(metadata)
+            params = {'uploadType': 'multipart', 'part': UPLOAD_PARTS}
+            session = await self._get_session()
             
-            body = {
-                'snippet': {
-                    'title': seo_metadata['title'],
-                    'description': seo_metadata['description'],
-                    'tags': seo_metadata['tags'],
-                    'categoryId': '25',  # News & Politics category
-                    'defaultLanguage': 'kn',  # Kannada
-                    'defaultAudioLanguage': 'kn'
-                },
-                'status': {
-                    'privacyStatus': 'public',
-                    'madeForKids': False,
-                    'selfDeclaredMadeForKids': False
-                }
-            }
+            for retry in range(MAX_UPLOAD_RETRIES + 1):
+                # aiohttp streams the file part, reading it in the default executor
+                with open(video_path, 'rb') as video_file, aiohttp.MultipartWriter('related') as writer:
+                    _advise_sequential(video_file)
+                    writer.append_json(body)
+                    writer.append(video_file, {'Content-Type': 'video/mp4'})
+                    headers = {'Authorization': f"Bearer {self._credentials.token}"}
+                    async with session.post(YOUTUBE_UPLOAD_URL, params=params, data=writer, headers=headers) as response:
+                        if response.status == 200:
+                            video_id = (await response.json()).get('id')
+                            if video_id:
+                                logger.info(f"Video uploaded successfully: https://youtu.be/{video_id}")
+                                return video_id
+                            logger.error(f"Upload failed: {await response.text()}")
+                            return None
+                        
+                        if response.status in RETRYABLE_STATUS_CODES and retry < MAX_UPLOAD_RETRIES:
+                            logger.warning(f"Retryable error: HTTP {response.status}")
+                            await asyncio.sleep(2 ** retry)  # 1s, 2s, 4s
+                            continue
+                        
+                        logger.error(f"Upload failed: HTTP {response.status} {await response.text()}")
+                        return None
             
-            # Create media upload
-            media = MediaFileUpload(
-                video_path,
-                chunksize=-1,
-                resumable=True,
-                mimetype='video/mp4'
-            )
+            logger.error("Max retries exceeded")
+            return None
             
-            # Execute upload
-            insert_request = self.youtube.videos().insert(
-                part=','.join(body.keys()),
-                body=body,
-                media_body=media
-            )
+        except Exception as e:
+            logger.error(f"Error uploading video: {e}")
+            return None
+    
+    def _upload_video(self, video_path: str, metadata: Dict, video_size: Optional[int] = None) -> Optional[str]:
+        """Upload video to YouTube"""
+        if not self.youtube:
+            logger.error("YouTube API not authenticated")
+            return None
+        
+        try:
+            self._refresh_if_needed()
+            body = self._video_body(metadata)
             
-            response = None
-            error = None
-            retry = 0
+            # Shorts are a few MB: send them in one request, skipping the
+            # resumable session handshake; larger files upload in big chunks
+            if video_size is None:
+                video_size = os.path.getsize(video_path)
+            resumable = video_size >= SINGLE_REQUEST_UPLOAD_LIMIT
+            if resumable:
+                media = MmapMediaUpload(video_path, mimetype='video/mp4', chunksize=RESUMABLE_CHUNK_SIZE)
+            else:
+                media = MediaFileUpload(video_path, mimetype='video/mp4', resumable=False)
             
-            while response is None:
-                try:
-                    status, response = insert_request.next_chunk()
-                    if response is not None:
-                        if 'id' in response:
-                            video_id = response['id']
-                            logger.info(f"Video uploaded successfully: https://youtu.be/{video_id}")
-                            return video_id
+            try:
+                # Execute upload
+                insert_request = self.youtube.videos().insert(
+                    part=UPLOAD_PARTS,
+                    body=body,
+                    media_body=media
+                )
+                
+                response = None
+                retry = 0
+                
+                while response is None:
+                    try:
+                        if resumable:
+                            status, response = insert_request.next_chunk()
                         else:
-                            logger.error(f"Upload failed: {response}")
-                            return None
-                except HttpError as e:
-                    if e.resp.status in [500, 502, 503, 504]:
-                        logger.warning(f"Retryable error: {e}")
-                        retry += 1
-                        if retry > 3:
-                            logger.error("Max retries exceeded")
+                            response = insert_request.execute()
+                    except HttpError as e:
+                        if e.resp.status in RETRYABLE_STATUS_CODES:
+                            logger.warning(f"Retryable error: {e}")
+                            retry += 1
+                            if retry > MAX_UPLOAD_RETRIES:
+                                logger.error("Max retries exceeded")
+                                return None
+                            time.sleep(2 ** (retry - 1))  # 1s, 2s, 4s
+                        else:
+                            logger.error(f"Non-retryable error: {e}")
                             return None
-                    else:
-                        logger.error(f"Non-retryable error: {e}")
-                        return None
+                
+                if 'id' in response:
+                    video_id = response['id']
+                    logger.info(f"Video uploaded successfully: https://youtu.be/{video_id}")
+                    return video_id
+                else:
+                    logger.error(f"Upload failed: {response}")
+                    return None
+            finally:
+                if resumable:
+                    media.close()
             
         except Exception as e:
             logger.error(f"Error uploading video: {e}")
             return None
     
-    def _set_thumbnail(self, video_id: str, thumbnail_path: str) -> bool:
-        """Set custom thumbnail for the video"""
-        if not self.youtube or not os.path.exists(thumbnail_path):
+    def _set_thumbnail(self, video_id: str, thumbnail_path: Union[str, Path]) -> bool:
+        """Set custom thumbnail for the video; the caller checks that the file exists"""
+        if not self.youtube:
             return False
         
         try:
-            media = MediaFileUpload(thumbnail_path)
+            self._refresh_if_needed()
+            media = MediaFileUpload(str(thumbnail_path))
             request = self.youtube.thumbnails().set(
                 videoId=video_id,
                 media_body=media
             )
-            request.execute()
+            request.execute(http=self._new_http())
             logger.info(f"Thumbnail set for video: {video_id}")
             return True
         except Exception as e:
@@ -242,6 +521,7 @@ class YouTubeUploadAgent:
             return False
         
         try:
+            self._refresh_if_needed()
             body = {
                 'snippet': {
                     'playlistId': playlist_id,
@@ -256,7 +536,7 @@ class YouTubeUploadAgent:
                 part='snippet',
                 body=body
             )
-            request.execute()
+            request.execute(http=self._new_http())
             logger.info(f"Video {video_id} added to playlist {playlist_id}")
             return True
             
@@ -267,7 +547,9 @@ class YouTubeUploadAgent:
     async def upload_with_optimization(self, video_path: str, metadata: Dict) -> Dict:
         """Upload video with full optimization and post-processing"""
         try:
-            if not os.path.exists(video_path):
+            try:
+                video_size = os.stat(video_path).st_size
+            except FileNotFoundError:
                 return {
                     "success": False,
                     "error": "Video file not found"
@@ -275,8 +557,12 @@ class YouTubeUploadAgent:
             
             logger.info(f"Starting YouTube upload: {video_path}")
             
-            # Upload video
-            video_id = self._upload_video(video_path, metadata)
+            # Shorts go up in one async request; large files use the resumable
+            # googleapiclient upload off the event loop
+            if video_size < SINGLE_REQUEST_UPLOAD_LIMIT:
+                video_id = await self._upload_video_async(video_path, metadata)
+            else:
+                video_id = await asyncio.to_thread(self._upload_video, video_path, metadata, video_size)
             
             if not video_id:
                 return {
@@ -292,17 +578,21 @@ class YouTubeUploadAgent:
                 "upload_timestamp": datetime.now().isoformat()
             }
             
-            # Set thumbnail if available
-            thumbnail_path = video_path.replace('.mp4', '_thumbnail.jpg')
-            if os.path.exists(thumbnail_path):
-                if self._set_thumbnail(video_id, thumbnail_path):
-                    result["thumbnail_set"] = True
+            # Set thumbnail if available and add to daily news playlist (if
+            # configured); the two calls are independent, so run them together
+            video_file = Path(video_path)
+            thumbnail_path = video_file.with_name(f"{video_file.stem}_thumbnail.jpg")
+            
+            steps = {}
+            if thumbnail_path.is_file():
+                steps["thumbnail_set"] = asyncio.to_thread(self._set_thumbnail, video_id, thumbnail_path)
+            if self.daily_playlist_id:
+                steps["added_to_playlist"] = asyncio.to_thread(self._add_to_playlist, video_id, self.daily_playlist_id)
             
-            # Add to daily news playlist (if configured)
-            daily_playlist_id = os.getenv("YOUTUBE_DAILY_PLAYLIST_ID")
-            if daily_playlist_id:
-                if self._add_to_playlist(video_id, daily_playlist_id):
-                    result["added_to_playlist"] = True
+            outcomes = await asyncio.gather(*steps.values(), return_exceptions=True)
+            for key, outcome in zip(steps, outcomes):
+                if outcome is True:
+                    result[key] = True
             
             logger.info(f"YouTube upload completed successfully: {video_id}")
             return result
@@ -319,30 +609,42 @@ class YouTubeUploadAgent:
         if not self.youtube:
             return {"error": "YouTube API not authenticated"}
         
+        return self.get_videos_analytics([video_id]).get(video_id, {"error": "Video not found"})
+    
+    def get_videos_analytics(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """Get basic analytics for many videos, up to 50 per API request"""
+        if not self.youtube:
+            return {video_id: {"error": "YouTube API not authenticated"} for video_id in video_ids}
+        
+        analytics = {}
         try:
-            request = self.youtube.videos().list(
-                part="statistics,snippet",
-                id=video_id
-            )
-            response = request.execute()
+            self._refresh_if_needed()
+            # One connection for every batch, kept alive between requests
+            http = self._new_http()
+            for start in range(0, len(video_ids), MAX_IDS_PER_LIST_REQUEST):
+                batch_ids = video_ids[start:start + MAX_IDS_PER_LIST_REQUEST]
+                request = self.youtube.videos().list(
+                    part=VIDEO_LIST_PARTS,
+                    id=",".join(batch_ids)
+                )
+                response = request.execute(http=http)
+                
+                for item in response.get("items", []):
+                    analytics[item["id"]] = {
+                        "video_id": item["id"],
+                        "title": item["snippet"]["title"],
+                        "published_at": item["snippet"]["publishedAt"],
+                        "views": int(item["statistics"].get("viewCount", 0)),
+                        "likes": int(item["statistics"].get("likeCount", 0)),
+                        "comments": int(item["statistics"].get("commentCount", 0)),
+                        "duration": item.get("contentDetails", {}).get("duration", "")
+                    }
             
-            if response["items"]:
-                item = response["items"][0]
-                return {
-                    "video_id": video_id,
-                    "title": item["snippet"]["title"],
-                    "published_at": item["snippet"]["publishedAt"],
-                    "views": int(item["statistics"].get("viewCount", 0)),
-                    "likes": int(item["statistics"].get("likeCount", 0)),
-                    "comments": int(item["statistics"].get("commentCount", 0)),
-                    "duration": item.get("contentDetails", {}).get("duration", "")
-                }
-            else:
-                return {"error": "Video not found"}
+            return analytics
                 
         except Exception as e:
             logger.error(f"Error getting video analytics: {e}")
-            return {"error": str(e)}
+            return {video_id: analytics.get(video_id, {"error": str(e)}) for video_id in video_ids}
     
     def is_authenticated(self) -> bool:
         """Check if YouTube API is properly authenticated"""
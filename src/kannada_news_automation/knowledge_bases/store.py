@@ -0,0 +1,139 @@
+"""
+Shared knowledge bases for the agents.
+
+Each knowledge base is built lazily on first use, shared by every agent
+instance in the process, and persisted under ./data/knowledge_bases so
+later starts load it from disk instead of re-embedding the documents.
+
+Small static knowledge bases can also be searched directly as a numpy
+matrix of normalized document embeddings (search_knowledge_base), which
+skips the index and query engine entirely.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+from llama_index.core import Document, Settings, StorageContext, VectorStoreIndex, load_index_from_storage
+
+logger = logging.getLogger(__name__)
+
+KB_STORAGE_DIR = Path("./data/knowledge_bases")
+
+_KB_CACHE: Dict[str, VectorStoreIndex] = {}
+_VECTOR_CACHE: Dict[str, np.ndarray] = {}
+_KB_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _embed_model():
+    """Embedding model for knowledge bases, or None for the global default
+
+    Set KNOWLEDGE_BASE_EMBED_MODEL (e.g. "local:BAAI/bge-small-en-v1.5", which
+    needs llama-index-embeddings-huggingface) to embed locally in one batched
+    pass instead of calling the OpenAI embeddings API.
+    """
+    name = os.getenv("KNOWLEDGE_BASE_EMBED_MODEL")
+    if not name:
+        return None
+    from llama_index.core.embeddings import resolve_embed_model
+    return resolve_embed_model(name)
+
+
+def _storage_path(name: str, texts: Sequence[str]) -> Path:
+    """Storage path keyed on the documents and embedding model, so either change re-embeds"""
+    embed_name = os.getenv("KNOWLEDGE_BASE_EMBED_MODEL", "")
+    key = "\n".join((embed_name, *texts))
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+    return KB_STORAGE_DIR / f"{name}_{digest}"
+
+
+def load_knowledge_base(name: str, texts: Sequence[str]) -> VectorStoreIndex:
+    """Return the index for a named knowledge base, building it at most once"""
+    index = _KB_CACHE.get(name)
+    if index is None:
+        with _KB_LOCK:
+            index = _KB_CACHE.get(name)
+            if index is None:
+                index = _KB_CACHE[name] = _load_or_build(name, texts)
+    return index
+
+
+def _load_or_build(name: str, texts: Sequence[str]) -> VectorStoreIndex:
+    """Load a persisted index, or embed the documents and persist them"""
+    embed_model = _embed_model()
+    persist_dir = _storage_path(name, texts)
+
+    if persist_dir.exists():
+        try:
+            storage_context = StorageContext.from_defaults(persist_dir=str(persist_dir))
+            index = load_index_from_storage(storage_context, embed_model=embed_model)
+            logger.info(f"Loaded knowledge base {name} from {persist_dir}")
+            return index
+        except Exception as e:
+            logger.warning(f"Could not load knowledge base {name}, rebuilding: {e}")
+
+    index = VectorStoreIndex.from_documents(
+        [Document(text=text) for text in texts],
+        embed_model=embed_model
+    )
+    try:
+        index.storage_context.persist(persist_dir=str(persist_dir))
+    except OSError as e:
+        logger.warning(f"Could not persist knowledge base {name}: {e}")
+    return index
+
+
+def load_document_vectors(name: str, texts: Sequence[str]) -> np.ndarray:
+    """Return unit-length document embeddings for a knowledge base, computing them at most once"""
+    vectors = _VECTOR_CACHE.get(name)
+    if vectors is None:
+        with _KB_LOCK:
+            vectors = _VECTOR_CACHE.get(name)
+            if vectors is None:
+                vectors = _VECTOR_CACHE[name] = _load_or_embed(name, texts)
+    return vectors
+
+
+def _load_or_embed(name: str, texts: Sequence[str]) -> np.ndarray:
+    """Load persisted document embeddings, or embed the documents in one batch"""
+    path = _storage_path(name, texts).with_suffix(".npy")
+    try:
+        return np.load(path)
+    except (OSError, ValueError):
+        pass
+
+    embed_model = _embed_model() or Settings.embed_model
+    vectors = np.asarray(embed_model.get_text_embedding_batch(list(texts)), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, vectors)
+    except OSError as e:
+        logger.warning(f"Could not persist embeddings for {name}: {e}")
+    return vectors
+
+
+async def search_knowledge_base(
+    name: str,
+    texts: Sequence[str],
+    query: str,
+    top_k: int = 3
+) -> List[str]:
+    """Return the documents most similar to the query by cosine similarity"""
+    vectors = await asyncio.to_thread(load_document_vectors, name, texts)
+    embed_model = _embed_model() or Settings.embed_model
+    query_vector = np.asarray(await embed_model.aget_query_embedding(query), dtype=np.float32)
+
+    # Ranking only, so the query needs no normalization
+    scores = vectors @ query_vector
+    top_k = min(top_k, len(texts))
+    top = np.argpartition(-scores, top_k - 1)[:top_k]
+    top = top[np.argsort(-scores[top])]
+    return [texts[i] for i in top]
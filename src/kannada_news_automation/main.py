@@ -1,15 +1,16 @@
 import os
+import atexit
 import logging
 import asyncio
-from datetime import datetime, timedelta
-from fastapi import FastAPI, BackgroundTasks, HTTPException
+import queue
+from datetime import datetime
+from fastapi import FastAPI, BackgroundTasks, Depends, HTTPException
 from fastapi.responses import JSONResponse
-from celery import Celery
-from celery.schedules import crontab
-import schedule
 import time
-import threading
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import List
 
 import sys
 import os
@@ -19,50 +20,51 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from kannada_news_automation.pipeline import NewsAutomationPipeline
 from kannada_news_automation.config.settings import Settings
 
-# Configure logging
+# Create logs directory
+os.makedirs('./logs', exist_ok=True)
+
+# Configure logging: callers only enqueue records, and a listener thread does
+# the file and console writes so logging never blocks the event loop
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(
+    _log_queue,
+    logging.FileHandler('./logs/app.log'),
+    logging.StreamHandler()
+)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('./logs/app.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flush queued records on exit
 
 logger = logging.getLogger(__name__)
 
-# Create logs directory
-os.makedirs('./logs', exist_ok=True)
-
-# Initialize settings
-settings = Settings()
-
-# Celery configuration
-celery_app = Celery(
-    'kannada_news_automation',
-    broker=settings.redis_url,
-    backend=settings.redis_url,
-    include=['src.kannada_news_automation.tasks']
-)
-
-# Celery beat schedule - run every 6 hours
-celery_app.conf.beat_schedule = {
-    'run-news-pipeline': {
-        'task': 'src.kannada_news_automation.tasks.run_pipeline_task',
-        'schedule': crontab(minute=0, hour='*/6'),  # Every 6 hours
-    },
-}
-celery_app.conf.timezone = 'Asia/Kolkata'
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Application settings, loaded once"""
+    return Settings()
 
-# Global pipeline instance
-pipeline = NewsAutomationPipeline()
+@lru_cache(maxsize=1)
+def get_pipeline() -> NewsAutomationPipeline:
+    """Pipeline instance, built on first use rather than at import
+    
+    Importing this module (tests, tooling) no longer constructs the
+    agents or runs the YouTube authentication.
+    """
+    return NewsAutomationPipeline()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
     logger.info("Starting Kannada News Automation System")
     
-    # Perform startup checks
+    # Build the uploader once, before anything else can read it, then run the
+    # startup checks with the upload connection warming up alongside
+    pipeline = get_pipeline()
+    await pipeline.build_uploader()
+    warmup_task = asyncio.create_task(pipeline.warmup())
     try:
         health = await pipeline.health_check()
         if health["overall"] != "healthy":
@@ -71,10 +73,30 @@ async def lifespan(app: FastAPI):
             logger.info("All systems healthy")
     except Exception as e:
         logger.error(f"Startup health check failed: {e}")
+    await warmup_task
+    
+    # Scheduled runs share the server's event loop, so HTTP sessions and
+    # credentials carry over between runs
+    scheduler_task = None
+    if os.getenv("PIPELINE_SCHEDULER_ENABLED", "false").lower() == "true":
+        # Validated here so missing API keys fail startup, not a background task
+        settings = get_settings()
+        scheduler_task = asyncio.create_task(
+            run_scheduled_pipeline(settings.pipeline_run_interval_hours * 3600)
+        )
+        logger.info("Background scheduler started")
     
     yield
     
     logger.info("Shutting down Kannada News Automation System")
+    if scheduler_task is not None:
+        scheduler_task.cancel()
+        try:
+            await scheduler_task
+        except asyncio.CancelledError:
+            pass
+    if get_pipeline.cache_info().currsize:
+        await get_pipeline().close()
 
 # FastAPI app
 app = FastAPI(
@@ -119,16 +141,17 @@ async def trigger_pipeline(background_tasks: BackgroundTasks):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/pipeline/status")
-async def get_pipeline_status():
+async def get_pipeline_status(pipeline: NewsAutomationPipeline = Depends(get_pipeline)):
     """Get current pipeline status and statistics"""
+    last_run = pipeline.stats.get("last_run")
     return {
         "stats": pipeline.stats,
-        "last_run": pipeline.stats.get("last_run"),
+        "last_run": datetime.fromtimestamp(last_run).isoformat() if last_run else None,
         "success_rate": pipeline.stats["successes"] / max(1, pipeline.stats["runs"]) * 100
     }
 
 @app.get("/health")
-async def health_check():
+async def health_check(pipeline: NewsAutomationPipeline = Depends(get_pipeline)):
     """Comprehensive health check"""
     try:
         health = await pipeline.health_check()
@@ -145,58 +168,55 @@ async def health_check():
 async def get_recent_logs(lines: int = 100):
     """Get recent log entries"""
     try:
-        with open('./logs/app.log', 'r') as f:
-            log_lines = f.readlines()
-        
-        recent_logs = log_lines[-lines:]
+        recent_logs = _tail_lines('./logs/app.log', lines)
         return {"logs": recent_logs}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Cannot read logs: {e}")
 
+def _tail_lines(path: str, lines: int, block_size: int = 8192) -> List[str]:
+    """Last lines of a text file, reading blocks backwards from the end"""
+    if lines <= 0:
+        return []
+    
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        data = b''
+        # One newline more than needed guarantees the first kept line is whole
+        while position > 0 and data.count(b'\n') <= lines:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+    
+    return [line.decode('utf-8', errors='replace') for line in data.splitlines(keepends=True)[-lines:]]
+
 async def run_pipeline_background(task_id: str):
     """Run pipeline in background"""
     try:
         logger.info(f"Starting background pipeline task: {task_id}")
-        result = await pipeline.run_complete_pipeline()
+        result = await get_pipeline().run_complete_pipeline()
         logger.info(f"Background pipeline task {task_id} completed: {result['success']}")
         return result
     except Exception as e:
         logger.error(f"Background pipeline task {task_id} failed: {e}")
         return {"success": False, "error": str(e)}
 
-def run_scheduled_pipeline():
-    """Run scheduled pipeline using Python schedule"""
-    def job():
+async def run_scheduled_pipeline(interval_seconds: float):
+    """Run the pipeline every interval_seconds on the server's event loop"""
+    while True:
+        await asyncio.sleep(interval_seconds)
         logger.info("Scheduled pipeline run starting...")
         try:
-            # Run the async pipeline in a new event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(pipeline.run_complete_pipeline())
-            loop.close()
-            
+            result = await get_pipeline().run_complete_pipeline()
             logger.info(f"Scheduled pipeline completed: {result['success']}")
         except Exception as e:
             logger.error(f"Scheduled pipeline failed: {e}")
-    
-    # Schedule every 6 hours
-    schedule.every(6).hours.do(job)
-    
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # Check every minute
-
-def start_scheduler():
-    """Start the background scheduler"""
-    scheduler_thread = threading.Thread(target=run_scheduled_pipeline, daemon=True)
-    scheduler_thread.start()
-    logger.info("Background scheduler started")
 
 if __name__ == "__main__":
     import uvicorn
     
-    # Start background scheduler
-    start_scheduler()
+    # Start background scheduler with the server
+    os.environ.setdefault("PIPELINE_SCHEDULER_ENABLED", "true")
     
     # Run FastAPI server
     uvicorn.run(
@@ -204,5 +224,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=False,  # Disable in production
-        log_level="info"
+        log_level="info",
+        # uvloop ships with uvicorn[standard] but has no Windows build
+        loop="uvloop" if sys.platform != "win32" else "asyncio"
     )
\ No newline at end of file
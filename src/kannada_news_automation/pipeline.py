@@ -1,6 +1,9 @@
 import asyncio
 import logging
-from typing import Dict, Any
+import time
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Set
 from datetime import datetime
 import os
 
@@ -14,86 +17,255 @@ from .agents.youtube_uploader import YouTubeUploadAgent
 
 logger = logging.getLogger(__name__)
 
+# Upper bound in seconds per pipeline step; "category" bounds each category's
+# summary -> translation -> audio chain, so one hung API call drops only that category
+STEP_TIMEOUTS = MappingProxyType({
+    "collect": 180,
+    "category": 300,
+    "assemble": 900,
+    "upload": 1800
+})
+
+# Weight of the latest run in each category's latency moving average
+LATENCY_EMA_WEIGHT = 0.3
+
 class NewsAutomationPipeline:
     def __init__(self):
-        """Initialize the complete news automation pipeline"""
-        self.news_collector = NewsCollectionAgent()
-        self.content_processor = ContentProcessingAgent()
-        self.translator = TranslationAgent()
-        self.audio_generator = AudioGeneratorAgent()
-        self.visual_agent = VisualContentAgent()
-        self.video_assembler = VideoAssemblyAgent()
-        self.uploader = YouTubeUploadAgent()
+        """Initialize the complete news automation pipeline
+        
+        Agents are built on first use, so a health check never constructs
+        the video assembler or runs the YouTube authentication.
+        """
+        self.upload_enabled = os.getenv("VIDEO_UPLOAD_ENABLED", "true").lower() == "true"
         
         # Pipeline statistics
-        self.stats = {
+        self.stats = self._initial_stats()
+        
+        # Uploads left running after their run stopped waiting for them
+        self._background_uploads: Set[asyncio.Task] = set()
+        
+        # In-flight uploader construction, shared by concurrent callers
+        self._uploader_build: Optional[asyncio.Future] = None
+    
+    @staticmethod
+    def _initial_stats() -> Dict[str, Any]:
+        return {
             "runs": 0,
             "successes": 0,
             "failures": 0,
-            "last_run": None
+            "last_run": None,  # time.time() of the latest run start
+            "category_latency": {}  # Moving average seconds per category
         }
     
+    @cached_property
+    def news_collector(self) -> NewsCollectionAgent:
+        return NewsCollectionAgent()
+    
+    @cached_property
+    def content_processor(self) -> ContentProcessingAgent:
+        return ContentProcessingAgent()
+    
+    @cached_property
+    def translator(self) -> TranslationAgent:
+        return TranslationAgent()
+    
+    @cached_property
+    def audio_generator(self) -> AudioGeneratorAgent:
+        return AudioGeneratorAgent()
+    
+    @cached_property
+    def visual_agent(self) -> VisualContentAgent:
+        return VisualContentAgent()
+    
+    @cached_property
+    def video_assembler(self) -> VideoAssemblyAgent:
+        return VideoAssemblyAgent()
+    
+    @cached_property
+    def uploader(self) -> YouTubeUploadAgent:
+        return YouTubeUploadAgent()
+    
+    async def close(self):
+        """Release network resources held by the agents that were created
+        
+        Uploads still running in the background finish first, since closing
+        the uploader would abort them.
+        """
+        if self._background_uploads:
+            logger.info(f"Waiting for {len(self._background_uploads)} background upload(s)")
+            await asyncio.gather(*self._background_uploads, return_exceptions=True)
+        for name in ("news_collector", "translator", "audio_generator", "visual_agent", "uploader"):
+            agent = self.__dict__.get(name)
+            if agent is not None:
+                await agent.close()
+    
+    def reset(self):
+        """Return to a fresh state without rebuilding the agents
+        
+        Clears statistics and in-memory caches, cancels background uploads
+        and drops unused prerendered segments. Persistent caches on disk
+        are kept.
+        """
+        self.stats = self._initial_stats()
+        for task in self._background_uploads:
+            task.cancel()
+        self._background_uploads.clear()
+        if "translator" in self.__dict__:
+            self.translator.clear_caches()
+        if "video_assembler" in self.__dict__:
+            self.video_assembler.discard_prerendered()
+    
+    async def build_uploader(self) -> Optional[YouTubeUploadAgent]:
+        """Build the uploader (OAuth and API client) off the event loop
+        
+        Use this rather than reading self.uploader: cached_property has no
+        lock on Python 3.12+, so concurrent reads would build a second
+        uploader and run OAuth twice. Returns None when uploads are disabled
+        or the uploader can't be built; a later call tries again.
+        """
+        if not self.upload_enabled:
+            return None
+        if "uploader" not in self.__dict__:
+            if self._uploader_build is None:
+                self._uploader_build = asyncio.ensure_future(asyncio.to_thread(lambda: self.uploader))
+            try:
+                await asyncio.shield(self._uploader_build)
+            except Exception as e:
+                logger.warning(f"Uploader setup failed: {e}")
+                return None
+            finally:
+                if self._uploader_build is not None and self._uploader_build.done():
+                    self._uploader_build = None
+        return self.uploader
+    
+    async def warmup(self) -> Optional[YouTubeUploadAgent]:
+        """Front-load upload setup so the upload step doesn't pay for it
+        
+        Builds the uploader, then refreshes its token and opens its session.
+        Runs at service start and alongside each run's content steps. The
+        news collector's pool is already warmed by the startup health check.
+        Returns the uploader, or None when there is none to upload with.
+        """
+        uploader = await self.build_uploader()
+        if uploader is None:
+            return None
+        try:
+            await uploader.prepare_upload()
+        except Exception as e:
+            logger.warning(f"Upload warmup failed, uploading anyway: {e}")
+        return uploader
+    
+    @staticmethod
+    def _successful_results(step: str, categories: List[str], results: List[Any]) -> Dict[str, Any]:
+        """Map categories to gathered results, logging and dropping the ones that raised"""
+        succeeded = {}
+        for category, result in zip(categories, results):
+            if isinstance(result, Exception):
+                logger.error(f"{step} failed for {category}: {result!r}")
+            else:
+                succeeded[category] = result
+        return succeeded
+    
+    async def _process_category(self, category: str, news_item: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize, translate and voice one category, collecting its media alongside"""
+        started = time.perf_counter()
+        summary = await self.content_processor.create_video_summary(news_item.get('content', ''), category)
+        
+        # Media search only needs the summary, so it runs during translation and TTS
+        media_task = None
+        if summary and summary.strip():
+            media_task = asyncio.create_task(self.visual_agent.find_relevant_media(summary, category))
+        
+        try:
+            translation = await self.translator.translate_with_context(summary, category)
+            try:
+                audio = await self.audio_generator.generate_category_audio(translation, category)
+            except Exception as e:
+                logger.error(f"Failed to generate audio for {category}: {e}")
+                audio = None
+            try:
+                media = await media_task if media_task is not None else []
+            except Exception as e:
+                logger.error(f"Failed to collect media for {category}: {e}")
+                media = []
+        except BaseException:
+            if media_task is not None:
+                media_task.cancel()
+            raise
+        
+        # Encode this category's video segment now rather than after the slowest category
+        if audio is not None:
+            self.video_assembler.prerender_segment(category, audio, media)
+        
+        latencies = self.stats["category_latency"]
+        elapsed = time.perf_counter() - started
+        previous = latencies.get(category)
+        latencies[category] = elapsed if previous is None else (
+            LATENCY_EMA_WEIGHT * elapsed + (1 - LATENCY_EMA_WEIGHT) * previous
+        )
+        
+        return {"summary": summary, "translation": translation, "audio": audio, "media": media}
+    
     async def run_complete_pipeline(self) -> Dict[str, Any]:
         """Execute the complete news automation pipeline"""
-        start_time = datetime.now()
+        start_time = time.time()  # Wall clock for reporting only
+        start_perf = time.perf_counter()
         self.stats["runs"] += 1
         self.stats["last_run"] = start_time
+        upload_prep_task = None
         
         try:
             logger.info("Starting news automation pipeline...")
             
             # Step 1: Collect trending news from all categories
             logger.info("Step 1: Collecting trending news...")
-            news_data = await self.news_collector.collect_all_categories()
+            async with asyncio.timeout(STEP_TIMEOUTS["collect"]):
+                news_data = await self.news_collector.collect_all_categories()
             
             if not news_data or not any(news_data.values()):
                 raise Exception("No news data collected")
             
             logger.info(f"Collected news for {len(news_data)} categories")
             
-            # Step 2: Process and summarize content
-            logger.info("Step 2: Processing and summarizing content...")
-            summaries = {}
-            for category, news_item in news_data.items():
-                if news_item:
-                    summary = await self.content_processor.create_video_summary(
-                        news_item.get('content', ''), 
-                        category
-                    )
-                    summaries[category] = summary
-            
-            if not summaries:
-                raise Exception("No content summaries generated")
+            # Build and warm up the uploader (token refresh, session) while content is produced
+            if self.upload_enabled:
+                upload_prep_task = asyncio.create_task(self.warmup())
             
-            # Step 3: Translate to Kannada
-            logger.info("Step 3: Translating to Kannada...")
-            translations = {}
-            for category, summary in summaries.items():
-                translation = await self.translator.translate_with_context(
-                    summary, 
-                    category
-                )
-                translations[category] = translation
+            # Steps 2-5: each category runs summary -> translation -> audio, with
+            # its media search alongside, so a slow category never holds up the
+            # others at a stage boundary
+            logger.info("Steps 2-5: Summarizing, translating, voicing and collecting media per category...")
+            # Slowest categories first, so the critical path gets the API slots earliest
+            latencies = self.stats["category_latency"]
+            categories = sorted(
+                (category for category, news_item in news_data.items() if news_item),
+                key=lambda category: latencies.get(category, 0.0),
+                reverse=True
+            )
+            results = await asyncio.gather(
+                *(asyncio.wait_for(self._process_category(category, news_data[category]), STEP_TIMEOUTS["category"])
+                  for category in categories),
+                return_exceptions=True
+            )
+            processed = self._successful_results("Processing", categories, results)
+            self.stats["failed_categories"] = [category for category in categories if category not in processed]
+            
+            if not processed:
+                raise Exception("No content summaries generated")
             
-            # Step 4: Generate high-quality audio with ElevenLabs
-            logger.info("Step 4: Generating Kannada audio with ElevenLabs...")
-            audio_files = await self.audio_generator.generate_batch_audio(translations)
+            # Split the per-category results in one pass, skipping failed audio
+            summaries, translations, valid_audio, media_collections = {}, {}, {}, {}
+            for category, item in processed.items():
+                summaries[category] = item["summary"]
+                translations[category] = item["translation"]
+                if item["audio"] is not None:
+                    valid_audio[category] = item["audio"]
+                    media_collections[category] = item["media"]
             
-            # Filter out failed audio generations
-            valid_audio = {k: v for k, v in audio_files.items() if v is not None}
             if len(valid_audio) < 3:  # Need at least 3 segments for a meaningful video
                 raise Exception("Insufficient audio files generated")
             
-            # Step 5: Collect relevant media
-            logger.info("Step 5: Collecting relevant media...")
-            media_collections = {}
-            for category, summary in summaries.items():
-                if category in valid_audio:
-                    media = await self.visual_agent.find_relevant_media(
-                        summary, 
-                        category
-                    )
-                    media_collections[category] = media
+            categories_processed = list(valid_audio)
             
             # Step 6: Assemble video
             logger.info("Step 6: Assembling video...")
@@ -101,34 +273,40 @@ class NewsAutomationPipeline:
                 'news_data': news_data,
                 'summaries': summaries,
                 'translations': translations,
-                'categories': list(valid_audio.keys())
+                'categories': categories_processed
             }
             
-            video_file = await self.video_assembler.create_complete_video(
-                valid_audio, 
-                media_collections,
-                video_metadata
-            )
+            async with asyncio.timeout(STEP_TIMEOUTS["assemble"]):
+                video_file = await self.video_assembler.create_complete_video(
+                    valid_audio, 
+                    media_collections,
+                    video_metadata
+                )
             
-            if not video_file or not os.path.exists(video_file):
+            # The assembler returns a path only for a fully written file
+            if not video_file:
                 raise Exception("Video assembly failed")
             
             # Step 7: Upload to YouTube
             logger.info("Step 7: Uploading to YouTube...")
-            upload_enabled = os.getenv("VIDEO_UPLOAD_ENABLED", "true").lower() == "true"
-            
-            if upload_enabled:
-                upload_result = await self.uploader.upload_with_optimization(
-                    video_file,
-                    video_metadata
+            uploader = await upload_prep_task if upload_prep_task is not None else None
+            if uploader is not None:
+                upload_task = asyncio.create_task(
+                    uploader.upload_with_optimization(video_file, video_metadata)
                 )
-            else:
+                async with asyncio.timeout(STEP_TIMEOUTS["upload"]):
+                    # Shielded so a cancelled run or step timeout doesn't abort the upload
+                    try:
+                        upload_result = await asyncio.shield(upload_task)
+                    except asyncio.CancelledError:
+                        self._continue_upload(upload_task)
+                        raise
+            elif not self.upload_enabled:
                 logger.info("Upload disabled, skipping YouTube upload")
                 upload_result = {"status": "skipped", "reason": "upload_disabled"}
-            
-            # Calculate execution time
-            end_time = datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
+            else:
+                logger.warning("YouTube uploader unavailable, skipping upload")
+                upload_result = {"status": "skipped", "reason": "uploader_unavailable"}
             
             # Update statistics
             self.stats["successes"] += 1
@@ -137,31 +315,55 @@ class NewsAutomationPipeline:
                 "success": True,
                 "video_file": video_file,
                 "upload_result": upload_result,
-                "execution_time_seconds": execution_time,
-                "categories_processed": list(valid_audio.keys()),
+                "categories_processed": categories_processed,
                 "audio_quality": "elevenlabs_high",
-                "video_duration_seconds": 60,
-                "timestamp": start_time.isoformat(),
-                "stats": self.stats
+                "video_duration_seconds": 60
             }
             
-            logger.info(f"Pipeline completed successfully in {execution_time:.2f} seconds")
-            return result
-            
         except Exception as e:
             self.stats["failures"] += 1
-            end_time = datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
-            
-            logger.error(f"Pipeline failed after {execution_time:.2f} seconds: {e}")
-            
-            return {
+            result = {
                 "success": False,
-                "error": str(e),
-                "execution_time_seconds": execution_time,
-                "timestamp": start_time.isoformat(),
-                "stats": self.stats
+                "error": str(e) or repr(e)  # A step timeout carries no message
             }
+        
+        finally:
+            # Also runs when the run itself is cancelled (shutdown, an outer timeout);
+            # both are no-ops after a successful run
+            if upload_prep_task is not None:
+                upload_prep_task.cancel()
+            if "video_assembler" in self.__dict__:
+                self.video_assembler.discard_prerendered()
+            
+            # Timed once for either outcome, and recorded even if the run is cancelled
+            execution_time = time.perf_counter() - start_perf
+            self.stats["last_run_ms"] = int(execution_time * 1000)
+        
+        result["execution_time_seconds"] = execution_time
+        result["timestamp"] = datetime.fromtimestamp(start_time).isoformat()
+        result["stats"] = self.stats
+        
+        if result["success"]:
+            logger.info(f"Pipeline completed successfully in {execution_time:.2f} seconds")
+        else:
+            logger.error(f"Pipeline failed after {execution_time:.2f} seconds: {result['error']}")
+        return result
+    
+    def _continue_upload(self, task: asyncio.Task):
+        """Keep an abandoned upload running and log how it ends"""
+        logger.warning("Upload step interrupted, upload continues in the background")
+        self._background_uploads.add(task)
+        task.add_done_callback(self._background_upload_done)
+    
+    def _background_upload_done(self, task: asyncio.Task):
+        self._background_uploads.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            logger.error(f"Background upload failed: {error}")
+        else:
+            logger.info(f"Background upload finished: {task.result()}")
     
     async def health_check(self) -> Dict[str, Any]:
         """Perform health check on all pipeline components"""
@@ -172,15 +374,19 @@ class NewsAutomationPipeline:
         }
         
         try:
-            # Check news collector
-            test_news = await self.news_collector.collect_trending_news("national")
-            health_status["components"]["news_collector"] = "healthy" if test_news else "unhealthy"
-            
-            # Check ElevenLabs connection
-            test_audio = await self.audio_generator.generate_kannada_audio(
-                "ಪರೀಕ್ಷೆ", "test", 2.0
-            )
-            health_status["components"]["audio_generator"] = "healthy" if test_audio else "unhealthy"
+            # Check the news collector and ElevenLabs connection; the probes are
+            # independent, so run them together
+            probes = {
+                "news_collector": self.news_collector.collect_trending_news("national"),
+                "audio_generator": self.audio_generator.generate_kannada_audio("ಪರೀಕ್ಷೆ", "test", 2.0)
+            }
+            outcomes = await asyncio.gather(*probes.values(), return_exceptions=True)
+            probe_error = None
+            for component, outcome in zip(probes, outcomes):
+                if isinstance(outcome, Exception):
+                    probe_error = probe_error or outcome
+                    outcome = False
+                health_status["components"][component] = "healthy" if outcome else "unhealthy"
             
             # Check other components
             health_status["components"]["translator"] = "healthy"  # Assume healthy if no errors
@@ -194,6 +400,10 @@ class NewsAutomationPipeline:
                 health_status["overall"] = "degraded"
                 health_status["unhealthy_components"] = unhealthy_components
             
+            # A probe that raised still makes the whole system unhealthy
+            if probe_error is not None:
+                raise probe_error
+            
         except Exception as e:
             health_status["overall"] = "unhealthy"
             health_status["error"] = str(e)
@@ -0,0 +1,35 @@
+"""
+Helpers for the agents' shared aiohttp sessions.
+
+Each agent keeps one ClientSession and rebuilds it when called from a
+different event loop. The session being replaced belongs to the old loop
+and can only be closed there.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+def release_stale_session(
+    session: Optional[aiohttp.ClientSession],
+    loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """Release a session left on another event loop before it is replaced
+
+    If that loop is still running (in another thread), the session is closed
+    there. Otherwise it can't be awaited from here, so it is detached:
+    dropping the connector quietly instead of warning about an unclosed
+    session when it is garbage collected.
+    """
+    if session is None or session.closed:
+        return
+    if loop is not None and loop.is_running() and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+    else:
+        logger.debug("Detaching HTTP session from a stopped event loop")
+        session.detach()
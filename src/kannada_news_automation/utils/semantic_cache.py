@@ -0,0 +1,78 @@
+"""
+Semantic cache for LLM results.
+
+Entries are keyed by the embedding of their input and looked up by cosine
+similarity, so near-duplicate inputs (the same story from different feeds)
+reuse an earlier result. Stored in SQLite, namespaced and expired by age.
+
+Lookups scan rows in Python, so async callers run get/put via
+asyncio.to_thread; the connection is shared across threads under a lock.
+"""
+
+import logging
+import math
+import sqlite3
+import threading
+import time
+from array import array
+from operator import mul
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(embedding: List[float]) -> array:
+    """Unit-length float32 vector so a dot product is the cosine similarity"""
+    norm = math.sqrt(sum(map(mul, embedding, embedding))) or 1.0
+    return array('f', (value / norm for value in embedding))
+
+
+class SemanticCache:
+    def __init__(self, db_path: str, threshold: float = 0.92, ttl_seconds: float = 24 * 3600):
+        """Open (or create) the cache database"""
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "namespace TEXT NOT NULL, created REAL NOT NULL, embedding BLOB NOT NULL, value TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_namespace ON entries (namespace, created)")
+        self._conn.commit()
+
+    def get(self, namespace: str, embedding: List[float]) -> Optional[str]:
+        """Return the closest fresh value at or above the similarity threshold"""
+        query = _normalize(embedding)
+        cutoff = time.time() - self.ttl_seconds
+        best_value, best_score = None, self.threshold
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT embedding, value FROM entries WHERE namespace = ? AND created >= ?",
+                (namespace, cutoff)
+            ).fetchall()
+        for blob, value in rows:
+            stored = array('f')
+            stored.frombytes(blob)
+            score = sum(map(mul, query, stored))
+            if score >= best_score:
+                best_value, best_score = value, score
+
+        return best_value
+
+    def put(self, namespace: str, embedding: List[float], value: str):
+        """Store a value and drop expired entries"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl_seconds,))
+            self._conn.execute(
+                "INSERT INTO entries (namespace, created, embedding, value) VALUES (?, ?, ?, ?)",
+                (namespace, now, _normalize(embedding).tobytes(), value)
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,57 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.kannada_news_automation.agents.audio_generator import AudioGeneratorAgent, SEGMENT_DURATIONS
+
+def _stages(chain: str):
+    return [float(stage.split("=")[1]) for stage in chain.split(",")]
+
+@pytest.mark.parametrize("speed_factor", [0.8, 1.1, 1.25, 2.0, 3.0, 5.0, 0.3, 0.1])
+def test_atempo_chain_stays_in_range(speed_factor):
+    """Test every atempo stage is within 0.5-2.0 and the chain multiplies out to the speed"""
+    stages = _stages(AudioGeneratorAgent._atempo_filter(speed_factor))
+
+    assert all(0.5 <= stage <= 2.0 for stage in stages)
+    product = 1.0
+    for stage in stages:
+        product *= stage
+    assert product == pytest.approx(speed_factor, rel=1e-3)
+
+def test_atempo_single_stage_within_range():
+    """Test speeds the filter accepts directly need one stage"""
+    assert AudioGeneratorAgent._atempo_filter(1.1) == "atempo=1.1000"
+
+@pytest.mark.parametrize(("current", "target"), [
+    (8.3, SEGMENT_DURATIONS["national"]),     # Within half a second
+    (9.6, SEGMENT_DURATIONS["karnataka"]),    # Within half a second, shorter
+    (30.0, SEGMENT_DURATIONS["karnataka"]),   # 3x is too extreme to adjust
+    (5.0, SEGMENT_DURATIONS["national"]),     # 0.625x is too extreme to adjust
+])
+async def test_adjust_audio_timing_skips_ffmpeg(current, target):
+    """Test timing adjustment keeps the original file without running ffmpeg"""
+    agent = AudioGeneratorAgent.__new__(AudioGeneratorAgent)
+
+    with patch.object(AudioGeneratorAgent, '_probe_duration', return_value=current), \
+         patch('asyncio.create_subprocess_exec') as mock_exec:
+        result = await agent._adjust_audio_timing("/path/to/audio.mp3", target)
+
+    assert result == "/path/to/audio.mp3"
+    assert not mock_exec.called
+
+@pytest.mark.parametrize(("current", "target"), [
+    (9.0, SEGMENT_DURATIONS["national"]),
+    (11.5, SEGMENT_DURATIONS["karnataka"]),
+    (8.5, SEGMENT_DURATIONS["karnataka"]),
+])
+async def test_adjust_audio_timing_runs_atempo(current, target):
+    """Test audio off by half a second or more, within range, is sped up or slowed down"""
+    agent = AudioGeneratorAgent.__new__(AudioGeneratorAgent)
+    proc = AsyncMock()
+    proc.wait.return_value = 0
+
+    with patch.object(AudioGeneratorAgent, '_probe_duration', return_value=current), \
+         patch('asyncio.create_subprocess_exec', return_value=proc) as mock_exec:
+        result = await agent._adjust_audio_timing("/path/to/audio.mp3", target)
+
+    assert result == "/path/to/audio_adjusted.mp3"
+    args = mock_exec.call_args.args
+    assert args[args.index("-filter:a") + 1] == AudioGeneratorAgent._atempo_filter(current / target)
@@ -0,0 +1,20 @@
+from src.kannada_news_automation.agents.translator import _fact_namespace
+
+def test_fact_namespace_separates_numbers_and_places():
+    """Test stories differing only in numbers or places never share a cached translation"""
+    base = _fact_namespace("karnataka", "5 killed in Mysuru bus crash")
+
+    assert _fact_namespace("karnataka", "50 killed in Mysuru bus crash") != base
+    assert _fact_namespace("karnataka", "5 killed in Mandya bus crash") != base
+
+def test_fact_namespace_allows_rewording():
+    """Test rewordings with the same facts stay in one namespace"""
+    assert (
+        _fact_namespace("karnataka", "5 killed in Mysuru bus crash")
+        == _fact_namespace("karnataka", "5 were killed when a bus crashed in Mysuru")
+    )
+
+def test_fact_namespace_includes_category():
+    """Test identical text in different categories is kept apart"""
+    text = "Chief Minister visits Delhi"
+    assert _fact_namespace("karnataka", text) != _fact_namespace("national", text)
@@ -0,0 +1,31 @@
+from src.kannada_news_automation.agents import youtube_uploader
+from src.kannada_news_automation.agents.youtube_uploader import MAX_TAGS_LENGTH, _tags_for
+
+def _budget_used(tags):
+    """Bytes the tags take in YouTube's budget, counting ", " between them"""
+    return sum(len(tag.encode('utf-8')) + 2 for tag in tags)
+
+def test_tags_within_budget_and_deduplicated():
+    """Test tags fit the byte budget and repeat no tag"""
+    tags = _tags_for(("international", "national", "karnataka"))
+
+    assert _budget_used(tags) <= MAX_TAGS_LENGTH
+    assert len(tags) == len(set(tags))
+    assert tags[0] == youtube_uploader.BASE_TAGS[0]
+
+def test_tags_budget_counts_utf8_bytes(monkeypatch):
+    """Test Kannada tags are limited by their UTF-8 size, not their character count"""
+    kannada_tags = tuple(f"ಸುದ್ದಿ {i}" for i in range(100))
+    monkeypatch.setattr(youtube_uploader, "BASE_TAGS", kannada_tags)
+
+    # Bypass the lru_cache so the patched tags are used
+    tags = _tags_for.__wrapped__(())
+
+    assert _budget_used(tags) <= MAX_TAGS_LENGTH
+    assert _budget_used(kannada_tags[:len(tags) + 1]) > MAX_TAGS_LENGTH
+    # Counted in characters, more tags would have fit
+    assert sum(len(tag) + 2 for tag in kannada_tags[:len(tags) + 1]) <= MAX_TAGS_LENGTH
+
+def test_tags_unknown_category_uses_base_tags():
+    """Test an unknown category adds no tags of its own"""
+    assert _tags_for(("unknown",)) == _tags_for(())
@@ -0,0 +1,47 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock
+from src.kannada_news_automation.utils.http_session import release_stale_session
+
+def _session():
+    session = MagicMock(closed=False)
+    session.close = AsyncMock()
+    return session
+
+def test_stale_session_closed_on_its_running_loop():
+    """Test a session whose loop still runs in another thread is closed there"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    session = _session()
+    try:
+        release_stale_session(session, loop)
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result(timeout=5)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+    session.close.assert_awaited_once()
+    session.detach.assert_not_called()
+
+def test_stale_session_detached_from_closed_loop():
+    """Test a session from a finished asyncio.run is detached instead of awaited"""
+    loop = asyncio.new_event_loop()
+    loop.close()
+    session = _session()
+
+    release_stale_session(session, loop)
+
+    session.detach.assert_called_once()
+    session.close.assert_not_called()
+
+def test_closed_or_missing_session_ignored():
+    """Test nothing happens when there is no open session to release"""
+    closed = _session()
+    closed.closed = True
+
+    release_stale_session(None, None)
+    release_stale_session(closed, None)
+
+    closed.detach.assert_not_called()
@@ -0,0 +1,33 @@
+import pytest
+from src.kannada_news_automation.main import _tail_lines
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("".join(f"line {i}\n" for i in range(50)), encoding="utf-8")
+    return path
+
+@pytest.mark.parametrize("lines", [1, 7, 49, 50])
+@pytest.mark.parametrize("block_size", [4, 16, 8192])
+def test_tail_lines_matches_readlines(log_file, lines, block_size):
+    """Test reading backwards in blocks returns the same lines as readlines"""
+    expected = log_file.read_text(encoding="utf-8").splitlines(keepends=True)[-lines:]
+    assert _tail_lines(str(log_file), lines, block_size=block_size) == expected
+
+def test_tail_lines_more_than_file(log_file):
+    """Test asking for more lines than the file has returns the whole file"""
+    assert _tail_lines(str(log_file), 500, block_size=16) == log_file.read_text(encoding="utf-8").splitlines(keepends=True)
+
+def test_tail_lines_without_trailing_newline(tmp_path):
+    """Test the last line is returned even when it is unterminated"""
+    path = tmp_path / "app.log"
+    path.write_text("first\nsecond\nthird", encoding="utf-8")
+    assert _tail_lines(str(path), 2, block_size=4) == ["second\n", "third"]
+
+def test_tail_lines_edge_cases(tmp_path, log_file):
+    """Test non-positive counts and empty files return nothing"""
+    empty = tmp_path / "empty.log"
+    empty.write_text("", encoding="utf-8")
+
+    assert _tail_lines(str(log_file), 0) == []
+    assert _tail_lines(str(empty), 10) == []
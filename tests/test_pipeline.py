@@ -3,11 +3,24 @@ import asyncio
 from unittest.mock import Mock, patch
 from src.kannada_news_automation.pipeline import NewsAutomationPipeline
 
-@pytest.fixture
-def pipeline():
-    return NewsAutomationPipeline()
+# Share one event loop across the module so the session pipeline's agents
+# (sessions, semaphores) stay bound to the loop they were created on
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+@pytest.fixture(scope="session")
+async def pipeline():
+    # Built once; tests re-mock agents with per-test patch.object/monkeypatch
+    pipeline = NewsAutomationPipeline()
+    yield pipeline
+    await pipeline.close()
+
+@pytest.fixture(autouse=True)
+def reset_pipeline_state(pipeline):
+    """Start each test from fresh statistics and empty agent caches"""
+    pipeline.reset()
+    yield
+    pipeline.reset()
 
-@pytest.mark.asyncio
 async def test_pipeline_health_check(pipeline):
     """Test pipeline health check functionality"""
     health = await pipeline.health_check()
@@ -15,7 +28,6 @@ async def test_pipeline_health_check(pipeline):
     assert "components" in health
     assert health["overall"] in ["healthy", "degraded", "unhealthy"]
 
-@pytest.mark.asyncio
 async def test_pipeline_complete_run_mock(pipeline):
     """Test complete pipeline run with mocked components"""
     
@@ -23,18 +35,21 @@ async def test_pipeline_complete_run_mock(pipeline):
     with patch.object(pipeline.news_collector, 'collect_all_categories') as mock_news, \
          patch.object(pipeline.content_processor, 'create_video_summary') as mock_process, \
          patch.object(pipeline.translator, 'translate_with_context') as mock_translate, \
-         patch.object(pipeline.audio_generator, 'generate_batch_audio') as mock_audio, \
+         patch.object(pipeline.audio_generator, 'generate_category_audio') as mock_audio, \
          patch.object(pipeline.visual_agent, 'find_relevant_media') as mock_visual, \
+         patch.object(pipeline.video_assembler, 'prerender_segment') as mock_prerender, \
          patch.object(pipeline.video_assembler, 'create_complete_video') as mock_video, \
+         patch.object(pipeline.uploader, 'prepare_upload'), \
          patch.object(pipeline.uploader, 'upload_with_optimization') as mock_upload:
         
-        # Set up mocks
+        # Set up mocks; a video needs at least 3 voiced categories
         mock_news.return_value = {
-            "karnataka": {"title": "Test News", "content": "Test content"}
+            category: {"title": f"Test News {category}", "content": "Test content"}
+            for category in ("karnataka", "national", "international")
         }
         mock_process.return_value = "Test summary"
         mock_translate.return_value = "ಪರೀಕ್ಷಾ ಸುದ್ದಿ"
-        mock_audio.return_value = {"karnataka": "/path/to/audio.mp3"}
+        mock_audio.return_value = "/path/to/audio.mp3"
         mock_visual.return_value = [{"url": "test.jpg"}]
         mock_video.return_value = "/path/to/video.mp4"
         mock_upload.return_value = {"status": "success", "video_id": "test123"}
@@ -44,12 +59,22 @@ async def test_pipeline_complete_run_mock(pipeline):
         
         # Assertions
         assert result["success"] == True
+        assert sorted(result["categories_processed"]) == ["international", "karnataka", "national"]
         assert "video_file" in result
         assert "execution_time_seconds" in result
         assert mock_news.called
         assert mock_audio.called
+        assert mock_prerender.call_count == 3
+
+async def test_pipeline_warmup(pipeline, monkeypatch):
+    """Test warmup prepares the YouTube upload ahead of the first run"""
+    monkeypatch.setattr(pipeline, "upload_enabled", True)
+    
+    with patch.object(pipeline.uploader, 'prepare_upload') as mock_prepare:
+        await pipeline.warmup()
+        
+        assert mock_prepare.called
 
-@pytest.mark.asyncio 
 async def test_pipeline_failure_handling(pipeline):
     """Test pipeline failure handling"""
     
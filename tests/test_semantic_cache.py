@@ -0,0 +1,49 @@
+import math
+import pytest
+from src.kannada_news_automation.utils import semantic_cache
+from src.kannada_news_automation.utils.semantic_cache import SemanticCache
+
+def _at_angle(cosine: float):
+    """2-D vector whose cosine similarity to [1, 0] is the given value"""
+    return [cosine, math.sqrt(1 - cosine ** 2)]
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SemanticCache(str(tmp_path / "cache.db"), threshold=0.92, ttl_seconds=3600)
+    yield cache
+    cache.close()
+
+def test_exact_embedding_hits(cache):
+    """Test the same embedding returns the stored value, whatever its scale"""
+    cache.put("karnataka", [1.0, 0.0], "ಸುದ್ದಿ")
+    assert cache.get("karnataka", [3.0, 0.0]) == "ಸುದ್ದಿ"
+
+def test_similarity_threshold(cache):
+    """Test near-duplicates at or above the threshold hit and others miss"""
+    cache.put("national", [1.0, 0.0], "ಸುದ್ದಿ")
+    assert cache.get("national", _at_angle(0.95)) == "ಸುದ್ದಿ"
+    assert cache.get("national", _at_angle(0.90)) is None
+
+def test_closest_value_wins(cache):
+    """Test the most similar entry is returned when several pass the threshold"""
+    cache.put("national", _at_angle(0.93), "far")
+    cache.put("national", [1.0, 0.0], "near")
+    assert cache.get("national", [1.0, 0.0]) == "near"
+
+def test_namespaces_are_separate(cache):
+    """Test entries are only visible within their own namespace"""
+    cache.put("karnataka", [1.0, 0.0], "ಸುದ್ದಿ")
+    assert cache.get("kerala", [1.0, 0.0]) is None
+
+def test_entries_expire(cache, monkeypatch):
+    """Test entries older than ttl_seconds are no longer returned and get dropped"""
+    now = 1_000_000.0
+    monkeypatch.setattr(semantic_cache.time, "time", lambda: now)
+    cache.put("karnataka", [1.0, 0.0], "old")
+
+    now += 3601
+    assert cache.get("karnataka", [1.0, 0.0]) is None
+
+    # The next put removes expired rows
+    cache.put("karnataka", [0.0, 1.0], "new")
+    assert cache._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 1